@@ -0,0 +1,64 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Custom Packages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_ChunkPolicy
+from SOL_Client_Connector._SOL_Server import SOL_Server
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# Measures the throughput of sending a single file of several sizes,
+#   with the fixed buffer sizes that were used before against the adaptive chunk policy.
+#   Half of every file is random, so compression and encryption both have real work to do.
+#
+#   python benchmarks/bench_chunk_sizes.py --sizes 262144 4194304 33554432 --streaming
+def legacy_policy(size:int) -> SOL_ChunkPolicy:
+    # the old table, which had no size for exactly 1mb or 10mb
+    chunk_size = 10240 if size < 1048576 else 102400 if size < 10485760 else 1048560
+    return SOL_ChunkPolicy(min_size=chunk_size, max_size=chunk_size)
+
+def bench(port:int, path:str, policy:SOL_ChunkPolicy, streaming:bool, repeat:int) -> float:
+    timings = []
+    with SOL_Connector("127.0.0.1", port, streaming=streaming, chunk_policy=policy, resume_sessions=True) as connector:
+        for _ in range(repeat):
+            package = SOL_Package("a" * 128)
+            package.command_add({"file": SOL_File(path)})
+            start = time.perf_counter()
+            connector.send(package)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput of the old fixed buffer sizes against the chunk policy")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[262144, 1048576, 4194304, 10485760, 33554432])
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.makedirs("temp", exist_ok=True)
+    with tempfile.TemporaryDirectory() as directory, \
+            SOL_Server(directory=os.path.join(directory, "server")) as server:
+        for size in args.sizes:
+            path = os.path.join(directory, f"file_{size}.bin")
+            with open(path, "wb") as file:
+                file.write(os.urandom(size // 2) + bytes(size - size // 2))
+
+            legacy = bench(server.port, path, legacy_policy(size), args.streaming, args.repeat)
+            adaptive = bench(server.port, path, SOL_ChunkPolicy(), args.streaming, args.repeat)
+            print(
+                f"size: {size}, legacy MB/s: {size / legacy / 1e6:.1f}, adaptive MB/s: {size / adaptive / 1e6:.1f}, "
+                f"gain: {legacy / adaptive:.2f}x"
+            )
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
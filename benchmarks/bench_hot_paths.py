@@ -0,0 +1,275 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import argparse
+import hashlib
+import json
+import os
+import platform
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# Custom Packages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from SOL_Client_Connector import SOL_Package, SOL_File, SOL_TreeHash
+from SOL_Client_Connector.SOL_Encryption import (
+    pp_generate_keys, pp_encrypt, pp_decrypt, pp_cipher_aes_encryptor, pp_cipher_aes_decryptor
+)
+from SOL_Client_Connector._SOL_PackageHandlers import PackageHandler_Full as PH
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# Micro benchmarks of the hot paths of the connector, with results as json and a comparison against a baseline.
+#   Every benchmark is run a few times, and its median and best time per operation are reported.
+#   A benchmark whose median is more than --threshold slower than in the baseline is flagged as a regression,
+#   which also makes the exit code 1.
+#   The stored baseline was recorded on one machine, record your own before comparing against it:
+#
+#   python benchmarks/bench_hot_paths.py --save-baseline
+#   python benchmarks/bench_hot_paths.py --output results.json
+#   python benchmarks/bench_hot_paths.py --filter aes --quick
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+_benchmarks = []
+
+def benchmark(function_):
+    # function_(quick) yields tuples of (name, run(number), number, bytes per operation or None)
+    _benchmarks.append(function_)
+    return function_
+
+def _file(directory:str, size:int) -> str:
+    # half random, half zeros, so compression has real work to do
+    path = os.path.join(directory, f"file_{size}.bin")
+    if not os.path.exists(path):
+        with open(path, "wb") as file:
+            file.write(os.urandom(size // 2) + bytes(size - size // 2))
+    return path
+
+def _command_tree(commands:int, file_path:str) -> SOL_Package:
+    package = SOL_Package("a" * 128)
+    package.command_add(*(
+        {f"command_{i}": {"id": i, "name": f"item {i}", "tags": ["a", "b", "c"], "nested": {"value": i * 0.5, "file": SOL_File(file_path) if i % 100 == 0 else None}}}
+        for i in range(commands)
+    ))
+    return package
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Benchmarks -
+# ----------------------------------------------------------------------------------------------------------------------
+@benchmark
+def bench_keys(quick:bool, directory:str):
+    yield "pp_generate_keys[1024]", lambda n: [pp_generate_keys(1024) for _ in range(n)], 1 if quick else 3, None
+
+@benchmark
+def bench_pp_encrypt(quick:bool, directory:str):
+    private_key, public_key = pp_generate_keys(1024)
+    for size in (1024, 1048576):
+        message = os.urandom(size)
+        encrypted = pp_encrypt(message, public_key)
+        yield f"pp_encrypt[{size}]", lambda n: [pp_encrypt(message, public_key) for _ in range(n)], 20, size
+        yield f"pp_decrypt[{size}]", lambda n: [pp_decrypt(*encrypted[:1], private_key, *encrypted[1:]) for _ in range(n)], 20, size
+
+@benchmark
+def bench_aes_chunks(quick:bool, directory:str):
+    # the AES path of files, many chunks through a single cipher
+    private_key, public_key = pp_generate_keys(1024)
+    size, chunk_size = (4194304 if quick else 33554432), 1048576
+    data = os.urandom(size)
+    def encrypt(n):
+        for _ in range(n):
+            _, _, cipher_aes = pp_cipher_aes_encryptor(public_key)
+            for i in range(0, size, chunk_size):
+                cipher_aes.encrypt(data[i:i+chunk_size])
+    def decrypt(n):
+        for _ in range(n):
+            session_key_encrypted, nonce, _ = pp_cipher_aes_encryptor(public_key)
+            cipher_aes = pp_cipher_aes_decryptor(private_key, session_key_encrypted, nonce)
+            for i in range(0, size, chunk_size):
+                cipher_aes.decrypt(data[i:i+chunk_size])
+    yield f"aes_encrypt_chunks[{size}]", encrypt, 1, size
+    yield f"aes_decrypt_chunks[{size}]", decrypt, 1, size
+
+@benchmark
+def bench_compress_and_hash(quick:bool, directory:str):
+    for size in ((1048576,) if quick else (1048576, 16777216)):
+        path = _file(directory, size)
+        for level in (1, 6, 9):
+            def run(n, level=level, path=path):
+                for _ in range(n):
+                    file_object = SOL_File(path, compression=level)
+                    file_object.compress_and_hash()
+                    file_object.cleanup()
+            yield f"compress_and_hash[{size},{level}]", run, 1, size
+
+@benchmark
+def bench_hashes(quick:bool, directory:str):
+    # the flat sha256 of a file against its tree hash, fed in the chunks a file is read in
+    size, chunk_size = (16777216 if quick else 134217728), 1048576
+    data = os.urandom(size)
+    def flat(n):
+        for _ in range(n):
+            hash_sum = hashlib.sha256()
+            for i in range(0, size, chunk_size):
+                hash_sum.update(data[i:i+chunk_size])
+            hash_sum.hexdigest()
+    def tree(n, leaf_size, workers=None):
+        for _ in range(n):
+            hash_sum = SOL_TreeHash(leaf_size, workers)
+            for i in range(0, size, chunk_size):
+                hash_sum.update(data[i:i+chunk_size])
+            hash_sum.hexdigest()
+    yield f"hash_flat[{size}]", flat, 1, size
+    for leaf_size in (1048576, 4194304):
+        yield f"hash_tree[{size},{leaf_size}]", lambda n, leaf_size=leaf_size: tree(n, leaf_size), 1, size
+    yield f"hash_tree[{size},4194304,1 worker]", lambda n: tree(n, 4194304, 1), 1, size
+
+@benchmark
+def bench_package_socket(quick:bool, directory:str):
+    # an encrypted package, from package_output_encrypted on one end of a socket pair to package_input on the other
+    private_key, public_key = pp_generate_keys(1024)
+    for protocol in (1, 2):
+        for commands in (10, 10000):
+            package_dict = _command_tree(commands, _file(directory, 1024)).dict()
+            size = len(PH.package_data(package_dict))
+            def run(n, package_dict=package_dict, protocol=protocol):
+                sender_socket, receiver_socket = socket.socketpair()
+                sender, receiver = PH(sender_socket), PH(receiver_socket)
+                sender.protocol = receiver.protocol = protocol
+                thread = threading.Thread(target=lambda: [
+                    sender.package_output_encrypted("REPLY", package_dict, public_key) for _ in range(n)
+                ])
+                thread.start()
+                for _ in range(n):
+                    receiver.package_input("REPLY", private_key)
+                thread.join()
+                sender_socket.close()
+                receiver_socket.close()
+            yield f"package_socket[protocol {protocol},{commands} commands]", run, 10, size
+
+@benchmark
+def bench_json(quick:bool, directory:str):
+    for commands in (1000, 100000 if not quick else 10000):
+        package = _command_tree(commands, _file(directory, 1024))
+        size = len(PH.package_data(package.dict()))
+        yield f"json_commands[{commands}]", lambda n, package=package: [PH.package_data(package.dict()) for _ in range(n)], 3, size
+        yield f"json_commands_built[{commands}]", lambda n, package=package: [PH.package_data(package.command_builder) for _ in range(n)], 3, size
+
+@benchmark
+def bench_command_add(quick:bool, directory:str):
+    # a package built one command at a time, and in a single call, up to its encoded package
+    commands = 10000 if quick else 100000
+    def one_by_one(n):
+        for _ in range(n):
+            package = SOL_Package("a" * 128)
+            for i in range(commands):
+                package.command_add({f"command_{i}": {"id": i, "tags": ["a", "b", "c"]}})
+            PH.package_data(package.command_builder)
+    def at_once(n):
+        for _ in range(n):
+            package = SOL_Package("a" * 128)
+            package.command_add(*({f"command_{i}": {"id": i, "tags": ["a", "b", "c"]}} for i in range(commands)))
+            PH.package_data(package.command_builder)
+    yield f"command_add[{commands},one by one]", one_by_one, 1, None
+    yield f"command_add[{commands},at once]", at_once, 1, None
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Running and comparing -
+# ----------------------------------------------------------------------------------------------------------------------
+def measure(run, number:int, repeats:int) -> list[float]:
+    run(1) # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run(number)
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+def run_benchmarks(quick:bool, repeats:int, name_filter:str | None) -> dict:
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # SOL_File keeps its temp files in ./temp
+        os.chdir(directory)
+        os.makedirs("temp", exist_ok=True)
+        try:
+            for function_ in _benchmarks:
+                for name, run, number, size in function_(quick, directory):
+                    if name_filter and name_filter not in name:
+                        continue
+                    timings = measure(run, number, repeats)
+                    median = statistics.median(timings)
+                    results[name] = {
+                        "median_s": median,
+                        "min_s": min(timings),
+                        "repeats": repeats,
+                        "number": number,
+                        "bytes": size,
+                        "mb_s": size / median / 1e6 if size else None,
+                    }
+                    print(f"{name:48} {median * 1000:10.3f} ms" + (f" {size / median / 1e6:10.1f} MB/s" if size else ""))
+        finally:
+            os.chdir(cwd)
+    return results
+
+def compare(results:dict, baseline:dict, threshold:float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if (base := baseline.get("results", {}).get(name)) is None:
+            continue
+        ratio = result["median_s"] / base["median_s"]
+        result["baseline_median_s"] = base["median_s"]
+        result["ratio"] = ratio
+        result["regression"] = ratio > 1 + threshold
+        if result["regression"]:
+            regressions.append(name)
+        print(f"{name:48} {ratio:6.2f}x of baseline" + ("  REGRESSION" if result["regression"] else ""))
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro benchmarks of the hot paths of the connector")
+    parser.add_argument("--output", default=None, help="write the results as json to this file")
+    parser.add_argument("--baseline", default=BASELINE, help="json results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown of the median flagged as a regression")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--filter", default=None, help="only run benchmarks with this in their name")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, for a fast check")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": run_benchmarks(args.quick, args.repeats, args.filter),
+    }
+
+    regressions = []
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)
+        if baseline["meta"].get("quick") != args.quick:
+            print("the baseline was recorded with a different --quick, sizes may not match")
+        regressions = compare(report["results"], baseline, args.threshold)
+        report["regressions"] = regressions
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
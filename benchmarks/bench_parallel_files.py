@@ -0,0 +1,62 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Custom Packages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File
+from SOL_Client_Connector._SOL_Server import SOL_Server
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# Measures the time of sending a package with many files, one by one against several at once.
+#   Half of every file is random, so compression and encryption both have real work to do.
+#
+#   python benchmarks/bench_parallel_files.py --files 8 --size 16000000 --parallel 1 2 4 8
+def make_files(directory:str, amount:int, size:int) -> list[str]:
+    paths = []
+    for i in range(amount):
+        path = os.path.join(directory, f"file_{i}.bin")
+        with open(path, "wb") as file:
+            file.write(os.urandom(size // 2) + bytes(size - size // 2))
+        paths.append(path)
+    return paths
+
+def bench(port:int, paths:list[str], parallel:int, streaming:bool, repeat:int) -> float:
+    timings = []
+    with SOL_Connector("127.0.0.1", port, parallel_files=parallel, streaming=streaming) as connector:
+        for _ in range(repeat):
+            package = SOL_Package("a" * 128)
+            package.command_add(*({f"file_{i}": SOL_File(path)} for i, path in enumerate(paths)))
+            start = time.perf_counter()
+            connector.send(package)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time of sending many files, one by one against several at once")
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--size", type=int, default=8_000_000, help="bytes per file")
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.makedirs("temp", exist_ok=True)
+    with tempfile.TemporaryDirectory() as directory, \
+            SOL_Server(directory=os.path.join(directory, "server")) as server:
+        paths = make_files(directory, args.files, args.size)
+        total = args.files * args.size / 1e6
+        for parallel in args.parallel:
+            seconds = bench(server.port, paths, parallel, args.streaming, args.repeat)
+            print(f"parallel_files: {parallel}, seconds: {seconds:.2f}, MB/s: {total / seconds:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+# Custom Packages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File
+from SOL_Client_Connector._SOL_Server import SOL_Server
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# Measures the round trips and the time of a single send(), for protocol 1 against protocol 2.
+#   The latency proxy delays every forwarded read, which makes the cost of each round trip visible on localhost.
+#
+#   python benchmarks/bench_round_trips.py --latency 0.005 --sends 20 --file some_file.bin
+class _LatencyProxy:
+    def __init__(self, port:int, latency:float):
+        self.latency = latency
+        self.target = ("127.0.0.1", port)
+        self._socket = socket.create_server(("127.0.0.1", 0))
+        self.port = self._socket.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        while True:
+            client, _ = self._socket.accept()
+            server = socket.create_connection(self.target)
+            for connection in (client, server):
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._forward, args=(client, server), daemon=True).start()
+            threading.Thread(target=self._forward, args=(server, client), daemon=True).start()
+
+    def _forward(self, source:socket.socket, destination:socket.socket) -> None:
+        try:
+            while data := source.recv(1048576):
+                time.sleep(self.latency)
+                destination.sendall(data)
+        except OSError:
+            pass
+        finally:
+            for connection in (source, destination):
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+def bench(protocol:int, port:int, server:SOL_Server, sends:int, file_path:str | None) -> dict:
+    with SOL_Connector("127.0.0.1", port, protocol=protocol, resume_sessions=True) as connector:
+        round_trips = server.stats["round_trips"]
+        timings = []
+        for i in range(sends):
+            package = SOL_Package("a" * 128)
+            package.command_add({"ping": i}, *([{"file": SOL_File(file_path)}] if file_path else []))
+            start = time.perf_counter()
+            connector.send(package)
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "protocol": protocol,
+        "round_trips_per_send": (server.stats["round_trips"] - round_trips) / sends,
+        "ms_per_send_median": timings[len(timings) // 2] * 1000,
+        "ms_per_send_mean": sum(timings) / sends * 1000,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Round trips and time per send(), protocol 1 against 2")
+    parser.add_argument("--sends", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds added to every forwarded read")
+    parser.add_argument("--file", default=None, help="a file sent with every package")
+    args = parser.parse_args()
+
+    os.makedirs("temp", exist_ok=True)
+    with SOL_Server(directory="temp_server") as server:
+        port = _LatencyProxy(server.port, args.latency).port if args.latency > 0 else server.port
+        for protocol in (1, 2):
+            result = bench(protocol, port, server, args.sends, args.file)
+            print(", ".join(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}" for key, value in result.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# Custom Packages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from SOL_Client_Connector import (
+    SOL_Connector, SOL_Package, SOL_File, SOL_Metrics, SOL_Span, SOL_Error, SOL_UploadCheckpoints
+)
+from SOL_Client_Connector._SOL_Server import SOL_Server
+from SOL_Client_Connector._Base_Classes import STOP_Error
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# Drives many connectors at once against a stand-in server, to size a deployment.
+#   Every client is a thread with its own connector, sending a mix of command only packages and packages with a file.
+#   The stand-in server runs in its own process, so the cpu time reported is that of the clients alone.
+#   Give --port to drive a server that is already running instead.
+#
+#   python benchmarks/load_generator.py --clients 32 --duration 30 --file-ratio 0.25
+#   python benchmarks/load_generator.py --clients 8 --requests 100 --latency 0.02 --bandwidth 12500000 --error-rate 0.01
+#   python benchmarks/load_generator.py --clients 4 --file-ratio 1 --error-rate 0.3 --errors reset --resumable
+def serve(connection, server_kwargs:dict) -> None:
+    # the server process, which hands back its port, and its stats once asked to stop
+    with SOL_Server(**server_kwargs) as server:
+        connection.send(server.port)
+        connection.recv()
+        connection.send(dict(server.stats))
+
+def make_files(directory:str, sizes:list[int]) -> list[str]:
+    paths = []
+    for size in sizes:
+        # half random, half zeros, so compression has real work to do
+        path = os.path.join(directory, f"file_{size}.bin")
+        with open(path, "wb") as file:
+            file.write(os.urandom(size // 2) + bytes(size - size // 2))
+        paths.append(path)
+    return paths
+
+def make_package(rng:random.Random, commands:int, file_paths:list[str], file_ratio:float) -> tuple[str, SOL_Package]:
+    package = SOL_Package("a" * 128)
+    package.command_add(*({f"command_{i}": {"id": i, "value": rng.random()}} for i in range(commands)))
+    if file_paths and rng.random() < file_ratio:
+        package.command_add({"file": SOL_File(rng.choice(file_paths))})
+        return "file", package
+    return "command", package
+
+class Client(threading.Thread):
+    def __init__(
+            self,
+            number:int,
+            args:argparse.Namespace,
+            port:int,
+            file_paths:list[str],
+            metrics:SOL_Metrics,
+            deadline:float | None,
+            checkpoints:SOL_UploadCheckpoints | None
+    ):
+        super().__init__(name=f"client_{number}", daemon=True)
+        self.args = args
+        self.checkpoints = checkpoints
+        self.port = port
+        self.file_paths = file_paths
+        self.metrics = metrics
+        self.deadline = deadline
+        self.rng = random.Random(None if args.seed is None else args.seed + number)
+        self.outcomes = {"ok": 0, "stopped": 0, "failed": 0}
+
+    def run(self) -> None:
+        args = self.args
+        with SOL_Connector(
+                args.address, self.port,
+                streaming=args.streaming,
+                resume_sessions=args.resume_sessions,
+                protocol=args.protocol,
+                checkpoints=self.checkpoints,
+                observer=self.metrics
+        ) as connector:
+            sent = 0
+            while (sent < args.requests) if self.deadline is None else (time.monotonic() < self.deadline):
+                kind, package = make_package(self.rng, args.commands, self.file_paths, args.file_ratio)
+                start = time.perf_counter()
+                try:
+                    reply = connector.send(package)
+                    outcome = "stopped" if "error" in reply else "ok"
+                except (SOL_Error, STOP_Error, OSError):
+                    outcome = "failed"
+                self.metrics.on_span(SOL_Span(f"request:{kind}", time.perf_counter() - start, error=outcome != "ok"))
+                self.outcomes[outcome] += 1
+                sent += 1
+
+def run_load(args:argparse.Namespace, port:int, file_paths:list[str], directory:str) -> dict:
+    metrics = SOL_Metrics(max_samples=1000000)
+    deadline = time.monotonic() + args.duration if args.duration else None
+    checkpoints = SOL_UploadCheckpoints(os.path.join(directory, "checkpoints")) if args.resumable else None
+    clients = [Client(number, args, port, file_paths, metrics, deadline, checkpoints) for number in range(args.clients)]
+
+    cpu_start, wall_start = os.times(), time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    cpu_end, wall = os.times(), time.perf_counter() - wall_start
+
+    outcomes = {key: sum(client.outcomes[key] for client in clients) for key in ("ok", "stopped", "failed")}
+    requests = sum(outcomes.values())
+    cpu_user, cpu_system = cpu_end.user - cpu_start.user, cpu_end.system - cpu_start.system
+    return {
+        "clients": args.clients,
+        "requests": requests,
+        "outcomes": outcomes,
+        "seconds": wall,
+        "requests_s": requests / wall,
+        "cpu_user_s": cpu_user,
+        "cpu_system_s": cpu_system,
+        "cpu_ms_per_request": (cpu_user + cpu_system) / requests * 1000 if requests else None,
+        "spans": metrics.report(),
+    }
+
+def print_report(report:dict) -> None:
+    print(
+        f"clients: {report['clients']}, requests: {report['requests']} in {report['seconds']:.1f}s, "
+        f"{report['requests_s']:.1f} requests/s, cpu: {report['cpu_ms_per_request']:.2f} ms/request"
+    )
+    print(f"outcomes: {report['outcomes']}")
+    for name, stats in sorted(report["spans"].items()):
+        print(
+            f"{name:24} count: {stats['count']:7}  errors: {stats['errors']:5}  "
+            f"p50: {stats['p50'] * 1000:8.2f} ms  p95: {stats['p95'] * 1000:8.2f} ms  p99: {stats['p99'] * 1000:8.2f} ms"
+        )
+    if "server" in report:
+        print(f"server: {report['server']}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent load against a stand-in SOL server")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50, help="requests per client, unless --duration is given")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to keep sending for")
+    parser.add_argument("--commands", type=int, default=10, help="commands in every package")
+    parser.add_argument("--file-ratio", type=float, default=0.2, help="share of the packages that carry a file")
+    parser.add_argument("--file-sizes", type=int, nargs="*", default=[16384, 1048576])
+    parser.add_argument("--protocol", type=int, default=2)
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--resume-sessions", action="store_true")
+    parser.add_argument("--resumable", action="store_true", help="send files as resumable uploads, retried after a reset")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="write the report as json to this file")
+    # the server, or its stand-in
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="drive this server, instead of starting a stand-in")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the stand-in adds to every round trip")
+    parser.add_argument("--bandwidth", type=float, default=None, help="bytes per second of the stand-in, in each direction")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds the stand-in spends on every reply")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="chance of the stand-in injecting an error")
+    parser.add_argument("--errors", nargs="+", default=["stop", "disconnect"], help="kinds of errors: stop, disconnect, reset")
+    args = parser.parse_args()
+
+    os.makedirs("temp", exist_ok=True)
+    with tempfile.TemporaryDirectory() as directory:
+        file_paths = make_files(directory, args.file_sizes) if args.file_ratio > 0 else []
+
+        if args.port is not None:
+            report = run_load(args, args.port, file_paths, directory)
+        else:
+            connection, child_connection = multiprocessing.Pipe()
+            server = multiprocessing.Process(target=serve, args=(child_connection, {
+                "address": args.address,
+                "directory": os.path.join(directory, "server"),
+                "latency": args.latency,
+                "bandwidth": args.bandwidth,
+                "think_time": args.think_time,
+                "error_rate": args.error_rate,
+                "errors": args.errors,
+                "seed": args.seed,
+            }), daemon=True)
+            server.start()
+            try:
+                report = run_load(args, connection.recv(), file_paths, directory)
+                connection.send("stop")
+                report["server"] = connection.recv()
+            finally:
+                server.join(timeout=5)
+
+    print_report(report)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+if __name__ == "__main__":
+    main()
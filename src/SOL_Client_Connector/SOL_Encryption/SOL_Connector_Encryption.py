@@ -49,8 +49,8 @@ def b_validate(password, hashed_password) -> bool:
 # ------------------------------------------------------------------------------------------------------------------
 # - Public/Private key methods -
 # ------------------------------------------------------------------------------------------------------------------
-def pp_generate_keys() -> tuple[RsaKey, RsaKey]:
-    m_length = 1024  # todo change this to 2048 in production
+def pp_generate_keys(m_length:int=1024) -> tuple[RsaKey, RsaKey]:
+    # todo change m_length to 2048 in production
     private_key = RSA.generate(m_length, new().read)
     public_key = private_key.public_key()
     return private_key, public_key
@@ -70,12 +70,16 @@ def pp_encrypt(message: bytes, public_key) -> tuple[bytes, bytes, bytes, bytes]:
 
     return encrypted_package, session_key_encrypted, tag, cipher_aes.nonce
 
-def pp_decrypt(package_encrypted: bytes, private_key, session_key_encrypted, tag, nonce) -> bytes:
+def pp_decrypt(package_encrypted: bytes, private_key, session_key_encrypted, tag, nonce, output: bytearray = None) -> bytes | bytearray:
     # Set decryptor and variables
     decryptor = PKCS1_OAEP.new(private_key)
     session_key = decryptor.decrypt(session_key_encrypted)
 
     cipher_aes = AES.new(session_key, AES.MODE_EAX, nonce)
+    # With an output buffer, which may be the encrypted package itself, nothing new is allocated
+    if output is not None:
+        cipher_aes.decrypt_and_verify(package_encrypted, tag, output=output)
+        return output
     return cipher_aes.decrypt_and_verify(package_encrypted, tag)
 
 def pp_cipher_aes_encryptor(public_key) -> tuple[bytes, bytes, AES]:
@@ -95,4 +99,35 @@ def pp_cipher_aes_decryptor(private_key, session_key_encrypted, nonce) -> AES:
     session_key = decryptor.decrypt(session_key_encrypted)
 
     cipher_aes = AES.new(session_key, AES.MODE_EAX, nonce)
-    return cipher_aes
\ No newline at end of file
+    return cipher_aes
+
+
+# ------------------------------------------------------------------------------------------------------------------
+# - Independently encrypted chunks -
+# ------------------------------------------------------------------------------------------------------------------
+# Every chunk of a resumable upload has its own nonce and tag, and is bound to its offset in the file,
+#   so any chunk can be checked on its own and a chunk can't be replayed at another offset.
+_CHUNK_NONCE = 16
+_CHUNK_TAG = 16
+
+def pp_session_key(public_key) -> tuple[bytes, bytes]:
+    # a new session key, and the session key encrypted with the given public key
+    session_key = get_random_bytes(16)
+    return session_key, PKCS1_OAEP.new(public_key).encrypt(session_key)
+
+def pp_session_key_decrypt(private_key, session_key_encrypted) -> bytes:
+    return PKCS1_OAEP.new(private_key).decrypt(session_key_encrypted)
+
+def pp_chunk_encrypt(session_key: bytes, offset: int, chunk: bytes) -> bytes:
+    # nonce, tag and the encrypted chunk
+    cipher_aes = AES.new(session_key, AES.MODE_EAX, nonce=get_random_bytes(_CHUNK_NONCE))
+    cipher_aes.update(offset.to_bytes(8, "big"))
+    chunk_encrypted, tag = cipher_aes.encrypt_and_digest(chunk)
+    return cipher_aes.nonce + tag + chunk_encrypted
+
+def pp_chunk_decrypt(session_key: bytes, offset: int, chunk: bytes) -> bytes:
+    # raises a ValueError when the chunk was changed, or belongs to another offset
+    chunk = memoryview(chunk)
+    cipher_aes = AES.new(session_key, AES.MODE_EAX, nonce=chunk[:_CHUNK_NONCE])
+    cipher_aes.update(offset.to_bytes(8, "big"))
+    return cipher_aes.decrypt_and_verify(chunk[_CHUNK_NONCE + _CHUNK_TAG:], chunk[_CHUNK_NONCE:_CHUNK_NONCE + _CHUNK_TAG])
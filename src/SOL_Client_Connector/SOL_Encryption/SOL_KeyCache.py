@@ -0,0 +1,104 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import threading
+import time
+from dataclasses import dataclass
+from Crypto.PublicKey.RSA import RsaKey
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_KeyCache, SOL_Error
+from .SOL_Connector_Encryption import pp_import_key
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Cache entries -
+# ----------------------------------------------------------------------------------------------------------------------
+@dataclass
+class _SOL_ServerKey:
+    exported:str | None     # the key as the server sent it, None if the key was pinned but never received yet
+    key:RsaKey
+    stored:float
+    pinned:bool
+
+@dataclass
+class SOL_Session:
+    session_id:str
+    server_public_key:RsaKey
+    client_private_key:RsaKey = None
+    client_public_key:RsaKey = None
+    expires:float = 0
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+class SOL_KeyCache(BASE_SOL_KeyCache):
+    def __init__(self, ttl:float=3600, session_ttl:float=300):
+        self.ttl = ttl                  # seconds after which a server key which isn't pinned is imported again
+        self.session_ttl = session_ttl  # upper limit on how long a session is reused, the server can set a lower one
+
+        self._keys = {}                 # (address, port) -> _SOL_ServerKey
+        self._sessions = {}             # (address, port) -> SOL_Session
+        self._lock = threading.Lock()
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Server keys -
+    # ------------------------------------------------------------------------------------------------------------------
+    def pin(self, address:str, port:int, key:RsaKey | str | bytes) -> None:
+        if not isinstance(key, RsaKey):
+            key = pp_import_key(key)
+        with self._lock:
+            self._keys[(address, port)] = _SOL_ServerKey(None, key, time.monotonic(), True)
+
+    def server_key(self, address:str, port:int, exported:str) -> RsaKey:
+        with self._lock:
+            entry = self._keys.get((address, port))
+            if entry is not None and entry.exported == exported \
+            and (entry.pinned or time.monotonic() - entry.stored <= self.ttl):
+                self.hits += 1
+                return entry.key
+
+        # the key is new, changed or expired
+        key = pp_import_key(exported)
+        with self._lock:
+            self.misses += 1
+            pinned = entry is not None and entry.pinned
+            if pinned and key != entry.key:
+                raise SOL_Error(4410, "Server public key does not match the pinned key")
+            self._keys[(address, port)] = _SOL_ServerKey(exported, key, time.monotonic(), pinned)
+        return key
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Sessions -
+    # ------------------------------------------------------------------------------------------------------------------
+    def session_get(self, address:str, port:int) -> SOL_Session | None:
+        with self._lock:
+            session = self._sessions.get((address, port))
+            if session is not None and session.expires < time.monotonic():
+                del self._sessions[(address, port)]
+                return None
+            return session
+
+    def session_store(self, address:str, port:int, session:SOL_Session, ttl:float) -> None:
+        session.expires = time.monotonic() + min(ttl, self.session_ttl)
+        with self._lock:
+            self._sessions[(address, port)] = session
+
+    def session_drop(self, address:str, port:int, session_id:str) -> None:
+        with self._lock:
+            session = self._sessions.get((address, port))
+            if session is not None and session.session_id == session_id:
+                del self._sessions[(address, port)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "keys": len(self._keys),
+                "sessions": len(self._sessions),
+            }
@@ -0,0 +1,148 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import collections
+import concurrent.futures
+import threading
+import time
+from Crypto.PublicKey import RSA
+from Crypto.PublicKey.RSA import RsaKey
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_KeyPool, SOL_Error
+from .SOL_Connector_Encryption import pp_generate_keys
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+def _pp_generate_keys_exported(m_length:int) -> bytes:
+    # RsaKey objects can't be pickled, so a key made in another process is sent back in its exported form
+    return pp_generate_keys(m_length)[0].export_key("DER")
+
+class SOL_KeyPool(BASE_SOL_KeyPool):
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+            self,
+            low_watermark:int=2,    # the pool is refilled once fewer key pairs than this are ready
+            high_watermark:int=8,   # ... up to this amount of key pairs
+            max_age:float=600,      # seconds after which an unused key pair is discarded
+            key_size:int=1024,
+            use_process:bool=False  # generate in a separate process, so key generation never holds the GIL of the sender
+    ):
+        if not isinstance(low_watermark, int) or not isinstance(high_watermark, int) \
+        or not 1 <= low_watermark <= high_watermark:
+            raise SOL_Error(4409, "Key pool watermarks were incorrectly defined")
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.max_age = max_age
+        self.key_size = key_size
+        self.use_process = use_process
+
+        self._keys = collections.deque()  # (private key, public key, time it was generated)
+        self._condition = threading.Condition()
+        self._thread = None
+        self._executor = None
+        self._closed = False
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.expired = 0
+
+        self.start()
+
+    @classmethod
+    def shared(cls) -> "SOL_KeyPool":
+        # The pool used by any connector which wasn't given its own
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Background generation -
+    # ------------------------------------------------------------------------------------------------------------------
+    def start(self) -> None:
+        with self._condition:
+            self._closed = False
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self.use_process and self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+            self._thread = threading.Thread(target=self._fill, name="SOL_KeyPool", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._keys.clear()
+            self._condition.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _generate(self) -> tuple[RsaKey, RsaKey]:
+        if self.use_process:
+            private_key = RSA.import_key(self._executor.submit(_pp_generate_keys_exported, self.key_size).result())
+            return private_key, private_key.public_key()
+        return pp_generate_keys(self.key_size)
+
+    def _discard_expired(self) -> None:
+        # the oldest key pairs are at the left of the deque
+        while self._keys and time.monotonic() - self._keys[0][2] > self.max_age:
+            self._keys.popleft()
+            self.expired += 1
+
+    def _fill(self) -> None:
+        while True:
+            with self._condition:
+                self._discard_expired()
+                while not self._closed and len(self._keys) >= self.low_watermark:
+                    self._condition.wait(timeout=self.max_age)
+                    self._discard_expired()
+                if self._closed:
+                    return
+
+            # refill up to the high watermark, the generation itself happens outside the lock
+            while not self._closed and len(self._keys) < self.high_watermark:
+                try:
+                    private_key, public_key = self._generate()
+                except (concurrent.futures.CancelledError, RuntimeError):
+                    return  # the executor was shut down by close()
+                with self._condition:
+                    self._keys.append((private_key, public_key, time.monotonic()))
+                    self.generated += 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Taking key pairs -
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_nowait(self) -> tuple[RsaKey, RsaKey] | None:
+        with self._condition:
+            self._discard_expired()
+            if not self._keys:
+                self.misses += 1
+                self._condition.notify()
+                return None
+            private_key, public_key, _ = self._keys.popleft()
+            self.hits += 1
+            if len(self._keys) < self.low_watermark:
+                self._condition.notify()
+            return private_key, public_key
+
+    def get(self) -> tuple[RsaKey, RsaKey]:
+        # An empty pool doesn't make the sender wait for the background thread, it generates its own key pair
+        return self.get_nowait() or pp_generate_keys(self.key_size)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "generated": self.generated,
+                "expired": self.expired,
+                "available": len(self._keys),
+            }
@@ -4,5 +4,11 @@ from .SOL_Connector_Encryption import (
     pp_decrypt,
     pp_generate_keys,
     pp_cipher_aes_encryptor,
-    pp_cipher_aes_decryptor
-)
\ No newline at end of file
+    pp_cipher_aes_decryptor,
+    pp_session_key,
+    pp_session_key_decrypt,
+    pp_chunk_encrypt,
+    pp_chunk_decrypt
+)
+from .SOL_KeyPool import SOL_KeyPool
+from .SOL_KeyCache import SOL_KeyCache, SOL_Session
\ No newline at end of file
@@ -2,10 +2,12 @@
 # - Package Imports -
 # ----------------------------------------------------------------------------------------------------------------------
 # General Packages
+import asyncio
+import concurrent.futures
 import socket
 from Crypto.PublicKey.RSA import RsaKey
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
 
 # Custom Packages
 
@@ -21,18 +23,145 @@ class BASE_Sol_File:
     _filename:str
     filepath:property =  field(repr=False)
     filename:property =  field(repr=False)
+    size:property =  field(repr=False)
     compression_level:int
     already_compressed:bool
+    codec:str
+    preparation_time:float | None
+    cache:Any
+    chunk_policy:Any
+    progress:Any
+    compression_auto:bool
+    compression_decision:dict | None
+    tree_hash:int | None
+    leaf_hashes:list[bytes] | None
+    streamed:bool
+    replayable:bool
 
     def cleanup(self)-> None:
         """clean up any remaining temp files"""
     def to_json(self) -> dict:
         """used by the json decoder to place the file_name string at the location of the Sol_File in the command structure"""
-    def _buffer_size(self, object_size: int) -> int:
-        """used to calculate the buffer size of file compression"""
+    def probe_compression(self, upload_throughput: float = None) -> dict:
+        """samples the file and sets the codec and level with the lowest estimated compress and upload time"""
+    def _chunk_size(self, object_size: int, purpose: str) -> int:
+        """returns the size of the next chunk the file is read in, from the chunk policy"""
+    def compressed_chunks(self):
+        """yields the compressed chunks of the file, and sets the hash value once the file is fully read"""
     def compress_and_hash(self)->None:
         """compresses the file and stores them in temp folder"""
 
+class BASE_SOL_Codec:
+    name:str
+
+    def compressor(self, level: int = 9) -> Any:
+        """Returns a new compressor, with compress() and flush()"""
+    def decompressor(self) -> Any:
+        """Returns a new decompressor, with decompress(), flush() and eof"""
+
+class BASE_SOL_Serializer:
+    name:str
+    format:str
+
+    def dumps(self, obj: Any, default: Callable[[Any], Any] = None) -> bytes:
+        """Serializes a package, with any SOL_File or SOL_Credentials in it replaced by their to_json"""
+    def loads(self, data: bytes) -> Any:
+        """Deserializes a package"""
+
+class BASE_SOL_ChunkPolicy:
+    min_size:   int
+    max_size:   int
+    target_seconds:float
+
+    def size(self, object_size: int, purpose: str, socket_buffer: int = 0) -> int:
+        """Returns the size of the next chunk of an object, for the given purpose"""
+    def record(self, purpose: str, length: int, seconds: float) -> None:
+        """Adds a measurement of the time a chunk took, to the throughput of its purpose"""
+    def throughput(self) -> dict:
+        """Returns the measured bytes per second, by purpose"""
+    def chunks(self, file, object_size: int, purpose: str, socket_buffer: int = 0):
+        """Yields a file in chunks of the current size, and measures each chunk"""
+
+class BASE_SOL_Observer:
+    def on_span(self, span: Any) -> None:
+        """Receives a finished span, with its name, seconds, bytes sent and received, and round trips"""
+
+class BASE_SOL_Metrics:
+    max_samples:int
+
+    def percentile(self, name: str, q: float) -> float:
+        """Returns the q-th percentile of the durations of the spans with this name"""
+    def report(self) -> dict:
+        """Returns the count, totals, mean, p50, p95 and p99 of every span name"""
+    def reset(self) -> None:
+        """Forgets every span seen so far"""
+
+class BASE_SOL_Progress:
+    callback:Any
+    max_rate:float | None
+
+    def update(self, kind: str, name: str, done: int, total: int = None, final: bool = False) -> None:
+        """Hands over a progress event, unless another one of this kind and name was handed over too recently"""
+    def info(self, data: dict) -> None:
+        """Hands over an INFO message of the server"""
+    def emit(self, event: Any) -> None:
+        """Hands a single event to the consumer"""
+
+class BASE_SOL_FileCache:
+    directory:  str
+    max_size:   int
+    hits    :   int
+    misses  :   int
+    bytes_saved:int
+
+    def fetch(self, file_object: BASE_Sol_File, destination: str) -> bool:
+        """Places the cached compressed file at the destination and sets its hash value, if it was cached"""
+    def open(self, file_object: BASE_Sol_File) -> Any:
+        """Opens the cached compressed file and sets its hash value, or returns None if it wasn't cached"""
+    def store(self, file_object: BASE_Sol_File, compressed_path: str, move: bool = False) -> None:
+        """Stores a compressed file, after which the cache is evicted down to its max size"""
+    def evict(self) -> None:
+        """Removes the least recently used compressed files, until the cache fits its max size"""
+    def clear(self) -> None:
+        """Removes everything from the cache"""
+    def stats(self) -> dict:
+        """Hits, misses, hit ratio and the bytes that didn't have to be compressed"""
+
+class BASE_SOL_UploadCheckpoints(BASE_SOL_FileCache):
+    pending_ttl:float
+
+    @staticmethod
+    def upload_id(file_object: BASE_Sol_File, package_length: int) -> str:
+        """The id of an upload, which is the same for the same content compressed the same way"""
+    def load(self, upload_id: str) -> dict | None:
+        """Returns the stored progress of an upload, or None"""
+    def save(self, upload_id: str, file_object: BASE_Sol_File, package_length: int, confirmed: int, sent: int) -> None:
+        """Stores the progress of a started upload, which keeps its compressed file from being evicted for pending_ttl"""
+    def finish(self, upload_id: str) -> None:
+        """Removes the progress of an upload the server confirmed"""
+    def pending(self) -> list[dict]:
+        """Returns the progress of every upload which wasn't confirmed yet"""
+
+class BASE_SOL_Sink:
+    def write(self, data: bytes) -> None:
+        """Receives the next piece of a downloaded file"""
+    def finish(self) -> Any:
+        """The download arrived and its hash was correct, returns its result"""
+    def discard(self) -> None:
+        """The download failed, undoes what was written where possible"""
+
+class BASE_SOL_TreeHash:
+    leaf_size:int
+    workers:int
+    mismatch:int | None
+
+    def update(self, data: bytes) -> None:
+        """Adds data, every full leaf is hashed on the shared pool of threads"""
+    def leaves(self) -> list[bytes]:
+        """Hashes the last partial leaf, and returns the digests of all leaves in order"""
+    def hexdigest(self) -> str:
+        """Returns the root, over the leaf size and the digests of all leaves"""
+
 @dataclass
 class BASE_SOL_Credentials:
     _username:str = field(repr=False)
@@ -44,26 +173,75 @@ class BASE_SOL_Credentials:
     def to_json(self) -> str:
         """form dictionary to be placed in the eventual command"""
 
+# ----------------------------------------------------------------------------------------------------------------------
+# - ENCRYPTION -
+# ----------------------------------------------------------------------------------------------------------------------
+class BASE_SOL_KeyPool:
+    low_watermark: int
+    high_watermark: int
+    max_age: float
+    key_size: int
+    use_process: bool
+
+    def start(self) -> None:
+        """Starts the background generation of key pairs"""
+    def close(self) -> None:
+        """Stops the background generation of key pairs"""
+    def get_nowait(self) -> tuple[RsaKey, RsaKey] | None:
+        """Takes a ready key pair from the pool, or None if the pool is empty"""
+    def get(self) -> tuple[RsaKey, RsaKey]:
+        """Takes a ready key pair from the pool, or generates one if the pool is empty"""
+    def stats(self) -> dict:
+        """Hit and miss counters of the pool"""
+
+class BASE_SOL_KeyCache:
+    ttl: float
+    session_ttl: float
+    hits: int
+    misses: int
+
+    def pin(self, address: str, port: int, key: RsaKey | str | bytes) -> None:
+        """Pins the public key of a server, any other key received from it will be refused"""
+    def server_key(self, address: str, port: int, exported: str) -> RsaKey:
+        """Returns the imported server key, which is only imported again if it is new, changed or expired"""
+    def session_get(self, address: str, port: int) -> Any:
+        """Returns a session with the server which can be resumed, or None"""
+    def session_store(self, address: str, port: int, session: Any, ttl: float) -> None:
+        """Stores a session the server agreed on, for a bounded time"""
+    def session_drop(self, address: str, port: int, session_id: str) -> None:
+        """Forgets a session the server no longer resumes"""
+    def stats(self) -> dict:
+        """Hit and miss counters of the cache"""
+
 # ----------------------------------------------------------------------------------------------------------------------
 # - DATA PACKAGE -
 # ----------------------------------------------------------------------------------------------------------------------
+class BASE_SOL_Commands:
+    commands:list
+    file_list:list
+    credentials:BASE_SOL_Credentials
+
+    def add(self, *commands: dict) -> None:
+        """Adds commands, which are encoded and searched for SOL_File and SOL_Credentials in one pass"""
+    def encode(self, serializer: BASE_SOL_Serializer) -> bytes:
+        """Returns the package of all commands, joined from the parts encoded while they were added"""
+
 class SOL_Package_Base:
     api_key_length = 128
     _api_key:str
-    _commands:list
-    _file_list:list
-    _credentials:BASE_SOL_Credentials
+    _commands:BASE_SOL_Commands
+    downloads:dict
 
     api_key:property
     commands:property
     file_list:property
     credentials:property
+    command_builder:property
+    preparation_times:property
 
     def command_add(self,*args:dict) -> None:
         """Adds one or more commands to the command list"""
-    def _iterateRecursion(self, dict_object: dict) -> None:
-        """Method that used recursion to loop over the to be added command, to check if it has a SOL_File within it"""
-    def pre_check(self) -> None:
+    def pre_check(self, prepare_files:bool=True, workers:int=None, io_budget:int=None, cache=None, upload_throughput:float=None, chunk_policy=None, progress=None, tree_hash:int=None) -> None:
         """runs methods that have to happen before the connection to the server is established"""
     def dict(self)-> dict:
         """Method to generate the correct data"""
@@ -78,13 +256,27 @@ class BASE_PackageHandler_Base:
     error=SOL_Error
     connection: socket.socket
     address: Any
+    protocol: int
+    protocol_offered: int
+    round_trips: int
+    bytes_sent: int
+    bytes_received: int
+    chunk_policy: Any
+    progress: Any
+    serializer: Any
 
-    def _buffer_size(self, object_size: int) -> int:
-        """returns a buffer size (10kb,100kb,1mb,...) to be used by file chunk readers"""
+    def _serializer(self) -> BASE_SOL_Serializer:
+        """returns the serializer of the next package, which is always json in protocol 1"""
+    def _chunk_size(self, object_size: int, purpose: str) -> int:
+        """returns the size of the next chunk of a file, from the chunk policy and the socket buffer sizes"""
     def cleanup(self) -> None:
         """cleans up any data of the object"""
     def close(self) -> None:
         """closes the connection"""
+    def _recv(self, length: int) -> bytes:
+        """Receives up to the given amount of bytes, starting with any bytes that arrived together with a state"""
+    def _recv_state(self) -> str:
+        """Receives a single state, even when the other side sent several states back to back"""
     def wait_for_state(self, state: str) -> None:
         """Blocking wait for Client to send a state"""
     def wait_for_state_undefined(self) -> str:
@@ -93,27 +285,53 @@ class BASE_PackageHandler_Base:
         """Blocking wait for Client to send a state, and returns the correct state"""
     def send_state(self, state: str) -> None:
         """Send state to Client"""
+    def _recv_into(self, view: memoryview) -> int:
+        """Receives into the given buffer, and returns the amount of bytes written to it"""
+    def _recv_exact(self, length: int, progress_name: str = None) -> bytearray:
+        """Blocking receive of exactly the given amount of bytes, into a single buffer"""
+    def _send(self, data: bytes) -> None:
+        """Sends all the given bytes"""
+    def _progress(self, kind: str, name: str, done: int, total: int = None, final: bool = False) -> None:
+        """Hands a progress event to the progress of the handler, if it has one"""
+    def _send_frame(self, frame_type: int, payload: bytes = b"", flags: int = 0, head: bytes = b"") -> None:
+        """Sends a single length prefixed protocol 2 frame"""
+    def _recv_frame_header(self) -> tuple[int, int, int]:
+        """Receives the header of a protocol 2 frame, and returns its type, flags and payload length"""
+    def _recv_frame(self) -> tuple[int, int, bytearray]:
+        """Receives a single protocol 2 frame, and returns its type, flags and payload"""
     def _package_out(self, state: str, package_parameters: bytes, package_data: bytes) -> None:
         """Sends the package parameters and the entire package"""
+    def _package_in(self, state: str = None) -> tuple[dict, bytearray]:
+        """Receives the package parameters and the entire package, in a buffer of its exact length"""
 
 class BASE_PackageHandler_File(BASE_PackageHandler_Base):
     def _file_package_handle_chunk(self, filepath_1: str, filepath_2: str, function_,file_handling_section: str) -> None:
         """Handle the transformation between file 1 and file 2 in chunks"""
     @staticmethod
-    def file_package_parameters(session_key_encrypted: bytes = None,nonce: bytes = None,package_length: int = None,filename: str = None,hash_value: str = None) -> bytes:
-        """Form file parameters to be sent to the client"""
+    def file_package_parameters(session_key_encrypted: bytes = None,nonce: bytes = None,package_length: int = None,filename: str = None,hash_value: str = None,stream: bool = False,codec: str = None,binary: bool = False,tree: int = None,leaves: bytes = None) -> bytes:
+        """Form file parameters to be sent to the client, as binary fields or as json"""
     def file_package_output(self, state: str, file_object: BASE_Sol_File, client_public_key: RsaKey) -> None:
         """Send a file to the client"""
-    def file_package_input(self, state: str, server_private_key: RsaKey) -> None:
-        """Receive a file from the client"""
+    def file_package_output_stream(self, state: str, file_object: BASE_Sol_File, client_public_key: RsaKey) -> None:
+        """Send a file to the client in a single pass (read, hash, compress, encrypt, send), without temp files"""
+    def file_package_input(self, state: str, server_private_key: RsaKey, directory: str = "temp", sinks=None) -> Any:
+        """Receive a file into the directory or the SOL_Sink that sinks(name, length) returns, and returns the path or the result of the sink"""
+    def file_package_output_resumable(self, state: str, file_object: BASE_Sol_File, client_public_key: RsaKey, checkpoints: BASE_SOL_UploadCheckpoints = None) -> None:
+        """Send a file in independently encrypted chunks, continuing from the offset the client already confirmed"""
+    def file_package_input_resumable(self, state: str, server_private_key: RsaKey, directory: str = "temp") -> str:
+        """Receive a resumable upload, keeping what arrived so a next attempt can continue it, and returns the path it was stored at"""
+    def file_package_output_multiple(self, state: str, file_objects: list[BASE_Sol_File], client_public_key: RsaKey, workers: int = 4, stream: bool = False) -> None:
+        """Send several files at once as interleaved protocol 2 frames, each file prepared by its own worker"""
+    def file_package_input_multiple(self, state: str, server_private_key: RsaKey, directory: str = "temp", sinks=None) -> list:
+        """Receive several interleaved files at once, and returns the paths or the results of their sinks"""
 
 class BASE_PackageHandler_Data(BASE_PackageHandler_Base):
     @staticmethod
-    def package_parameters(session_key_encrypted: bytes = None, tag: bytes = None, nonce: bytes = None, package_length:int=None) -> bytes:
-        """Forms the package parameters and returns them as a dict in bytes"""
+    def package_parameters(session_key_encrypted: bytes = None, tag: bytes = None, nonce: bytes = None, package_length:int=None, binary: bool = False, format: str = None) -> bytes:
+        """Forms the package parameters and returns them as binary fields, or as a dict in bytes"""
     @staticmethod
-    def package_data(package_dict: dict) -> bytes:
-        """forms the package into a bytes encoded dict"""
+    def package_data(package_dict: dict, serializer: BASE_SOL_Serializer = None) -> bytes:
+        """forms the package into bytes, with the given serializer or json"""
 
     def package_output_plain(self, state: str, package_dict: dict) -> None:
         """Sends a package which IS NOT encrypted"""
@@ -125,12 +343,98 @@ class BASE_PackageHandler_Data(BASE_PackageHandler_Base):
 class BASE_PackageHandler_Full(BASE_PackageHandler_Data, BASE_PackageHandler_File):
     pass
 
+# ----------------------------------------------------------------------------------------------------------------------
+# - ASYNC PACKAGE HANDLER -
+# ----------------------------------------------------------------------------------------------------------------------
+class BASE_AsyncPackageHandler_Base:
+    error=SOL_Error
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    executor: concurrent.futures.Executor
+    timeout: float
+    protocol: int
+    protocol_offered: int
+    round_trips: int
+    bytes_sent: int
+    bytes_received: int
+    chunk_policy: Any
+    progress: Any
+    serializer: Any
+
+    async def _run(self, function_, /, *args, **kwargs) -> Any:
+        """Runs a CPU heavy or blocking function in the executor, so the event loop stays free"""
+    async def _read(self, length: int) -> bytes:
+        """Reads up to the given amount of bytes, within the timeout"""
+    async def _recv_exact(self, length: int, progress_name: str = None) -> bytes:
+        """Reads exactly the given amount of bytes, within the timeout"""
+    async def _recv_state(self) -> str:
+        """Reads a single state, even when the other side sent several states back to back"""
+    async def close(self) -> None:
+        """closes the connection"""
+    async def wait_for_state(self, state: str) -> None:
+        """Wait for Client to send a state"""
+    async def wait_for_state_undefined(self) -> str:
+        """Wait for an undefined state"""
+    async def wait_for_state_multiple(self, states: list) -> str:
+        """Wait for Client to send a state, and returns the correct state"""
+    async def send_state(self, state: str) -> None:
+        """Send state to Client"""
+    async def _send_frame(self, frame_type: int, payload: bytes = b"", flags: int = 0, head: bytes = b"") -> None:
+        """Sends a single length prefixed protocol 2 frame"""
+    async def _recv_frame_header(self) -> tuple[int, int, int]:
+        """Receives the header of a protocol 2 frame, and returns its type, flags and payload length"""
+    async def _recv_frame(self) -> tuple[int, int, bytes]:
+        """Receives a single protocol 2 frame, and returns its type, flags and payload"""
+    async def _package_out(self, state: str, package_parameters: bytes, package_data: bytes) -> None:
+        """Sends the package parameters and the entire package"""
+    async def _package_in(self, state: str = None) -> tuple[dict, bytes]:
+        """Receives the package parameters and the entire package"""
+
+class BASE_AsyncPackageHandler_File(BASE_AsyncPackageHandler_Base):
+    async def file_package_output(self, state: str, file_object: BASE_Sol_File, client_public_key: RsaKey) -> None:
+        """Send a file to the client"""
+    async def file_package_output_stream(self, state: str, file_object: BASE_Sol_File, client_public_key: RsaKey) -> None:
+        """Send a file to the client in a single pass, without temp files"""
+    async def file_package_input(self, state: str, server_private_key: RsaKey, directory: str = "temp") -> str:
+        """Receive a file from the client, and returns the path it was stored at"""
+
+class BASE_AsyncPackageHandler_Data(BASE_AsyncPackageHandler_Base):
+    async def package_output_plain(self, state: str, package_dict: dict) -> None:
+        """Sends a package which IS NOT encrypted"""
+    async def package_output_encrypted(self, state: str, package_dict: dict, client_public_key: RsaKey) -> None:
+        """Sends a package which IS encrypted"""
+    async def package_input(self, state: str, server_private_key: RsaKey) -> dict:
+        """Dependent on the incoming package parameters it will either pass the full package directly into a json or first decrypt it with the server's private key"""
+
+class BASE_AsyncPackageHandler_Full(BASE_AsyncPackageHandler_Data, BASE_AsyncPackageHandler_File):
+    pass
+
 # ----------------------------------------------------------------------------------------------------------------------
 # - CONNECTOR -
 # ----------------------------------------------------------------------------------------------------------------------
 class STOP_Error(Exception):
     pass
 
+class BASE_SOL_ConnectionPool:
+    address :   str
+    port    :   int
+    size    :   int
+    idle_timeout:float
+    hits    :   int
+    misses  :   int
+    evictions:  int
+
+    def acquire(self) -> tuple[socket.socket, bool]:
+        """Returns a warm connection from the pool, or a new one, and whether it was reused"""
+    def release(self, connection: socket.socket) -> None:
+        """Returns a connection to the pool, so a next conversation can reuse it"""
+    def discard(self, connection: socket.socket) -> None:
+        """Closes a connection which may not be reused"""
+    def close(self) -> None:
+        """Closes all idle connections"""
+    def stats(self) -> dict:
+        """Hit and miss counters of the pool"""
+
 class SOL_Connector_Base:
     # Keys:
     _client_private_key: RsaKey
@@ -139,8 +443,51 @@ class SOL_Connector_Base:
 
     address :   str
     port    :   int
+    streaming:  bool
+    pool    :   BASE_SOL_ConnectionPool
+    key_pool:   BASE_SOL_KeyPool
+    key_cache:  BASE_SOL_KeyCache
+    resume_sessions:bool
+    protocol:   int
+    prepare_workers:int
+    prepare_io_budget:int
+    parallel_files:int
+    file_cache:BASE_SOL_FileCache
+    checkpoints:BASE_SOL_UploadCheckpoints
+    upload_retries:int
+    parallel_downloads:int
+    upload_throughput:float | None
+    chunk_policy:BASE_SOL_ChunkPolicy
+    observer:Any
+    progress:Any
+    serializer:BASE_SOL_Serializer
 
     def connection_setup(self, address: str, port: int):
         """Insert address and port to connect to the API"""
     async def send(self, package: SOL_Package_Base) -> dict:
         """Send the actual data to the API by inserting the completed package"""
+    def close(self) -> None:
+        """Closes any kept alive connections to the API"""
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - STAND-IN SERVER -
+# ----------------------------------------------------------------------------------------------------------------------
+class BASE_SOL_Server:
+    address :   str
+    port    :   int
+    directory:  str
+    keep_alive: bool
+    sessions:   bool
+    session_ttl:float
+    protocol:   int
+    chunk_policy:BASE_SOL_ChunkPolicy
+    stats   :   dict
+
+    def start(self) -> Any:
+        """Starts listening for connections on a background thread, port 0 picks a free port"""
+    def stop(self) -> None:
+        """Stops listening and closes every open connection"""
+    def handler(self, package_dict: dict, files: dict, credentials: dict | None) -> dict:
+        """Forms the reply to a package"""
+    def downloads(self, package_dict: dict, files: dict) -> list:
+        """Returns the paths or SOL_Files sent to the client before the reply"""
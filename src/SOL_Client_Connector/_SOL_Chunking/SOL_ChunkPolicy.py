@@ -0,0 +1,89 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import threading
+import time
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_ChunkPolicy, SOL_Error
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# What a chunk is used for, every purpose measures its own throughput
+CHUNK_READ = "read"           # disk reads of files which are sent as they are read
+CHUNK_COMPRESS = "compress"   # reads of files which are hashed and compressed
+CHUNK_ENCRYPT = "encrypt"     # reads of compressed files which are encrypted
+CHUNK_SEND = "send"           # socket sends of files
+CHUNK_RECV = "recv"           # socket receives of files
+
+_TARGET_CHUNKS = 64     # an object is split in about this many chunks, until the throughput is measured
+_ALIGNMENT = 4096       # chunk sizes are a multiple of the page size
+_WEIGHT = 0.2           # weight of the newest measurement in the smoothed throughput
+
+# A single policy for the size of every chunk a file is read, compressed, encrypted, sent and received in.
+#   Before anything is measured, a chunk is a fixed part of the object.
+#   After that, a chunk is sized to take about target_seconds at the measured throughput of its purpose,
+#   so fast stages work on large chunks with little overhead, and slow stages still report progress often.
+#   Socket chunks are never smaller than the socket buffer. All sizes stay within min_size and max_size.
+class SOL_ChunkPolicy(BASE_SOL_ChunkPolicy):
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+            self,
+            min_size:int=16384,         # 16kb
+            max_size:int=4194304,       # 4mb
+            target_seconds:float=0.01
+    ):
+        if not 0 < min_size <= max_size:
+            raise SOL_Error(4413, "Chunk sizes were not defined as 0 < min_size <= max_size")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self._throughput = {}   # bytes per second, by purpose
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "SOL_ChunkPolicy":
+        # The policy used by any connector, server or file which wasn't given its own
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Sizes -
+    # ------------------------------------------------------------------------------------------------------------------
+    def size(self, object_size:int, purpose:str, socket_buffer:int=0) -> int:
+        with self._lock:
+            throughput = self._throughput.get(purpose)
+        size = object_size // _TARGET_CHUNKS if throughput is None else int(throughput * self.target_seconds)
+        size = min(max(size, socket_buffer, self.min_size), self.max_size)
+        if size - size % _ALIGNMENT >= self.min_size:
+            size -= size % _ALIGNMENT
+        # small objects are handled in one go
+        return max(1, min(size, object_size))
+
+    def record(self, purpose:str, length:int, seconds:float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            throughput = self._throughput.get(purpose)
+            self._throughput[purpose] = length / seconds if throughput is None \
+                else (1 - _WEIGHT) * throughput + _WEIGHT * length / seconds
+
+    def throughput(self) -> dict:
+        with self._lock:
+            return dict(self._throughput)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Reading -
+    # ------------------------------------------------------------------------------------------------------------------
+    def chunks(self, file, object_size:int, purpose:str, socket_buffer:int=0):
+        # Yields the file in chunks of the current size, and measures the time the consumer takes for each chunk
+        while chunk := file.read(self.size(object_size, purpose, socket_buffer)):
+            start = time.perf_counter()
+            yield chunk
+            self.record(purpose, len(chunk), time.perf_counter() - start)
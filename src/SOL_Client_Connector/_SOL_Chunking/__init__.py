@@ -0,0 +1 @@
+from .SOL_ChunkPolicy import SOL_ChunkPolicy, CHUNK_READ, CHUNK_COMPRESS, CHUNK_ENCRYPT, CHUNK_SEND, CHUNK_RECV
\ No newline at end of file
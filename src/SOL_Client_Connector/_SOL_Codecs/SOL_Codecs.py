@@ -0,0 +1,158 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import bz2
+import lzma
+import zlib
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_Codec, SOL_Error
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# Every codec hands out a compressor with compress() and flush(),
+#   and a decompressor with decompress(), flush() and eof, the same as zlib's compress and decompress objects.
+class SOL_Codec(BASE_SOL_Codec):
+    def __init__(self, name:str, compressor, decompressor):
+        self.name = name
+        self._compressor = compressor       # compressor(level:int) where level is 0 to 9
+        self._decompressor = decompressor
+
+    def compressor(self, level:int=9):
+        return self._compressor(level)
+
+    def decompressor(self):
+        return self._decompressor()
+
+    def __repr__(self) -> str:
+        return f"SOL_Codec({self.name!r})"
+
+# Adds flush() to decompressors which only have eof
+class _Flushless_Decompressor:
+    def __init__(self, decompressor):
+        self._decompressor = decompressor
+
+    def decompress(self, data:bytes, max_length:int=-1) -> bytes:
+        return self._decompressor.decompress(data, max_length)
+
+    def flush(self) -> bytes:
+        return b""
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.eof
+
+    @property
+    def needs_input(self) -> bool:
+        return self._decompressor.needs_input
+
+# Sends files as they are, for files which are compressed already
+class _Store:
+    eof = True
+
+    @staticmethod
+    def compress(data:bytes) -> bytes:
+        return data
+
+    decompress = compress
+
+    @staticmethod
+    def flush() -> bytes:
+        return b""
+
+# lz4 frames need their header before the first block
+class _LZ4_Compressor:
+    def __init__(self, level:int):
+        self._compressor = lz4.frame.LZ4FrameCompressor(compression_level=level)
+        self._header = self._compressor.begin()
+
+    def compress(self, data:bytes) -> bytes:
+        header, self._header = self._header, b""
+        return header + self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        header, self._header = self._header, b""
+        return header + self._compressor.flush()
+
+def decompress_pieces(decompressor, data:bytes, max_length:int):
+    # Yields the decompressed data in pieces of at most max_length, for the decompressors which can limit their output,
+    #   so a small chunk of a very compressible file is never held in memory all at once
+    try:
+        yield decompressor.decompress(data, max_length)
+    except TypeError:
+        # no max_length, like store and zstd
+        yield decompressor.decompress(data)
+        return
+    while True:
+        if (tail := getattr(decompressor, "unconsumed_tail", None)) is not None:
+            # zlib keeps what it didn't decompress yet
+            if not tail:
+                return
+            yield decompressor.decompress(tail, max_length)
+        elif getattr(decompressor, "needs_input", True) or decompressor.eof:
+            return
+        else:
+            # lzma, bz2 and lz4 keep it internally
+            yield decompressor.decompress(b"", max_length)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Registry -
+# ----------------------------------------------------------------------------------------------------------------------
+_codecs = {}
+
+def register_codec(codec:SOL_Codec) -> None:
+    _codecs[codec.name] = codec
+
+def get_codec(name:str) -> SOL_Codec:
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise SOL_Error(4412, f"Compression codec '{name}' is not available")
+
+def available_codecs() -> list[str]:
+    return sorted(_codecs)
+
+register_codec(SOL_Codec(
+    "zlib",
+    lambda level: zlib.compressobj(level),
+    zlib.decompressobj
+))
+register_codec(SOL_Codec(
+    "lzma",
+    lambda level: lzma.LZMACompressor(preset=level),
+    lambda: _Flushless_Decompressor(lzma.LZMADecompressor())
+))
+register_codec(SOL_Codec(
+    "bz2",
+    lambda level: bz2.BZ2Compressor(max(1, level)), # bz2 has no level 0
+    lambda: _Flushless_Decompressor(bz2.BZ2Decompressor())
+))
+register_codec(SOL_Codec(
+    "store",
+    lambda level: _Store(),
+    _Store
+))
+
+# The fast codecs, when their packages are installed
+if zstandard is not None:
+    register_codec(SOL_Codec(
+        "zstd",
+        lambda level: zstandard.ZstdCompressor(level=max(1, level)).compressobj(),
+        lambda: zstandard.ZstdDecompressor().decompressobj()
+    ))
+if lz4 is not None:
+    register_codec(SOL_Codec(
+        "lz4",
+        lambda level: _LZ4_Compressor(level),
+        lambda: _Flushless_Decompressor(lz4.frame.LZ4FrameDecompressor())
+    ))
@@ -0,0 +1 @@
+from .SOL_Codecs import SOL_Codec, register_codec, get_codec, available_codecs, decompress_pieces
\ No newline at end of file
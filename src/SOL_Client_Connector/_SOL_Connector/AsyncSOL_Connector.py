@@ -0,0 +1,431 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Structure
+import asyncio
+import concurrent.futures
+import functools
+import json
+import socket
+import time
+from Crypto.PublicKey.RSA import RsaKey
+
+# Custom Structure
+from .._Base_Classes import SOL_Connector_Base, STOP_Error, SOL_Error, SOL_Package_Base
+from ..SOL_Encryption import *
+from .._SOL_File import SOL_File, SOL_FileCache
+from .._SOL_Chunking import SOL_ChunkPolicy
+from .._SOL_Hashing import TREE_LEAF_SIZE, valid_leaf_size
+from .._SOL_Metrics import SOL_Observer, span
+from .._SOL_Progress import SOL_Progress
+from .._SOL_Serializers import SOL_Serializer, get_serializer
+from .._SOL_PackageHandlers import AsyncPackageHandler_Full as AsyncPH
+from .SOL_Connector import _Stale_Connection
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# The upload throughput is only measured on sends with at least this many bytes of files,
+#   and is smoothed over sends with this weight for the newest measurement
+_MEASURE_MIN_BYTES = 262144
+_MEASURE_WEIGHT = 0.3
+
+# The one connection a batch of packages is sent over, kept open between its conversations
+class _Batch_Connection:
+    reader:asyncio.StreamReader = None
+    writer:asyncio.StreamWriter = None
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.reader = self.writer = None
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Async SOL Connector Class -
+# ----------------------------------------------------------------------------------------------------------------------
+class AsyncSOL_Connector(SOL_Connector_Base):
+    def __init__(
+            self,
+            address:str,
+            port:int,
+            streaming:bool=False,
+            executor:concurrent.futures.Executor=None,
+            key_pool:SOL_KeyPool=None,
+            key_cache:SOL_KeyCache=None,
+            protocol:int=2,
+            prepare_workers:int=None,
+            prepare_io_budget:int=None,
+            file_cache:SOL_FileCache=None,
+            chunk_policy:SOL_ChunkPolicy=None,
+            tree_hash:int | bool=None,
+            observer:SOL_Observer=None,
+            progress:SOL_Progress=None,
+            serializer:str | SOL_Serializer=None
+    ):
+        # Set up address and port
+        if not isinstance(address, str):
+            raise SOL_Error(4401, "Address was not defined as a string")
+        if not isinstance(port, int):
+            raise SOL_Error(4401, "Port was not defined as an integer")
+        self.address = address
+        self.port = port
+        self.streaming = streaming
+
+        # RSA, AES, zlib and the file IO run in this executor, None uses the default executor of the event loop
+        self.executor = executor
+        self.timeout = 6000 # 100 minute timeout
+
+        # Ephemeral key pairs are generated in the background, so send() only has to take a ready one
+        self.key_pool = key_pool if key_pool is not None else SOL_KeyPool.shared()
+
+        # Server keys are only imported again when they change, and can be pinned
+        self.key_cache = key_cache if key_cache is not None else SOL_KeyCache()
+
+        # Protocol 2 sends length prefixed frames without waiting for READY and INGESTED acknowledgements
+        if protocol not in (1, 2):
+            raise SOL_Error(4411, "Protocol was not defined as 1 or 2")
+        self.protocol = protocol
+
+        # Files are compressed and hashed concurrently before connecting, see SOL_Package.pre_check
+        self.prepare_workers = prepare_workers
+        self.prepare_io_budget = prepare_io_budget
+
+        # Files which are sent again are taken from this cache of compressed files, instead of compressed again
+        self.file_cache = file_cache
+
+        # Files are read, compressed, encrypted and sent in chunks sized to the measured throughput
+        self.chunk_policy = chunk_policy if chunk_policy is not None else SOL_ChunkPolicy.shared()
+
+        # Files are hashed in leaves of this size, on every core, instead of in one pass. The server checks every
+        #   leaf as it arrives, and the digests of the leaves tell which parts of a file changed, see SOL_TreeHash.
+        #   It is named in CONV_DATA, so a server which doesn't take tree hashes can refuse up front.
+        if tree_hash is True:
+            tree_hash = TREE_LEAF_SIZE
+        if tree_hash is not None and tree_hash is not False and not valid_leaf_size(tree_hash):
+            raise SOL_Error(4418, "Tree hash leaf size was not a power of two between 64kb and 64mb")
+        self.tree_hash = tree_hash or None
+
+        # Receives the timings, bytes and round trips of every phase and state of a send, e.g. SOL_Metrics()
+        self.observer = observer
+
+        # Receives throttled progress events of the compression, encryption, upload and download of a send,
+        #   and the INFO messages of the server. SOL_ProgressQueue never blocks the sending thread.
+        self.progress = progress
+
+        # Packages are serialized with this, by name or as a SOL_Serializer, without touching json for the rest of
+        #   the process. None is the fastest json serializer installed, e.g. orjson. Other formats like msgpack
+        #   are only used in protocol 2, and are named in CONV_DATA so a server without them can refuse up front.
+        self.serializer = serializer if isinstance(serializer, SOL_Serializer) else get_serializer(serializer)
+
+        # Bytes per second of the staged file uploads, which files with compression="auto" weigh against
+        #   the time compressing takes. Measured on every send, and can be set to a known value up front.
+        self.upload_throughput = None
+
+    def _measure_upload(self, bytes_sent:int, seconds:float, streamed:bool=False) -> None:
+        # streamed files are compressed while they are sent, which would be measured along
+        if self.streaming or streamed or bytes_sent < _MEASURE_MIN_BYTES or seconds <= 0:
+            return
+        throughput = bytes_sent / seconds
+        self.upload_throughput = throughput if self.upload_throughput is None \
+            else (1 - _MEASURE_WEIGHT) * self.upload_throughput + _MEASURE_WEIGHT * throughput
+
+    def close(self) -> None:
+        # every conversation uses its own connection, so there is nothing kept open
+        pass
+
+    async def _run(self, function_, /, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            functools.partial(function_, *args, **kwargs)
+        )
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - MAIN COMMAND -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def send(self, package:SOL_Package_Base)->dict:
+        with span(self.observer, "send"):
+            return await self._send_package(package)
+
+    async def send_many(self, packages:list[SOL_Package_Base]) -> list[dict | Exception]:
+        # Sends the packages one after the other over a single connection, where every conversation after the first
+        #   continues the session of the first, see SOL_Connector.send_many.
+        #   The replies are returned in the order of the packages, with the exception of a failed package in its place.
+        batch = _Batch_Connection()
+        replies = []
+        try:
+            with span(self.observer, "send_many"):
+                for package in packages:
+                    try:
+                        with span(self.observer, "send"):
+                            replies.append(await self._send_package(package, batch))
+                    except (SOL_Error, STOP_Error, OSError, asyncio.TimeoutError) as e:
+                        for f in getattr(package, "file_list", ()):  # type: SOL_File
+                            f.cleanup()
+                        replies.append(e)
+        finally:
+            await batch.close()
+        return replies
+
+    async def _send_package(self, package:SOL_Package_Base, batch:_Batch_Connection=None)->dict:
+        # --------------------------------------------------------------------------------------------------------------
+        # Prepare the package and some more stuff
+        # --------------------------------------------------------------------------------------------------------------
+        try:
+            # check the package is the correct format
+            if not isinstance(package, SOL_Package_Base):
+                raise SOL_Error(4402, "Package was not defined as a SOL_Package Object")
+
+            # Run the pre-check (this does the compression, unless the files are streamed)
+            with span(self.observer, "pre_check"):
+                await self._run(
+                    package.pre_check,
+                    prepare_files=not self.streaming,
+                    workers=self.prepare_workers,
+                    io_budget=self.prepare_io_budget,
+                    cache=self.file_cache,
+                    upload_throughput=self.upload_throughput,
+                    chunk_policy=self.chunk_policy,
+                    progress=self.progress,
+                    tree_hash=self.tree_hash
+                )
+            package_dict = package.dict()
+
+        except json.JSONDecodeError as e:
+            raise SOL_Error(4404, f"Package could not be JSON Decoded,\nwith the following JSON decode error:\n{e}")
+
+        # --------------------------------------------------------------------------------------------------------------
+        # send package so the server
+        # --------------------------------------------------------------------------------------------------------------
+        # The kept alive connection of a batch can be closed by the server between its conversations,
+        #   in which case the conversation is retried once on a new connection
+        for _ in range(2):
+            reused = batch is not None and batch.writer is not None
+            if reused:
+                reader, writer = batch.reader, batch.writer
+                batch.reader = batch.writer = None
+            else:
+                # Connect to API server
+                try:
+                    with span(self.observer, "connect"):
+                        reader, writer = await asyncio.open_connection(self.address, self.port)
+                except OSError as e:
+                    raise SOL_Error(4403, f"Connection to the server could not be made:\n{e}") from e
+                writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            ph = AsyncPH(
+                reader, writer, self.executor, self.timeout,
+                chunk_policy=self.chunk_policy, progress=self.progress, serializer=self.serializer
+            )
+            ph.protocol_offered = self.protocol
+
+            try:
+                package_dict, keep_alive = await self._conversation(ph, reused, package, package_dict, batch is not None)
+            except _Stale_Connection:
+                await ph.close()
+                continue
+            except BaseException:
+                await ph.close()
+                raise
+
+            if keep_alive and batch is not None:
+                batch.reader, batch.writer = reader, writer
+            else:
+                await ph.close()
+            break
+
+        else:
+            raise SOL_Error(4403,"Connection became unavailable")
+
+        # 11. Run a cleanup
+        for f in package.file_list:  # type: SOL_File
+            f.cleanup()
+
+        # 12. Return package to the client, for further processing by client application
+        return package_dict
+
+    async def _new_keys(self) -> tuple[RsaKey, RsaKey]:
+        with span(self.observer, "key_generation"):
+            return self.key_pool.get_nowait() or await self._run(pp_generate_keys, self.key_pool.key_size)
+
+    async def _conversation(
+            self,
+            ph:AsyncPH,
+            reused:bool,
+            package:SOL_Package_Base,
+            package_dict:dict,
+            batch:bool
+    ) -> tuple[dict, bool]:
+        server_public_key = client_private_key = client_public_key = None
+        session = None
+        started = False
+        keep_alive = False
+        try:
+            # a batch continues the session agreed on in its first conversation, on the kept alive connection
+            if reused:
+                session = self.key_cache.session_get(self.address, self.port)
+                if session is not None:
+                    await ph.send_state("CONV_RESUME")
+                    ph._write(session.session_id.encode("utf_8"))
+                    await ph.writer.drain()
+                    server_public_key = session.server_public_key
+                    client_private_key = session.client_private_key
+                    client_public_key = session.client_public_key
+                else:
+                    await ph.send_state("CONV_NEW")
+            if server_public_key is None:
+                # generated before the server asks for them, so the connection doesn't wait on it
+                client_private_key, client_public_key = await self._new_keys()
+
+            for _ in range(1000):
+                with span(self.observer, "wait", ph) as wait_span:
+                    state = await ph.wait_for_state_undefined()
+                    wait_span.rename(f"wait:{state}")
+                if state == "" and reused and not started:
+                    raise _Stale_Connection
+                started = True
+
+                with span(self.observer, f"state:{state}", ph):
+                    match state:
+                        # ----------------------------------------------------------------------------------------------
+                        # data states
+                        # ----------------------------------------------------------------------------------------------
+                        case "SOL_KEY":
+                            if session is not None:
+                                # the server didn't continue the session
+                                self.key_cache.session_drop(self.address, self.port, session.session_id)
+                                session = None
+                                client_private_key, client_public_key = await self._new_keys()
+                            server_public_key = await self._run(
+                                self.key_cache.server_key,
+                                self.address,
+                                self.port,
+                                (await ph.package_input("SOL_KEY", client_private_key))["key"]
+                            )
+
+                        case "CONV_DATA" if server_public_key is not None:
+                            await ph.package_output_encrypted(
+                                state="CONV_DATA",
+                                package_dict={
+                                    "api_key": package.api_key,
+                                    "files": len(package.file_list),
+                                    "cred": True if package.credentials is not None else False,
+                                    "cmd_len": len(package_dict["commands"]),
+                                    "key": client_public_key.exportKey().decode("utf_8"),
+                                    "keep_alive": batch,
+                                    "session": batch,
+                                    "proto": self.protocol,
+                                    "codecs": sorted({f.codec for f in package.file_list}),
+                                    "fmt": self.serializer.format,
+                                    "tree": self.tree_hash
+                                },
+                                server_public_key=server_public_key
+                            )
+
+                        case "COMMANDS" if server_public_key is not None:
+                            await ph.package_output_encrypted(
+                                state="COMMANDS",
+                                package_dict=package.command_builder,
+                                server_public_key=server_public_key
+                            )
+
+                        case "REPLY":
+                            package_dict = await ph.package_input(
+                                state="REPLY",
+                                client_private_key=client_private_key
+                            )
+
+                        case "ADDITIONAL":
+                            # send any files
+                            start, bytes_sent = time.perf_counter(), ph.bytes_sent
+                            for f in package.file_list:  # type: SOL_File
+                                await ph.send_state("FILE")
+                                await ph.wait_for_state("FILE")
+                                file_package_output = ph.file_package_output_stream if self.streaming or f.streamed \
+                                    else ph.file_package_output
+                                await file_package_output(
+                                    state="FILE",
+                                    file_object=f,
+                                    server_public_key=server_public_key
+                                )
+                            self._measure_upload(
+                                ph.bytes_sent - bytes_sent,
+                                time.perf_counter() - start,
+                                streamed=any(f.streamed for f in package.file_list)
+                            )
+
+                            # send credentials
+                            if package.credentials is not None:
+                                await ph.send_state("CREDENTIALS")
+                                await ph.wait_for_state("CREDENTIALS")
+                                await ph.package_output_encrypted(
+                                    state="CREDENTIALS",
+                                    package_dict=package.credentials.dict(),
+                                    server_public_key=server_public_key
+                                )
+
+                        case "SESSION":
+                            # the server agreed on a session, which the next conversation of a batch continues
+                            session_dict = await ph.package_input(
+                                state="SESSION",
+                                client_private_key=client_private_key
+                            )
+                            self.key_cache.session_store(
+                                self.address,
+                                self.port,
+                                SOL_Session(
+                                    session_id=session_dict["session_id"],
+                                    server_public_key=server_public_key,
+                                    client_private_key=client_private_key,
+                                    client_public_key=client_public_key
+                                ),
+                                ttl=session_dict["ttl"]
+                            )
+
+                        # ----------------------------------------------------------------------------------------------
+                        # flow states
+                        # ----------------------------------------------------------------------------------------------
+                        case "INFO":
+                            info_dict = await ph.package_input(
+                                state="INFO",
+                                client_private_key=client_private_key
+                            )
+                            if self.progress is not None:
+                                self.progress.info(info_dict)
+                            continue
+
+                        case "END":
+                            # natural end to a conversation
+                            break
+
+                        case "END_KEEP":
+                            # natural end to a conversation, where the server keeps the connection open for a batch
+                            keep_alive = True
+                            break
+
+                        case "STOP":
+                            stop_data = await ph.package_input(
+                                state="STOP",
+                                client_private_key=client_private_key
+                            )
+                            package_dict = stop_data
+                            break
+
+                        case a:
+                            raise SOL_Error(a)
+
+            else:
+                raise SOL_Error("CONNECTION FAILED")
+
+        except (asyncio.TimeoutError, ConnectionAbortedError, ConnectionResetError, BrokenPipeError):
+            if reused and not started:
+                raise _Stale_Connection
+            raise SOL_Error(4403,"Connection became unavailable")
+
+        except STOP_Error:
+            stop_package = await ph.package_input("STOP", client_private_key)
+            raise STOP_Error(stop_package)
+
+        return package_dict, keep_alive
@@ -0,0 +1,101 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import collections
+import select
+import socket
+import threading
+import time
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_ConnectionPool
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+class SOL_ConnectionPool(BASE_SOL_ConnectionPool):
+    def __init__(self, address:str, port:int, size:int=4, idle_timeout:float=60, timeout:float=6000):
+        self.address = address
+        self.port = port
+        self.size = size                    # maximum amount of idle connections kept alive
+        self.idle_timeout = idle_timeout    # seconds after which an idle connection is evicted
+        self.timeout = timeout
+
+        self._idle = collections.deque()    # (connection, time it was released)
+        self._lock = threading.Lock()
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Connection handling -
+    # ------------------------------------------------------------------------------------------------------------------
+    def _connect(self) -> socket.socket:
+        connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        try:
+            connection.connect((self.address, self.port))
+        except OSError:
+            connection.close()
+            raise
+        connection.settimeout(self.timeout)
+        return connection
+
+    @staticmethod
+    def _healthy(connection:socket.socket) -> bool:
+        # An idle connection should have nothing to read.
+        #   If it does, the server either closed it (empty read) or sent something out of turn.
+        try:
+            readable, _, _ = select.select([connection], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+    def _evict_expired(self) -> None:
+        # the oldest connections are at the left of the deque
+        while self._idle and time.monotonic() - self._idle[0][1] > self.idle_timeout:
+            connection, _ = self._idle.popleft()
+            connection.close()
+            self.evictions += 1
+
+    def acquire(self) -> tuple[socket.socket, bool]:
+        with self._lock:
+            self._evict_expired()
+            while self._idle:
+                connection, _ = self._idle.pop() # most recently used first, as it is the most likely to be alive
+                if self._healthy(connection):
+                    self.hits += 1
+                    return connection, True
+                connection.close()
+                self.evictions += 1
+            self.misses += 1
+        return self._connect(), False
+
+    def release(self, connection:socket.socket) -> None:
+        with self._lock:
+            self._evict_expired()
+            if len(self._idle) < self.size:
+                self._idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def discard(self, connection:socket.socket) -> None:
+        connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            while self._idle:
+                self._idle.pop()[0].close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "idle": len(self._idle),
+            }
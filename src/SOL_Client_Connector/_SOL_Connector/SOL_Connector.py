@@ -4,33 +4,93 @@
 # General Structure
 import json
 import socket
+import time
 
 # Custom Structure
 from .._Base_Classes import SOL_Connector_Base, STOP_Error, SOL_Error, SOL_Package_Base, BASE_SOL_Credentials
 from ..SOL_Encryption import *
-from .._SOL_File import SOL_File
+from .._SOL_File import SOL_File, SOL_FileCache, SOL_UploadCheckpoints
+from .._SOL_Chunking import SOL_ChunkPolicy
+from .._SOL_Hashing import TREE_LEAF_SIZE, valid_leaf_size
+from .._SOL_Metrics import SOL_Observer, span
+from .._SOL_Progress import SOL_Progress
+from .._SOL_Serializers import SOL_Serializer, get_serializer
+from .._SOL_Sinks import SOL_Downloads
 from .._SOL_PackageHandlers import PackageHandler_Full as PH
+from .SOL_ConnectionPool import SOL_ConnectionPool
 
 # ----------------------------------------------------------------------------------------------------------------------
 # - Code -
 # ----------------------------------------------------------------------------------------------------------------------
-# https://stackoverflow.com/questions/3768895/how-to-make-a-class-json-serializable#:~:text=Just%20add%20to_json,in%20your%20project.
-# MAGIC, which makes the to_json method of the File_Object work:
-def _default_Encode(self, obj):
-    return getattr(obj.__class__, "to_json", _default_Encode.default)(obj)
-_default_Encode.default = json.JSONEncoder().default
-json.JSONEncoder.default = _default_Encode
+# The upload throughput is only measured on sends with at least this many bytes of files,
+#   and is smoothed over sends with this weight for the newest measurement
+_MEASURE_MIN_BYTES = 262144
+_MEASURE_WEIGHT = 0.3
+
+# Seconds waited before the first retry of an interrupted resumable upload, doubled for every next one
+_RETRY_DELAY = 0.5
+_RETRY_DELAY_MAX = 30
 
 
 # ----------------------------------------------------------------------------------------------------------------------
 # - SOL Connector Class -
 # ----------------------------------------------------------------------------------------------------------------------
-class SOL_Connector(SOL_Connector_Base):
-    def __init__(self, address:str,port:int):
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-        self.PH = PH(self.socket)
+# Raised when a kept alive connection was closed by the server before the conversation started
+class _Stale_Connection(Exception):
+    pass
+
+# Holds on to the one connection a batch of packages is sent over, which goes back to the pool once the batch is done
+class _Batch_Pool:
+    size = 1
+
+    def __init__(self, pool:SOL_ConnectionPool):
+        self.pool = pool
+        self._connection = None
+
+    def acquire(self) -> tuple[socket.socket, bool]:
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            if SOL_ConnectionPool._healthy(connection):
+                return connection, True
+            connection.close()
+        return self.pool.acquire()
 
+    def release(self, connection:socket.socket) -> None:
+        self._connection = connection
+
+    def discard(self, connection:socket.socket) -> None:
+        self.pool.discard(connection)
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self.pool.release(self._connection)
+            self._connection = None
+
+class SOL_Connector(SOL_Connector_Base):
+    def __init__(
+            self,
+            address:str,
+            port:int,
+            streaming:bool=False,
+            pool_size:int=4,
+            pool_idle_timeout:float=60,
+            key_pool:SOL_KeyPool=None,
+            key_cache:SOL_KeyCache=None,
+            resume_sessions:bool=False,
+            protocol:int=2,
+            prepare_workers:int=None,
+            prepare_io_budget:int=None,
+            parallel_files:int=1,
+            file_cache:SOL_FileCache=None,
+            checkpoints:SOL_UploadCheckpoints=None,
+            upload_retries:int=3,
+            parallel_downloads:int=4,
+            chunk_policy:SOL_ChunkPolicy=None,
+            tree_hash:int | bool=None,
+            observer:SOL_Observer=None,
+            progress:SOL_Progress=None,
+            serializer:str | SOL_Serializer=None
+    ):
         # Set up address and port
         if not isinstance(address, str):
             raise SOL_Error(4401, "Address was not defined as a string")
@@ -39,10 +99,152 @@ class SOL_Connector(SOL_Connector_Base):
         self.address = address
         self.port = port
 
+        # Streaming uploads read, compress, encrypt and send files in a single pass without any temp files.
+        #   The server has to support streamed files, so the staged upload stays the default.
+        self.streaming = streaming
+
+        # Connections are kept alive between sends, if the server allows it.
+        #   A pool_size of 0 closes every connection at the end of its conversation.
+        self.pool = SOL_ConnectionPool(
+            address=address,
+            port=port,
+            size=pool_size,
+            idle_timeout=pool_idle_timeout,
+            timeout=6000 # 100 minute timeout
+        )
+
+        # Ephemeral key pairs are generated in the background, so send() only has to take a ready one
+        self.key_pool = key_pool if key_pool is not None else SOL_KeyPool.shared()
+
+        # Server keys are only imported again when they change, and can be pinned.
+        #   With resume_sessions, a kept alive connection continues a session agreed on earlier,
+        #   which skips the SOL_KEY exchange for a bounded time.
+        self.key_cache = key_cache if key_cache is not None else SOL_KeyCache()
+        self.resume_sessions = resume_sessions
+
+        # Protocol 2 sends length prefixed frames without waiting for READY and INGESTED acknowledgements.
+        #   It is offered in CONV_DATA, a server which doesn't know it keeps speaking protocol 1.
+        if protocol not in (1, 2):
+            raise SOL_Error(4411, "Protocol was not defined as 1 or 2")
+        self.protocol = protocol
+
+        # Files are compressed and hashed concurrently before connecting, see SOL_Package.pre_check
+        self.prepare_workers = prepare_workers
+        self.prepare_io_budget = prepare_io_budget
+
+        # With protocol 2, this many files are uploaded at the same time, multiplexed over the connection
+        if not isinstance(parallel_files, int) or parallel_files < 1:
+            raise SOL_Error(4411, "Parallel files was not defined as a positive integer")
+        self.parallel_files = parallel_files
+
+        # Files which are sent again are taken from this cache of compressed files, instead of compressed again
+        self.file_cache = file_cache
+
+        # With checkpoints, files are sent as resumable uploads in independently checked chunks.
+        #   A send cut off by a connection reset is retried up to upload_retries times, and every retry continues
+        #   from the offset the server confirmed. The checkpoints are also the file cache, so after a restart
+        #   a file isn't compressed again, and its upload continues where the last process left off.
+        if checkpoints is not None and (streaming or protocol < 2):
+            raise SOL_Error(4411, "Resumable uploads need protocol 2, and files which aren't streamed")
+        self.checkpoints = checkpoints
+        self.upload_retries = upload_retries
+
+        # Files the server sends along with its reply are received this many at a time, each on its own thread
+        if not isinstance(parallel_downloads, int) or parallel_downloads < 1:
+            raise SOL_Error(4411, "Parallel downloads was not defined as a positive integer")
+        self.parallel_downloads = parallel_downloads
+
+        # Files are read, compressed, encrypted and sent in chunks sized to the measured throughput
+        self.chunk_policy = chunk_policy if chunk_policy is not None else SOL_ChunkPolicy.shared()
+
+        # Files are hashed in leaves of this size, on every core, instead of in one pass. The server checks every
+        #   leaf as it arrives, and the digests of the leaves tell which parts of a file changed, see SOL_TreeHash.
+        #   It is named in CONV_DATA, so a server which doesn't take tree hashes can refuse up front.
+        if tree_hash is True:
+            tree_hash = TREE_LEAF_SIZE
+        if tree_hash is not None and tree_hash is not False and not valid_leaf_size(tree_hash):
+            raise SOL_Error(4418, "Tree hash leaf size was not a power of two between 64kb and 64mb")
+        self.tree_hash = tree_hash or None
+
+        # Receives the timings, bytes and round trips of every phase and state of a send, e.g. SOL_Metrics()
+        self.observer = observer
+
+        # Receives throttled progress events of the compression, encryption, upload and download of a send,
+        #   and the INFO messages of the server. SOL_ProgressQueue never blocks the sending thread.
+        self.progress = progress
+
+        # Packages are serialized with this, by name or as a SOL_Serializer, without touching json for the rest of
+        #   the process. None is the fastest json serializer installed, e.g. orjson. Other formats like msgpack
+        #   are only used in protocol 2, and are named in CONV_DATA so a server without them can refuse up front.
+        self.serializer = serializer if isinstance(serializer, SOL_Serializer) else get_serializer(serializer)
+
+        # Bytes per second of the staged file uploads, which files with compression="auto" weigh against
+        #   the time compressing takes. Measured on every send, and can be set to a known value up front.
+        self.upload_throughput = None
+
+    def _measure_upload(self, bytes_sent:int, seconds:float, streamed:bool=False) -> None:
+        # streamed files are compressed while they are sent, which would be measured along
+        if self.streaming or streamed or bytes_sent < _MEASURE_MIN_BYTES or seconds <= 0:
+            return
+        throughput = bytes_sent / seconds
+        self.upload_throughput = throughput if self.upload_throughput is None \
+            else (1 - _MEASURE_WEIGHT) * self.upload_throughput + _MEASURE_WEIGHT * throughput
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     # ------------------------------------------------------------------------------------------------------------------
     # - MAIN COMMAND -
     # ------------------------------------------------------------------------------------------------------------------
-    def send(self, package:SOL_Package_Base)->dict:
+    def send(self, package:SOL_Package_Base, downloads=None)->dict:
+        # The files the server sends along with its reply are streamed into downloads, which is
+        #   a directory, where every file is stored under the name the server gave it,
+        #   a dict of the name of a file to its target, or a callable downloads(name, length) returning the target.
+        #   A target is a file path, an open binary file, a bytearray, a callable receiving every piece, or a SOL_Sink.
+        #   What every target ended up with is in package.downloads, by name.
+        #   Without downloads, the server isn't offered to send any files.
+        with span(self.observer, "send"):
+            return self._send_package(package, downloads=downloads)
+
+    def send_many(self, packages:list[SOL_Package_Base], downloads=None) -> list[dict | Exception]:
+        # Sends the packages one after the other over a single connection, where every conversation after the first
+        #   continues the session of the first. The key generation, connect and SOL_KEY exchange are only paid once,
+        #   as long as the server keeps the connection alive and agrees on a session.
+        #   The replies are returned in the order of the packages. A package that fails doesn't stop the others,
+        #   its exception is returned in the place of its reply.
+        batch_pool = _Batch_Pool(self.pool)
+        replies = []
+        try:
+            with span(self.observer, "send_many"):
+                for package in packages:
+                    try:
+                        with span(self.observer, "send"):
+                            replies.append(self._send_package(package, batch_pool, resume_sessions=True, downloads=downloads))
+                    except (SOL_Error, STOP_Error, OSError) as e:
+                        for f in getattr(package, "file_list", ()):  # type: SOL_File
+                            f.cleanup()
+                        replies.append(e)
+        finally:
+            batch_pool.close()
+        return replies
+
+    def _send_package(
+            self,
+            package:SOL_Package_Base,
+            pool:SOL_ConnectionPool | _Batch_Pool=None,
+            resume_sessions:bool=None,
+            downloads=None
+    )->dict:
+        pool = self.pool if pool is None else pool
+        resume_sessions = self.resume_sessions if resume_sessions is None else resume_sessions
+        downloads = SOL_Downloads(downloads) if downloads is not None else None
+
         # --------------------------------------------------------------------------------------------------------------
         # Prepare the package and some more stuff
         # --------------------------------------------------------------------------------------------------------------
@@ -51,106 +253,304 @@ class SOL_Connector(SOL_Connector_Base):
             if not isinstance(package, SOL_Package_Base):
                 raise SOL_Error(4402, "Package was not defined as a SOL_Package Object")
 
-            # Run the pre-check (this does the compression)
-            package.pre_check()
+            # Run the pre-check (this does the compression, unless the files are streamed)
+            with span(self.observer, "pre_check"):
+                package.pre_check(
+                    prepare_files=not self.streaming,
+                    workers=self.prepare_workers,
+                    io_budget=self.prepare_io_budget,
+                    cache=self.checkpoints if self.checkpoints is not None else self.file_cache,
+                    upload_throughput=self.upload_throughput,
+                    chunk_policy=self.chunk_policy,
+                    progress=self.progress,
+                    tree_hash=self.tree_hash
+                )
             package_dict = package.dict()
-            client_private_key, client_public_key = pp_generate_keys()
-            client_public_key_exported = client_public_key.exportKey().decode("utf_8")
-
-            # Connect to API server and send data
-            self.socket.connect((self.address, self.port))
-            self.socket.settimeout(6000) # 100 minute timeout
-
-        except ConnectionRefusedError as e:
-            # todo something here to handle the error
-            raise
 
         except json.JSONDecodeError as e:
             raise SOL_Error(4404, f"Package could not be JSON Decoded,\nwith the following JSON decode error:\n{e}")
 
-        # except ConnectionRefusedError:
-        #     raise SOL_Error(5005)
-
         # --------------------------------------------------------------------------------------------------------------
         # send package so the server
         # --------------------------------------------------------------------------------------------------------------
-        with self.socket:
+        # A send with resumable uploads is retried when the connection is cut, and continues the uploads.
+        #   Streams and iterables can only be read once, so a package with those is never retried.
+        retries = self.upload_retries if self.checkpoints is not None and package.file_list \
+            and all(f.replayable for f in package.file_list) else 0
+        for attempt in range(retries + 1):
+            try:
+                package_dict = self._deliver(package, package_dict, pool, resume_sessions, downloads)
+                break
+            except SOL_Error as e:
+                if attempt == retries or e.args[:1] != (4403,):
+                    raise
+            time.sleep(min(_RETRY_DELAY * 2 ** attempt, _RETRY_DELAY_MAX))
+
+        # 11. Run a cleanup
+        for f in package.file_list:  # type: SOL_File
+            f.cleanup()
+        package.downloads = downloads.results if downloads is not None else {}
+
+        # 12. Return package to the client, for further processing by client application
+        return package_dict
+
+    def _deliver(
+            self,
+            package:SOL_Package_Base,
+            package_dict:dict,
+            pool:SOL_ConnectionPool | _Batch_Pool,
+            resume_sessions:bool,
+            downloads:SOL_Downloads=None
+    ) -> dict:
+        # A kept alive connection can be closed by the server while it sits in the pool,
+        #   in which case the conversation is retried once on a new connection
+        for _ in range(2):
+            # Connect to API server, or reuse a warm connection
             try:
-                for _ in range(1000):
-                    match self.PH.wait_for_state_undefined():
+                with span(self.observer, "connect"):
+                    connection, reused = pool.acquire()
+            except OSError as e:
+                # the pool already closed the socket which couldn't connect, so nothing is held here
+                raise SOL_Error(4403, f"Connection to the server could not be made:\n{e}") from e
+
+            try:
+                package_dict, keep_alive = self._conversation(
+                    PH(connection, chunk_policy=self.chunk_policy, progress=self.progress, serializer=self.serializer),
+                    reused,
+                    package,
+                    package_dict,
+                    pool.size > 0,
+                    resume_sessions,
+                    downloads
+                )
+            except _Stale_Connection:
+                pool.discard(connection)
+                continue
+            except BaseException:
+                pool.discard(connection)
+                raise
+
+            if keep_alive:
+                pool.release(connection)
+            else:
+                pool.discard(connection)
+            break
+
+        else:
+            raise SOL_Error(4403,"Connection became unavailable")
+        return package_dict
+
+    def _conversation(
+            self,
+            ph:PH,
+            reused:bool,
+            package:SOL_Package_Base,
+            package_dict:dict,
+            keep_alive_offered:bool,
+            resume_sessions:bool,
+            downloads:SOL_Downloads=None
+    ) -> tuple[dict, bool]:
+        server_public_key = client_private_key = client_public_key = None
+        if downloads is not None:
+            downloads.reset() # of an earlier attempt
+        session = None
+        started = False
+        keep_alive = False
+        ph.protocol_offered = self.protocol
+        try:
+            # a kept alive connection has to be told that a new conversation starts,
+            #   which can continue an earlier session. The server either continues it at CONV_DATA,
+            #   or starts over at SOL_KEY.
+            if reused:
+                session = self.key_cache.session_get(self.address, self.port) if resume_sessions else None
+                if session is not None:
+                    ph.send_state("CONV_RESUME")
+                    ph._send(session.session_id.encode("utf_8"))
+                    server_public_key = session.server_public_key
+                    client_private_key = session.client_private_key
+                    client_public_key = session.client_public_key
+                else:
+                    ph.send_state("CONV_NEW")
+
+            for _ in range(1000):
+                with span(self.observer, "wait", ph) as wait_span:
+                    state = ph.wait_for_state_undefined()
+                    wait_span.rename(f"wait:{state}")
+                if state == "" and reused and not started:
+                    raise _Stale_Connection
+                started = True
+
+                with span(self.observer, f"state:{state}", ph):
+                    match state:
                         # ----------------------------------------------------------------------------------------------
                         # data states
                         # ----------------------------------------------------------------------------------------------
                         case "SOL_KEY":
-                            server_public_key = pp_import_key(
-                                self.PH.package_input("SOL_KEY", client_private_key)["key"]
+                            if session is not None:
+                                # the server didn't continue the session
+                                self.key_cache.session_drop(self.address, self.port, session.session_id)
+                                session = None
+                            with span(self.observer, "key_generation"):
+                                client_private_key, client_public_key = self.key_pool.get()
+                            server_public_key = self.key_cache.server_key(
+                                self.address,
+                                self.port,
+                                ph.package_input("SOL_KEY", client_private_key)["key"]
                             )
 
                         case "CONV_DATA" if server_public_key is not None:
-                            self.PH.package_output_encrypted(
+                            ph.package_output_encrypted(
                                 state="CONV_DATA",
                                 package_dict={
                                     "api_key": package.api_key,
                                     "files": len(package.file_list),
                                     "cred": True if package.credentials is not None else False,
                                     "cmd_len": len(package_dict["commands"]),
-                                    "key": client_public_key_exported
+                                    "key": client_public_key.exportKey().decode("utf_8"),
+                                    "keep_alive": keep_alive_offered,
+                                    "session": resume_sessions,
+                                    "proto": self.protocol,
+                                    "codecs": sorted({f.codec for f in package.file_list}),
+                                    "fmt": self.serializer.format,
+                                    "dl": self.parallel_downloads if downloads is not None else 0,
+                                    "tree": self.tree_hash
                                 },
                                 server_public_key=server_public_key
                             )
 
                         case "COMMANDS" if server_public_key is not None:
-                            self.PH.package_output_encrypted(
+                            ph.package_output_encrypted(
                                 state="COMMANDS",
-                                package_dict=package_dict,
+                                package_dict=package.command_builder,
                                 server_public_key=server_public_key
                             )
 
                         case "REPLY":
-                            package_dict = self.PH.package_input(
+                            package_dict = ph.package_input(
                                 state="REPLY",
                                 client_private_key=client_private_key
                             )
 
                         case "ADDITIONAL":
-                            # send any files
-                            for f in package.file_list:  # type: SOL_File
-                                self.PH.send_state("FILE")
-                                self.PH.wait_for_state("FILE")
-                                self.PH.file_package_output(
-                                    state="FILE",
-                                    file_object=f,
-                                    server_public_key=server_public_key
+                            start, bytes_sent = time.perf_counter(), ph.bytes_sent
+
+                            # send resumable files one by one, files which aren't on disk can't resume and are streamed
+                            if self.checkpoints is not None and ph.protocol >= 2:
+                                for f in package.file_list:  # type: SOL_File
+                                    if f.streamed:
+                                        ph.send_state("FILE")
+                                        ph.wait_for_state("FILE")
+                                        ph.file_package_output_stream(
+                                            state="FILE",
+                                            file_object=f,
+                                            server_public_key=server_public_key
+                                        )
+                                        continue
+                                    ph.send_state("UPLOAD")
+                                    ph.wait_for_state("UPLOAD")
+                                    ph.file_package_output_resumable(
+                                        state="UPLOAD",
+                                        file_object=f,
+                                        server_public_key=server_public_key,
+                                        checkpoints=self.checkpoints
+                                    )
+
+                            # or send several files at once
+                            elif self.parallel_files > 1 and len(package.file_list) > 1 and ph.protocol >= 2:
+                                ph.send_state("FILES")
+                                ph.wait_for_state("FILES")
+                                ph.file_package_output_multiple(
+                                    state="FILES",
+                                    file_objects=package.file_list,
+                                    server_public_key=server_public_key,
+                                    workers=self.parallel_files,
+                                    stream=self.streaming
                                 )
 
+                            # or send the files one by one
+                            else:
+                                for f in package.file_list:  # type: SOL_File
+                                    ph.send_state("FILE")
+                                    ph.wait_for_state("FILE")
+                                    file_package_output = ph.file_package_output_stream if self.streaming or f.streamed \
+                                        else ph.file_package_output
+                                    file_package_output(
+                                        state="FILE",
+                                        file_object=f,
+                                        server_public_key=server_public_key
+                                    )
+                            self._measure_upload(
+                                ph.bytes_sent - bytes_sent,
+                                time.perf_counter() - start,
+                                streamed=any(f.streamed for f in package.file_list)
+                            )
+
                             # send credentials
                             if package.credentials is not None:
-                                self.PH.send_state("CREDENTIALS")
-                                self.PH.wait_for_state("CREDENTIALS")
-                                self.PH.package_output_encrypted(
+                                ph.send_state("CREDENTIALS")
+                                ph.wait_for_state("CREDENTIALS")
+                                ph.package_output_encrypted(
                                     state="CREDENTIALS",
                                     package_dict=package.credentials.dict(),
                                     server_public_key=server_public_key
                                 )
 
+                        case "DOWNLOAD" if downloads is not None:
+                            ph.file_package_input(
+                                state="DOWNLOAD",
+                                client_private_key=client_private_key,
+                                sinks=downloads
+                            )
+
+                        case "DOWNLOADS" if downloads is not None:
+                            # several files at once, each received on its own thread
+                            ph.file_package_input_multiple(
+                                state="DOWNLOADS",
+                                client_private_key=client_private_key,
+                                sinks=downloads
+                            )
+
+                        case "SESSION":
+                            # the server agreed on a session, which a next conversation can continue
+                            session_dict = ph.package_input(
+                                state="SESSION",
+                                client_private_key=client_private_key
+                            )
+                            self.key_cache.session_store(
+                                self.address,
+                                self.port,
+                                SOL_Session(
+                                    session_id=session_dict["session_id"],
+                                    server_public_key=server_public_key,
+                                    client_private_key=client_private_key,
+                                    client_public_key=client_public_key
+                                ),
+                                ttl=session_dict["ttl"]
+                            )
+
                         # ----------------------------------------------------------------------------------------------
                         # flow states
                         # ----------------------------------------------------------------------------------------------
                         case "INFO":
-                            package_dict = self.PH.package_input(
+                            info_dict = ph.package_input(
                                 state="INFO",
                                 client_private_key=client_private_key
                             )
-                            #todo add something here to do something with the info, QSignal
-                            print(package_dict)
+                            if self.progress is not None:
+                                self.progress.info(info_dict)
                             continue
 
                         case "END":
                             # natural end to a conversation
                             break
 
+                        case "END_KEEP":
+                            # natural end to a conversation, where the server keeps the connection open for a next one
+                            keep_alive = True
+                            break
+
                         case "STOP":
-                            stop_data = self.PH.package_input(
+                            stop_data = ph.package_input(
                                 state="STOP",
                                 client_private_key=client_private_key
                             )
@@ -160,19 +560,16 @@ class SOL_Connector(SOL_Connector_Base):
                         case a:
                             raise SOL_Error(a)
 
-                else:
-                    raise SOL_Error("CONNECTION FAILED")
+            else:
+                raise SOL_Error("CONNECTION FAILED")
 
-            except (socket.timeout, ConnectionAbortedError, ConnectionResetError):
-                raise SOL_Error(4403,"Connection became unavailable")
+        except (socket.timeout, ConnectionAbortedError, ConnectionResetError, BrokenPipeError):
+            if reused and not started:
+                raise _Stale_Connection
+            raise SOL_Error(4403,"Connection became unavailable")
 
-            except STOP_Error:
-                stop_package = self.PH.package_input("STOP", client_private_key)
-                raise STOP_Error(stop_package)
+        except STOP_Error:
+            stop_package = ph.package_input("STOP", client_private_key)
+            raise STOP_Error(stop_package)
 
-        # 11. Run a cleanup
-        for f in package.file_list:  # type: SOL_File
-            f.cleanup()
-
-        # 12. Return package to the client, for further processing by client application
-        return package_dict
\ No newline at end of file
+        return package_dict, keep_alive
@@ -1 +1,3 @@
-from .SOL_Connector import SOL_Connector
\ No newline at end of file
+from .SOL_Connector import SOL_Connector
+from .SOL_ConnectionPool import SOL_ConnectionPool
+from .AsyncSOL_Connector import AsyncSOL_Connector
\ No newline at end of file
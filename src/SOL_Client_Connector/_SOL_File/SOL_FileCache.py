@@ -0,0 +1,214 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+try:
+    import fcntl
+except ImportError: # not available on Windows, where the cache relies on atomic renames only
+    fcntl = None
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_FileCache, BASE_Sol_File
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# An on disk cache of compressed files and their hash, so files which are sent again aren't compressed again.
+#   index/<key>.json    maps a file, by path, size, mtime, inode, codec, compression level and tree hash leaf size,
+#                       to its artifact, and holds the digests of its leaves when it is tree hashed
+#   data/<sha256>_<codec>_<level>.z the compressed artifact, shared by every file with the same content
+# The least recently used artifacts are removed once the cache grows over max_size.
+# Every write goes through a temp file and an atomic rename, and eviction holds a lock file,
+#   so several processes on one host can share the same directory.
+class SOL_FileCache(BASE_SOL_FileCache):
+    def __init__(
+            self,
+            directory:str=os.path.join(os.path.expanduser("~"), ".cache", "SOL_Client_Connector"),
+            max_size:int=1073741824     # 1gb
+    ):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(os.path.join(directory, "index"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "data"), exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0    # bytes of files which didn't have to be compressed and hashed
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Keys and paths -
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _key(file_object:BASE_Sol_File) -> str:
+        stat = os.stat(file_object.filepath)
+        return hashlib.sha256(json.dumps([
+            os.path.abspath(file_object.filepath),
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ino,
+            file_object.codec,
+            file_object.compression_level,
+            file_object.tree_hash,
+        ]).encode("utf_8")).hexdigest()
+
+    def _index_path(self, key:str) -> str:
+        return os.path.join(self.directory, "index", f"{key}.json")
+
+    def _artifact_path(self, file_object:BASE_Sol_File, hash_value:str) -> str:
+        return os.path.join(
+            self.directory,
+            "data",
+            f"{hash_value}_{file_object.codec}_{file_object.compression_level}.z"
+        )
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock, open(os.path.join(self.directory, "lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _count(self, file_object:BASE_Sol_File, hit:bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.bytes_saved += os.path.getsize(file_object.filepath)
+            else:
+                self.misses += 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Lookups -
+    # ------------------------------------------------------------------------------------------------------------------
+    def _lookup(self, file_object:BASE_Sol_File) -> tuple[str, str, list[bytes] | None] | None:
+        try:
+            with open(self._index_path(self._key(file_object)), "r") as index_file:
+                index = json.load(index_file)
+            hash_value = index["hash_value"]
+            # the digests of the leaves of a tree hashed file
+            leaf_hashes = [bytes.fromhex(leaf) for leaf in index["leaves"]] if file_object.tree_hash is not None else None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        artifact_path = self._artifact_path(file_object, hash_value)
+        try:
+            os.utime(artifact_path) # marks it as recently used
+        except OSError:
+            return None # evicted
+        return artifact_path, hash_value, leaf_hashes
+
+    def fetch(self, file_object:BASE_Sol_File, destination:str) -> bool:
+        if (cached := self._lookup(file_object)) is not None:
+            artifact_path, hash_value, leaf_hashes = cached
+            try:
+                # a hard link doesn't copy anything, a copy is only needed across file systems
+                try:
+                    os.link(artifact_path, destination)
+                except OSError:
+                    shutil.copyfile(artifact_path, destination)
+            except FileNotFoundError:
+                pass # evicted in between
+            else:
+                file_object.hash_value = hash_value
+                file_object.leaf_hashes = leaf_hashes
+                self._count(file_object, hit=True)
+                return True
+        self._count(file_object, hit=False)
+        return False
+
+    def open(self, file_object:BASE_Sol_File):
+        if (cached := self._lookup(file_object)) is not None:
+            artifact_path, hash_value, leaf_hashes = cached
+            try:
+                artifact = open(artifact_path, "rb")
+            except FileNotFoundError:
+                pass # evicted in between
+            else:
+                file_object.hash_value = hash_value
+                file_object.leaf_hashes = leaf_hashes
+                self._count(file_object, hit=True)
+                return artifact
+        self._count(file_object, hit=False)
+        return None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Storing and eviction -
+    # ------------------------------------------------------------------------------------------------------------------
+    def temp_path(self) -> str:
+        return os.path.join(self.directory, "data", f".{os.getpid()}_{threading.get_ident()}_{time.monotonic_ns()}.tmp")
+
+    def store(self, file_object:BASE_Sol_File, compressed_path:str, move:bool=False) -> None:
+        artifact_path = self._artifact_path(file_object, file_object.hash_value)
+        index_path = self._index_path(self._key(file_object))
+        try:
+            if os.path.exists(artifact_path):
+                # the same content is already cached under another path
+                if move:
+                    os.remove(compressed_path)
+            elif move:
+                os.replace(compressed_path, artifact_path)
+            else:
+                temp_path = self.temp_path()
+                shutil.copyfile(compressed_path, temp_path)
+                os.replace(temp_path, artifact_path)
+
+            temp_path = f"{index_path}.{os.getpid()}_{threading.get_ident()}.tmp"
+            with open(temp_path, "w") as index_file:
+                json.dump({
+                    "hash_value": file_object.hash_value,
+                    "filepath": os.path.abspath(file_object.filepath),
+                    "leaves": [leaf.hex() for leaf in file_object.leaf_hashes] if file_object.leaf_hashes is not None else None,
+                }, index_file)
+            os.replace(temp_path, index_path)
+        except OSError:
+            return # a cache which can't be written to doesn't stop the file from being sent
+        self.evict()
+
+    def evict(self) -> None:
+        with self._locked():
+            data_directory = os.path.join(self.directory, "data")
+            artifacts = []
+            for entry in os.scandir(data_directory):
+                if entry.name.endswith(".z"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    artifacts.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in artifacts)
+            for _, size, path in sorted(artifacts):
+                if total <= self.max_size:
+                    break
+                try:
+                    os.remove(path) # index entries pointing to it become misses
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def clear(self) -> None:
+        with self._locked():
+            for sub_directory in ("index", "data"):
+                for entry in os.scandir(os.path.join(self.directory, sub_directory)):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0,
+                "bytes_saved": self.bytes_saved,
+            }
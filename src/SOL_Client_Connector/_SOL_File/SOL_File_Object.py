@@ -2,26 +2,76 @@
 # - Package Imports -
 # ----------------------------------------------------------------------------------------------------------------------
 # General Packages
+import collections
 import datetime
 import gc
 import json
 import os
-import functools
 import string
-import zlib
 import hashlib
 import pathlib
 import random
 import math
+import time
 
 # Custom Packages
 from .._Base_Classes import SOL_Error, BASE_Sol_File
+from .._SOL_Codecs import get_codec, available_codecs
+from .._SOL_Chunking import SOL_ChunkPolicy, CHUNK_READ, CHUNK_COMPRESS
+from .._SOL_Progress import PROGRESS_COMPRESS
+from .._SOL_Hashing import SOL_TreeHash
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Compression probing -
+# ----------------------------------------------------------------------------------------------------------------------
+# With compression="auto", a few blocks spread over the file are compressed by a fast and a strong codec.
+#   The estimated time of compressing and uploading the whole file decides between store, fast and strong.
+_PROBE_BLOCKS = 4
+_PROBE_BLOCK_SIZE = 65536
+_PROBE_INCOMPRESSIBLE = 7.9     # bits per byte, above which the data is taken as compressed or encrypted already
+_DEFAULT_UPLOAD_THROUGHPUT = 12500000   # bytes per second (100 mbit) when the connection hasn't been measured yet
+_AUTO_FAST = (("zstd", 1), ("lz4", 1), ("zlib", 1))    # the first available of each is used
+_AUTO_STRONG = (("zstd", 9), ("zlib", 9))
+
+def _entropy(data:bytes) -> float:
+    return -sum(c / len(data) * math.log2(c / len(data)) for c in collections.Counter(data).values())
+
+def _probe_samples(file, size:int) -> list[bytes]:
+    if size <= _PROBE_BLOCKS * _PROBE_BLOCK_SIZE:
+        return [file.read()]
+    samples = []
+    for i in range(_PROBE_BLOCKS):
+        file.seek(i * (size - _PROBE_BLOCK_SIZE) // (_PROBE_BLOCKS - 1))
+        samples.append(file.read(_PROBE_BLOCK_SIZE))
+    return samples
+
+def _probe_codec(codec:str, level:int, samples:list[bytes]) -> dict:
+    compressed = 0
+    start = time.perf_counter()
+    for sample in samples:
+        compressor = get_codec(codec).compressor(level)
+        compressed += len(compressor.compress(sample)) + len(compressor.flush())
+    seconds = max(time.perf_counter() - start, 1e-6)
+    sampled = sum(len(sample) for sample in samples)
+    return {
+        "codec": codec,
+        "level": level,
+        "ratio": compressed / sampled,          # compressed size over original size
+        "compress_speed": sampled / seconds,    # original bytes per second
+    }
 
 # ----------------------------------------------------------------------------------------------------------------------
 # - SOL File Object -
 # ----------------------------------------------------------------------------------------------------------------------
 class SOL_File(BASE_Sol_File):
-    def __init__(self, filepath:str,compression:int=9,already_compressed=False):
+    streamed = False    # files which aren't on disk are always streamed, see SOL_DataFile
+    replayable = True   # the file can be read again, when a send is retried
+
+    def __init__(self, filepath:str,compression:int | str=9,already_compressed=False,codec:str=None):
+        self.filepath = filepath
+        self._setup(compression, already_compressed, codec)
+
+    def _setup(self, compression:int | str, already_compressed:bool, codec:str | None) -> None:
         self.hash_value = ""
         file_name_random = ''.join([
             *[random.choice((string.ascii_letters + string.digits)) for _ in range(16)],
@@ -30,9 +80,22 @@ class SOL_File(BASE_Sol_File):
         self.filename_transmission = f"""{file_name_random}.sol_file"""
         self.filename_temp = f"""{file_name_random}.temp"""
         self.cleanup()  # Delete temp file as a precaution, (theoretically it shouldn't exsist but you never know)
-        self.filepath = filepath
+        # "auto" probes the file on pre_check, and sets the codec and level from that, see probe_compression
+        self.compression_auto = compression == "auto" and not already_compressed
+        self._codec_requested = codec
+        self.compression_decision = None
+        if compression == "auto":
+            compression = 9
         self.compression_level=compression if 0 <= compression < 10 else 9
         self.already_compressed = already_compressed
+        # files which are compressed already (images, archives, ...) are sent as they are
+        self.codec = get_codec("store" if already_compressed else codec or "zlib").name
+        self.preparation_time = None
+        self.cache = None   # an optional SOL_FileCache, set by SOL_Package.pre_check
+        self.chunk_policy = SOL_ChunkPolicy.shared()
+        self.progress = None    # an optional SOL_Progress, set by SOL_Package.pre_check
+        self.tree_hash = None   # the leaf size when the file is tree hashed, set by SOL_Package.pre_check
+        self.leaf_hashes = None # the digests of the leaves of a tree hashed file, once it was hashed
 
     @property
     def filepath(self) -> str:
@@ -45,45 +108,231 @@ class SOL_File(BASE_Sol_File):
         self._filename = pathlib.Path(filepath).name
         self._filepath = filepath
 
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def size(self) -> int | None:
+        # bytes of the file before compression, None while it isn't known
+        return os.path.getsize(self.filepath)
+
+    def _source_chunks(self, size:int):
+        # the chunks of the file before compression
+        with open(self.filepath, "rb") as file:
+            yield from self.chunk_policy.chunks(file, size, CHUNK_COMPRESS)
+
+    def _samples(self, size:int) -> list[bytes]:
+        with open(self.filepath, "rb") as file:
+            return _probe_samples(file, size)
+
     def cleanup(self) -> None:
         if pathlib.Path(f"temp/{self.filename_temp}").exists():
             os.remove(f"temp/{self.filename_temp}")
         if pathlib.Path(f"temp/{self.filename_transmission}").exists():
             os.remove(f"temp/{self.filename_transmission}")
 
-    #  make object json decode-able, thanks to pure magic
+    # what the serializers place in the commands, instead of the SOL_File itself
     def to_json(self) -> dict:
         return {
             "temp_file_name": self.filename_transmission,
             "hash_value": self.hash_value,
-            "full_size": os.path.getsize(self.filepath)
+            "codec": self.codec,
+            "full_size": self.size
         }
 
-    # get buffer size
-    def _buffer_size(self, object_size:int) -> int:
-        match object_size:
-            case int(a) if a < 1048576:  # up to 1mb
-                return 10240  # buffer of 10kb
-            case int(a) if 1048576 < a < 10485760:  # between 1mb and 10mb
-                return 102400  # buffer of 100kb
-            case int(a) if 10485760 < a < 10485760:  # between 10mb and 100mb
-                return 1048576  # buffer of 1mb
-            case int(a) if a > 10485760:
-                return 1048560  # buffer of 10mb
+    # chooses the codec and level with the lowest estimated time of compressing and uploading the whole file
+    def probe_compression(self, upload_throughput:float=None) -> dict:
+        size = self.size
+        samples = self._samples(size)
+        sampled = sum(len(sample) for sample in samples)
+        entropy = _entropy(b"".join(samples)) if sampled else 0.0
+
+        candidates = {"store": {"codec": "store", "level": 0, "ratio": 1.0, "compress_speed": math.inf}}
+        if sampled and entropy < _PROBE_INCOMPRESSIBLE:
+            # an explicitly chosen codec is used for both, at its lowest and highest level
+            for tier, preferences in (("fast", _AUTO_FAST), ("strong", _AUTO_STRONG)):
+                if self._codec_requested is not None:
+                    preferences = ((self._codec_requested, 1 if tier == "fast" else 9),)
+                codec, level = next(p for p in preferences if p[0] in available_codecs())
+                candidates[tier] = _probe_codec(codec, level, samples)
+
+        throughput = upload_throughput or _DEFAULT_UPLOAD_THROUGHPUT
+        # the estimates grow linearly with the size, so an unknown size is estimated by the sampled bytes
+        estimated_size = size if size is not None else sampled
+        for candidate in candidates.values():
+            candidate["estimated_time"] = estimated_size / candidate["compress_speed"] + estimated_size * candidate["ratio"] / throughput
+        choice = min(candidates, key=lambda tier: candidates[tier]["estimated_time"])
+
+        self.codec = get_codec(candidates[choice]["codec"]).name
+        self.compression_level = candidates[choice]["level"]
+        self.compression_decision = {
+            "choice": choice,
+            "codec": self.codec,
+            "level": self.compression_level,
+            "size": size,
+            "sampled": sampled,
+            "entropy": entropy,
+            "upload_throughput": throughput,
+            "upload_throughput_measured": upload_throughput is not None,
+            "candidates": candidates,
+        }
+        return self.compression_decision
+
+    # get chunk size
+    def _chunk_size(self, object_size:int, purpose:str) -> int:
+        return self.chunk_policy.size(object_size, purpose)
+
+    def _hasher(self):
+        return hashlib.sha256() if self.tree_hash is None else SOL_TreeHash(self.tree_hash)
+
+    # compressed chunk generator, used by both the staged and the streaming upload
+    def _compress(self):
+        hash_sum = self._hasher()
+        compressor = get_codec(self.codec).compressor(self.compression_level)
+        size = self.size
+        done = 0
+        for chunk in self._source_chunks(size):
+            if self.progress is not None:
+                done += len(chunk)
+                self.progress.update(PROGRESS_COMPRESS, self.filename_transmission, done, size)
+            hash_sum.update(chunk)
+            if compressed_chunk := compressor.compress(chunk):
+                yield compressed_chunk
+        if self.progress is not None and size is None:
+            self.progress.update(PROGRESS_COMPRESS, self.filename_transmission, done, done)
+        yield compressor.flush()
+        # the hash is only known once the whole file has passed through
+        self.hash_value = hash_sum.hexdigest()
+        self.leaf_hashes = hash_sum.leaves() if self.tree_hash is not None else None
+
+    def compressed_chunks(self):
+        if self.cache is None:
+            yield from self._compress()
+            return
+
+        # a cached file is read as it was compressed earlier, which also gives its hash value
+        if (artifact := self.cache.open(self)) is not None:
+            with artifact:
+                yield from self.chunk_policy.chunks(artifact, self.size, CHUNK_READ)
+            return
+
+        # otherwise it is written to the cache while it passes through
+        temp_path = self.cache.temp_path()
+        try:
+            with open(temp_path, "wb") as temp_file:
+                for chunk in self._compress():
+                    temp_file.write(chunk)
+                    yield chunk
+            self.cache.store(self, temp_path, move=True)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
 
     # compression function
     def compress_and_hash(self)->None:
-        hash_sum = hashlib.sha256()
-        compressor = zlib.compressobj(self.compression_level)
-        buffer_size = self._buffer_size(os.path.getsize(self.filepath))
-        total_chunks = math.ceil(os.path.getsize(self.filepath) / buffer_size)
-        with open(self.filepath, "rb") as file, open(f"temp/{self.filename_temp}", "ab+") as temp_file:
-            for i, chunk in enumerate(iter(functools.partial(
-                    file.read,
-                    buffer_size
-            ), b"")):
-                hash_sum.update(chunk)
-                temp_file.write(compressor.compress(chunk))
-                print(i, total_chunks)
-            temp_file.write(compressor.flush())
-        self.hash_value = hash_sum.hexdigest()
+        if self.cache is not None and self.cache.fetch(self, f"temp/{self.filename_temp}"):
+            return
+        with open(f"temp/{self.filename_temp}", "ab+") as temp_file:
+            for chunk in self._compress():
+                temp_file.write(chunk)
+        if self.cache is not None:
+            self.cache.store(self, f"temp/{self.filename_temp}")
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - SOL File Object of data that isn't on disk -
+# ----------------------------------------------------------------------------------------------------------------------
+# Reads slices of a buffer, without copying them
+class _Buffer_Reader:
+    def __init__(self, view:memoryview):
+        self.view = view
+        self.position = 0
+
+    def read(self, size:int=-1) -> memoryview:
+        chunk = self.view[self.position:] if size < 0 else self.view[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+    def seek(self, position:int) -> None:
+        self.position = position
+
+# A file of data which is in memory, or produced while it is sent, instead of a file on disk:
+#   bytes, a bytearray or memoryview, a readable binary stream, or an iterable of bytes chunks like a generator.
+#   It is hashed, compressed and encrypted like any file, but never through temp files, as it is always streamed,
+#   with its length and hash value sent after the last chunk. The size of a stream or iterable is optional,
+#   when it is known up front it only sizes the chunks and the progress.
+#   A stream or iterable can only be read once, so its file can only be sent once, and a failed send isn't retried.
+class SOL_DataFile(SOL_File):
+    streamed = True
+
+    def __init__(self, data, name:str=None, size:int=None, compression:int | str=9, already_compressed=False, codec:str=None):
+        match data:
+            case bytes() | bytearray() | memoryview():
+                with memoryview(data) as view:
+                    size = view.nbytes
+            case str():
+                raise SOL_Error(4406, "Data was given as a str instead of bytes")
+            case _ if hasattr(data, "read"):
+                pass
+            case _ if hasattr(data, "__iter__"):
+                data = iter(data)
+            case _:
+                raise SOL_Error(4406, "Data was not defined as bytes, a memoryview, a binary stream or an iterable of chunks")
+        self.data = data
+        self._filepath = None
+        self._filename = name
+        self._size = size
+        self._head = []         # the start of a stream or iterable, read ahead by probe_compression
+        self._consumed = False
+        self._setup(compression, already_compressed, codec)
+
+    @property
+    def replayable(self) -> bool:
+        return isinstance(self.data, (bytes, bytearray, memoryview))
+
+    @property
+    def size(self) -> int | None:
+        return self._size
+
+    def _source_chunks(self, size:int | None):
+        # buffers are read in slices, so their data is never copied
+        if self.replayable:
+            with memoryview(self.data) as view, view.cast("B") as byte_view:
+                yield from self.chunk_policy.chunks(_Buffer_Reader(byte_view), size, CHUNK_COMPRESS)
+            return
+
+        if self._consumed:
+            raise SOL_Error(4406, "Data of a stream or iterable was read already, its file can only be sent once")
+        self._consumed = True
+        length = 0
+        for chunk in self._head:
+            length += len(chunk)
+            yield chunk
+        self._head = []
+        if hasattr(self.data, "read"):
+            chunks = self.chunk_policy.chunks(self.data, size or self.chunk_policy.max_size, CHUNK_COMPRESS)
+        else:
+            chunks = self.data
+        for chunk in chunks:
+            if chunk:
+                length += len(chunk)
+                yield chunk
+        # the size is known now, once the data has passed through
+        self._size = length
+
+    def _samples(self, size:int | None) -> list[bytes]:
+        if self.replayable:
+            with memoryview(self.data) as view, view.cast("B") as byte_view:
+                return [bytes(sample) for sample in _probe_samples(_Buffer_Reader(byte_view), size)]
+
+        # a stream or iterable can't seek, so only its start is sampled, and kept to be read again first
+        limit, read = _PROBE_BLOCKS * _PROBE_BLOCK_SIZE, sum(len(chunk) for chunk in self._head)
+        while read < limit and not self._consumed:
+            if hasattr(self.data, "read"):
+                if not (chunk := self.data.read(limit - read)):
+                    break
+            elif (chunk := next(self.data, None)) is None:
+                break
+            self._head.append(chunk)
+            read += len(chunk)
+        return [b"".join(self._head)]
@@ -0,0 +1,129 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_UploadCheckpoints, BASE_Sol_File
+from .SOL_FileCache import SOL_FileCache
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# A file cache which also keeps the progress of resumable uploads, so an upload continues after a connection reset,
+#   and after the process was restarted, without compressing the file again.
+#   index/<key>.json and data/ as in SOL_FileCache
+#   uploads/<upload_id>.json    the progress of an upload which was started, but wasn't confirmed yet
+# The artifact of an unconfirmed upload isn't evicted, until its last attempt is older than pending_ttl.
+#   Then the upload is given up on, and like a confirmed one its artifact is a cached file like any other.
+class SOL_UploadCheckpoints(SOL_FileCache, BASE_SOL_UploadCheckpoints):
+    def __init__(
+            self,
+            directory:str=os.path.join(os.path.expanduser("~"), ".cache", "SOL_Client_Connector", "uploads"),
+            max_size:int=1073741824,    # 1gb
+            pending_ttl:float=86400     # a day
+    ):
+        super().__init__(directory, max_size)
+        self.pending_ttl = pending_ttl
+        os.makedirs(os.path.join(directory, "uploads"), exist_ok=True)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Uploads -
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def upload_id(file_object:BASE_Sol_File, package_length:int) -> str:
+        # The same content, compressed the same way, is the same upload.
+        #   The server keeps the part it received under this id, even if the file is compressed again after a restart.
+        return hashlib.sha256(json.dumps([
+            file_object.hash_value,
+            file_object.codec,
+            file_object.compression_level,
+            package_length,
+        ]).encode("utf_8")).hexdigest()
+
+    def _upload_path(self, upload_id:str) -> str:
+        return os.path.join(self.directory, "uploads", f"{upload_id}.json")
+
+    def load(self, upload_id:str) -> dict | None:
+        try:
+            with open(self._upload_path(upload_id), "r") as upload_file:
+                return json.load(upload_file)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, upload_id:str, file_object:BASE_Sol_File, package_length:int, confirmed:int, sent:int) -> None:
+        upload_path = self._upload_path(upload_id)
+        temp_path = f"{upload_path}.{os.getpid()}_{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w") as upload_file:
+                json.dump({
+                    "upload_id": upload_id,
+                    "filepath": os.path.abspath(file_object.filepath),
+                    "artifact": os.path.basename(self._artifact_path(file_object, file_object.hash_value)),
+                    "len": package_length,
+                    "confirmed": confirmed, # bytes the server confirmed having, at the start of the last attempt
+                    "sent": sent,           # bytes sent, of which the server may not have received all
+                    "updated": time.time(),
+                }, upload_file)
+            os.replace(temp_path, upload_path)
+        except OSError:
+            pass # the upload still resumes after a reset, only not after a restart
+
+    def finish(self, upload_id:str) -> None:
+        try:
+            os.remove(self._upload_path(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def pending(self) -> list[dict]:
+        uploads = []
+        for entry in os.scandir(os.path.join(self.directory, "uploads")):
+            if entry.name.endswith(".json") and (upload := self.load(entry.name[:-len(".json")])) is not None:
+                uploads.append(upload)
+        return uploads
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Storing and eviction -
+    # ------------------------------------------------------------------------------------------------------------------
+    def evict(self) -> None:
+        # uploads are only pending once they started, stale ones no longer pin their artifact
+        pinned = set()
+        for upload in self.pending():
+            if time.time() - upload.get("updated", 0) <= self.pending_ttl:
+                pinned.add(upload["artifact"])
+            else:
+                self.finish(upload["upload_id"])
+        with self._locked():
+            data_directory = os.path.join(self.directory, "data")
+            artifacts = []
+            for entry in os.scandir(data_directory):
+                if entry.name.endswith(".z"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    artifacts.append((entry.name in pinned, stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, _, size, _ in artifacts)
+            # unpinned artifacts sort first, pinned ones are only counted
+            for is_pinned, _, size, path in sorted(artifacts):
+                if total <= self.max_size or is_pinned:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def clear(self) -> None:
+        super().clear()
+        with self._locked():
+            for entry in os.scandir(os.path.join(self.directory, "uploads")):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
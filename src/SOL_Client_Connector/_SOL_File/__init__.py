@@ -1 +1,3 @@
-from .SOL_File_Object import SOL_File
\ No newline at end of file
+from .SOL_File_Object import SOL_File, SOL_DataFile
+from .SOL_FileCache import SOL_FileCache
+from .SOL_UploadCheckpoints import SOL_UploadCheckpoints
\ No newline at end of file
@@ -0,0 +1,124 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import collections
+import concurrent.futures
+import hashlib
+import os
+import struct
+import threading
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_TreeHash, SOL_Error
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+TREE_LEAF_SIZE = 4194304        # 4mb, the default leaf size
+_TREE_LEAF_MIN = 65536          # 64kb
+_TREE_LEAF_MAX = 67108864       # 64mb
+_TREE_PREFIX = b"SOL_TREE"      # a root can never be mistaken for the flat sha256 of the same file
+_LEAF_SIZE = struct.Struct(">Q")
+LEAF_DIGEST_SIZE = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _shared_executor() -> concurrent.futures.ThreadPoolExecutor:
+    # hashlib releases the GIL on large updates, so threads hash leaves on every core
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                thread_name_prefix="SOL_tree_hash"
+            )
+        return _executor
+
+def _leaf_digest(leaf) -> bytes:
+    return hashlib.sha256(leaf).digest()
+
+def valid_leaf_size(leaf_size) -> bool:
+    return isinstance(leaf_size, int) and _TREE_LEAF_MIN <= leaf_size <= _TREE_LEAF_MAX \
+        and leaf_size & (leaf_size - 1) == 0
+
+def changed_leaves(leaves_old:list[bytes], leaves_new:list[bytes]) -> list[int]:
+    # the leaves of a file which differ from an earlier version of it, leaves it gained count as changed
+    return [
+        i for i, leaf in enumerate(leaves_new)
+        if i >= len(leaves_old) or leaves_old[i] != leaf
+    ]
+
+def split_leaves(leaves:bytes) -> list[bytes]:
+    # the digests of the leaves, as sent in the file parameters
+    if len(leaves) % LEAF_DIGEST_SIZE:
+        raise SOL_Error(5401, "Leaf digests were cut short")
+    return [leaves[i:i + LEAF_DIGEST_SIZE] for i in range(0, len(leaves), LEAF_DIGEST_SIZE)]
+
+# A hash of a file in fixed size leaves, which are hashed in parallel, and combined into a root:
+#   sha256(b"SOL_TREE" + leaf size + the sha256 of every leaf in order)
+#   With the expected digests of the leaves, every leaf is checked as soon as it is hashed,
+#   and mismatch holds the first leaf which was wrong. The digests also tell which leaves of a file changed later on.
+#   A leaf is only handed to the pool once it is full, at most two leaves per worker are hashed at the same time.
+class SOL_TreeHash(BASE_SOL_TreeHash):
+    def __init__(self, leaf_size:int=TREE_LEAF_SIZE, workers:int=None, expected:list[bytes]=None):
+        if not valid_leaf_size(leaf_size):
+            raise SOL_Error(4418, "Tree hash leaf size was not a power of two between 64kb and 64mb")
+        self.leaf_size = leaf_size
+        self.workers = workers or os.cpu_count() or 1
+        self.expected = expected
+        self.mismatch = None
+        self._buffer = bytearray()
+        self._pending = collections.deque() # leaves being hashed, in order
+        self._leaves = []
+        self._finished = False
+
+    def update(self, data) -> None:
+        data = memoryview(data)
+        while data:
+            # full leaves are hashed where they are, only the parts of a leaf are gathered in the buffer
+            if not self._buffer and len(data) >= self.leaf_size:
+                self._submit(data[:self.leaf_size])
+                data = data[self.leaf_size:]
+                continue
+            take = self.leaf_size - len(self._buffer)
+            self._buffer += data[:take]
+            data = data[take:]
+            if len(self._buffer) == self.leaf_size:
+                leaf, self._buffer = self._buffer, bytearray()
+                self._submit(leaf)
+
+    def _submit(self, leaf) -> None:
+        if self.workers == 1:
+            self._add(_leaf_digest(leaf))
+            return
+        self._pending.append(_shared_executor().submit(_leaf_digest, leaf))
+        while len(self._pending) > 2 * self.workers:
+            self._add(self._pending.popleft().result())
+        # leaves which are done are checked right away
+        while self._pending and self._pending[0].done():
+            self._add(self._pending.popleft().result())
+
+    def _add(self, digest:bytes) -> None:
+        index = len(self._leaves)
+        if self.expected is not None and self.mismatch is None \
+                and (index >= len(self.expected) or self.expected[index] != digest):
+            self.mismatch = index
+        self._leaves.append(digest)
+
+    def leaves(self) -> list[bytes]:
+        if not self._finished:
+            self._finished = True
+            if self._buffer:
+                self._submit(self._buffer)
+                self._buffer = bytearray()
+            while self._pending:
+                self._add(self._pending.popleft().result())
+            # expected leaves which never arrived are a mismatch as well
+            if self.expected is not None and self.mismatch is None and len(self._leaves) != len(self.expected):
+                self.mismatch = len(self._leaves)
+        return self._leaves
+
+    def hexdigest(self) -> str:
+        return hashlib.sha256(_TREE_PREFIX + _LEAF_SIZE.pack(self.leaf_size) + b"".join(self.leaves())).hexdigest()
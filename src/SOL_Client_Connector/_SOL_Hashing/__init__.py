@@ -0,0 +1,8 @@
+from .SOL_TreeHash import (
+    SOL_TreeHash,
+    TREE_LEAF_SIZE,
+    LEAF_DIGEST_SIZE,
+    valid_leaf_size,
+    changed_leaves,
+    split_leaves
+)
\ No newline at end of file
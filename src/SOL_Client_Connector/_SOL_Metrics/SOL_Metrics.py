@@ -0,0 +1,136 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import collections
+import dataclasses
+import math
+import threading
+import time
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_Observer, BASE_SOL_Metrics
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# A finished span, handed to the observer of a connector.
+#   Spans are named after the phase they time:
+#       send, pre_check, connect, key_generation,
+#       wait:<STATE>    the time waiting for the server to announce a state, for REPLY this is its think-time
+#       state:<STATE>   the time handling a state, e.g. state:SOL_KEY is the key exchange
+@dataclasses.dataclass(slots=True)
+class SOL_Span:
+    name:str
+    seconds:float
+    bytes_sent:int = 0
+    bytes_received:int = 0
+    round_trips:int = 0
+    error:bool = False
+
+# Receives every finished span, subclass it and override on_span
+class SOL_Observer(BASE_SOL_Observer):
+    def on_span(self, span:SOL_Span) -> None:
+        pass
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Spans -
+# ----------------------------------------------------------------------------------------------------------------------
+class _Span:
+    __slots__ = ("observer", "name", "ph", "start", "bytes_sent", "bytes_received", "round_trips")
+
+    def __init__(self, observer:BASE_SOL_Observer, name:str, ph):
+        self.observer = observer
+        self.name = name
+        self.ph = ph    # a package handler, of which the bytes and round trips are counted
+
+    def rename(self, name:str) -> None:
+        self.name = name
+
+    def __enter__(self):
+        if self.ph is not None:
+            self.bytes_sent = self.ph.bytes_sent
+            self.bytes_received = self.ph.bytes_received
+            self.round_trips = self.ph.round_trips
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        seconds = time.perf_counter() - self.start
+        span = SOL_Span(self.name, seconds, error=exc_type is not None)
+        if self.ph is not None:
+            span.bytes_sent = self.ph.bytes_sent - self.bytes_sent
+            span.bytes_received = self.ph.bytes_received - self.bytes_received
+            span.round_trips = self.ph.round_trips - self.round_trips
+        self.observer.on_span(span)
+
+# Used when there is no observer, so a disabled span costs no more than a with statement
+class _NullSpan:
+    __slots__ = ()
+
+    def rename(self, name:str) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+def span(observer:BASE_SOL_Observer | None, name:str, ph=None) -> _Span | _NullSpan:
+    return _NULL_SPAN if observer is None else _Span(observer, name, ph)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Aggregation -
+# ----------------------------------------------------------------------------------------------------------------------
+# Keeps the latest max_samples durations of every span name, and reports their percentiles.
+#   Bytes and round trips are totals over every span ever seen.
+class SOL_Metrics(SOL_Observer, BASE_SOL_Metrics):
+    def __init__(self, max_samples:int=10000):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, span:SOL_Span) -> None:
+        with self._lock:
+            if (samples := self._samples.get(span.name)) is None:
+                samples = self._samples[span.name] = collections.deque(maxlen=self.max_samples)
+                self._totals[span.name] = collections.Counter()
+            samples.append(span.seconds)
+            totals = self._totals[span.name]
+            totals["count"] += 1
+            totals["errors"] += span.error
+            totals["bytes_sent"] += span.bytes_sent
+            totals["bytes_received"] += span.bytes_received
+            totals["round_trips"] += span.round_trips
+
+    @staticmethod
+    def _percentile(ordered:list[float], q:float) -> float:
+        # nearest rank
+        return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+    def percentile(self, name:str, q:float) -> float:
+        with self._lock:
+            return self._percentile(sorted(self._samples[name]), q)
+
+    def report(self) -> dict:
+        with self._lock:
+            report = {}
+            for name, samples in self._samples.items():
+                ordered = sorted(samples)
+                report[name] = {
+                    **self._totals[name],
+                    "mean": sum(ordered) / len(ordered),
+                    "p50": self._percentile(ordered, 50),
+                    "p95": self._percentile(ordered, 95),
+                    "p99": self._percentile(ordered, 99),
+                }
+            return report
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
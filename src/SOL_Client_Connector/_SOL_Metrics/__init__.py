@@ -0,0 +1 @@
+from .SOL_Metrics import SOL_Metrics, SOL_Observer, SOL_Span, span
\ No newline at end of file
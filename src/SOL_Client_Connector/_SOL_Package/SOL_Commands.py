@@ -0,0 +1,94 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+from typing import Any
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_Commands, BASE_SOL_Serializer, SOL_Error
+from .._SOL_File import SOL_File
+from .._SOL_Credentials import SOL_Credentials
+from .._SOL_Serializers import serializer_for, FORMAT_JSON
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# Builds the command list of a package, which is encoded as json while it is built.
+#   Every batch of commands is encoded in one call of the json serializer, which also finds the SOL_File and
+#   SOL_Credentials objects in it, in dicts, lists and tuples alike. A batch without any is kept as its encoded
+#   json, so sending the package only joins the parts. A command with a file is encoded again when it is sent,
+#   as the file is only compressed and hashed then.
+#   Commands are encoded as they are added, later changes to their dicts are not sent.
+class SOL_Commands(BASE_SOL_Commands):
+    def __init__(self):
+        self.commands = []
+        self.file_list = []
+        self.credentials = None
+        self._parts = []    # encoded json of a run of commands, or a command which is encoded when it is sent
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def add(self, *commands:dict) -> None:
+        if not all((isinstance(c, dict) and len(c) == 1) for c in commands):
+            raise SOL_Error(4406, "Unable to insert the command(s)")
+        if not commands:
+            return
+
+        found = []
+        if len(commands) == 1:
+            encoded = self._encode(commands[0], found)
+        else:
+            encoded = memoryview(self._encode(list(commands), found))[1:-1]  # the items, without the brackets
+        if not found:
+            parts = [encoded]
+            file_list, credentials = [], self.credentials
+        else:
+            # only the commands with a file or credentials in them are kept as they are
+            parts, file_list, credentials = [], [], self.credentials
+            for command in commands:
+                # a single command was already encoded on its own
+                if len(commands) > 1:
+                    found = []
+                    encoded = self._encode(command, found)
+                if not found:
+                    parts.append(encoded)
+                    continue
+                parts.append(command)
+                for obj in found:
+                    if isinstance(obj, SOL_Credentials):
+                        if credentials is not None and credentials is not obj:
+                            raise SOL_Error(4407, "Only one unique set of credentials can be stored within the conversation")
+                        credentials = obj
+                    else:
+                        file_list.append(obj)
+
+        # nothing is added when a command is refused
+        self.commands.extend(commands)
+        self._parts.extend(parts)
+        self.file_list.extend(file_list)
+        self.credentials = credentials
+
+    @staticmethod
+    def _encode(obj:Any, found:list) -> bytes:
+        def default(value:Any) -> Any:
+            if isinstance(value, (SOL_File, SOL_Credentials)):
+                found.append(value)
+                return None
+            raise TypeError(f"Object of type {value.__class__.__name__} can't be serialized")
+        try:
+            return serializer_for(FORMAT_JSON).dumps(obj, default)
+        except (TypeError, ValueError, RecursionError) as e:
+            raise SOL_Error(4406, f"Unable to insert the command(s), they could not be serialized:\n{e}")
+
+    def encode(self, serializer:BASE_SOL_Serializer) -> bytes:
+        # formats other than json serialize the whole list at once
+        if serializer.format != FORMAT_JSON:
+            return serializer.dumps({"commands": self.commands})
+        package_data = [b'{"commands":[']
+        for part in self._parts:
+            if len(package_data) > 1:
+                package_data.append(b",")
+            package_data.append(serializer.dumps(part) if isinstance(part, dict) else part)
+        package_data.append(b"]}")
+        return b"".join(package_data)
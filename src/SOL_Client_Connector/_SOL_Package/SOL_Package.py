@@ -2,21 +2,46 @@
 # - Package Imports -
 # ----------------------------------------------------------------------------------------------------------------------
 # General Packages
+import concurrent.futures
+import os
+import threading
+import time
 
 # Custom Packages
 from .._Base_Classes import SOL_Package_Base, SOL_Error, BASE_SOL_Credentials
 from .._SOL_File import SOL_File
-from .._SOL_Credentials import SOL_Credentials
+from .SOL_Commands import SOL_Commands
 
 # ----------------------------------------------------------------------------------------------------------------------
 # - Code -
 # ----------------------------------------------------------------------------------------------------------------------
+# Limits the amount of file bytes that are being prepared at the same time.
+#   A file larger than the budget is still prepared, but only when nothing else is.
+class _IO_Budget:
+    def __init__(self, budget:int | None):
+        self.budget = budget
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size:int) -> None:
+        if self.budget is None:
+            return
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight == 0 or self._in_flight + size <= self.budget)
+            self._in_flight += size
+
+    def release(self, size:int) -> None:
+        if self.budget is None:
+            return
+        with self._condition:
+            self._in_flight -= size
+            self._condition.notify_all()
+
 class SOL_Package(SOL_Package_Base):
     def __init__(self, api_key:str=None):
         # Set default var
-        self._commands = []
-        self._file_list = []
-        self._credentials = None
+        self._commands = SOL_Commands()
+        self.downloads = {} # the result of every file the server sent along with its reply, by name
 
         # Check if immediate input was given
         if api_key is not None:
@@ -37,52 +62,106 @@ class SOL_Package(SOL_Package_Base):
         self._api_key = value
     @property
     def commands(self) -> list:
-        return self._commands
+        return self._commands.commands
     @property
     def file_list(self) -> list[SOL_File]:
-        return self._file_list
+        return self._commands.file_list
     @property
     def credentials(self) -> BASE_SOL_Credentials:
-        return self._credentials
+        return self._commands.credentials
+    @property
+    def command_builder(self) -> SOL_Commands:
+        return self._commands
 
     # ------------------------------------------------------------------------------------------------------------------
     # - Command List Formation -
     # ------------------------------------------------------------------------------------------------------------------
     def command_add(self,*args:dict) -> None:
-        if not all((len(c) == 1 and isinstance(c, dict)) for c in args):
-            raise SOL_Error(4406, "Unable to insert the command(s)")
-        self._commands = self.commands + list(args)
-
-        # check for file presence
-        for c in list(args):
-            self._iterateRecursion(c)
-
-    def _iterateRecursion(self, dict_object: dict) -> None:
-        for _, v in dict_object.items():
-            match v:
-                case SOL_File():
-                    self._file_list.append(v)
-                case dict():
-                    self._iterateRecursion(v) # the few times in a year that I use recursion
-                case SOL_Credentials():
-                    if self.credentials is not None:
-                        if id(self.credentials) != id(v):
-                            raise SOL_Error(4407, "Only one unique set of credentials can be stored within the conversation")
-                    else:
-                        self._credentials = v
+        # appended in place, so adding commands one by one stays linear
+        self._commands.add(*args)
 
     # ------------------------------------------------------------------------------------------------------------------
     # - Package Formations -
     # ------------------------------------------------------------------------------------------------------------------
-    def pre_check(self) -> None:
+    def pre_check(self, prepare_files:bool=True, workers:int=None, io_budget:int=None, cache=None, upload_throughput:float=None, chunk_policy=None, progress=None, tree_hash:int=None) -> None:
         # Check if we can form package
         if self.api_key is None:
             raise SOL_Error(4408, "No API Key was setup")
         if len(self.commands) == 0:
             raise SOL_Error(4408, "No commands were set up")
+        # files which were compressed before are taken from the cache, also when they are streamed
+        for fo in self.file_list:  # type: SOL_File
+            # files which aren't on disk have nothing to key a cache entry on
+            fo.cache = cache if not fo.streamed else None
+            fo.progress = progress
+            fo.tree_hash = tree_hash
+            if chunk_policy is not None:
+                fo.chunk_policy = chunk_policy
+            # files with compression="auto" choose their codec now, as the server is told which codecs are used
+            if fo.compression_auto:
+                fo.probe_compression(upload_throughput)
         # start up the compression of any files present
-        for fo in self._file_list:  # type: SOL_File
+        #   streamed files are compressed while being sent, so they are skipped here
+        file_list = [fo for fo in self.file_list if not fo.streamed]
+        if not prepare_files:
+            # files on disk are only opened while being sent, so a file gone since it was added is caught here
+            for fo in file_list:  # type: SOL_File
+                if not os.path.isfile(fo.filepath):
+                    raise SOL_Error(4406, "file is not found at path")
+            return
+        if not file_list:
+            return
+
+        # zlib and hashlib release the GIL, so the files are prepared on a pool of threads.
+        #   workers defaults to one thread per core, io_budget limits the bytes of the files prepared at once.
+        workers = min(len(file_list), workers or os.cpu_count() or 1)
+        budget = _IO_Budget(io_budget)
+        try:
+            if workers == 1:
+                for fo in file_list:  # type: SOL_File
+                    self._prepare_file(fo, budget)
+            else:
+                self._prepare_files_concurrently(file_list, workers, budget)
+        except BaseException:
+            # no temp files are left behind of a package which can't be sent
+            for fo in self.file_list:  # type: SOL_File
+                fo.cleanup()
+            raise
+
+    def _prepare_files_concurrently(self, file_list:list[SOL_File], workers:int, budget:_IO_Budget) -> None:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SOL_pre_check")
+        try:
+            futures = [executor.submit(self._prepare_file, fo, budget) for fo in file_list]
+            concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+            # Files after a failed one are not started anymore, but every file before it is finished.
+            #   This way the error of the first failing file in the list is raised, no matter the timing.
+            for i, future in enumerate(futures):
+                if future.done() and future.exception() is not None:
+                    for later in futures[i+1:]:
+                        later.cancel()
+                    break
+            concurrent.futures.wait(futures)
+            for future in futures:
+                if not future.cancelled() and future.exception() is not None:
+                    raise future.exception()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def _prepare_file(fo:SOL_File, budget:_IO_Budget) -> None:
+        size = os.path.getsize(fo.filepath)
+        budget.acquire(size)
+        try:
+            start = time.perf_counter()
             fo.compress_and_hash()
+            fo.preparation_time = time.perf_counter() - start
+        finally:
+            budget.release(size)
+
+    @property
+    def preparation_times(self) -> dict:
+        # seconds each file took to be compressed and hashed, by the name it is sent under
+        return {fo.filename_transmission: fo.preparation_time for fo in self.file_list}
 
     def dict(self) -> dict:
         # Form the package
@@ -1 +1,2 @@
-from .SOL_Package import SOL_Package
\ No newline at end of file
+from .SOL_Package import SOL_Package
+from .SOL_Commands import SOL_Commands
\ No newline at end of file
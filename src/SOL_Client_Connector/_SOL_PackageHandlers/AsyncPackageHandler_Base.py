@@ -0,0 +1,219 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import asyncio
+import functools
+from typing import Any
+
+# Custom Packages
+from .._Base_Classes import BASE_AsyncPackageHandler_Base, STOP_Error
+from .PackageHandler_Base import PackageHandler_Base, _FRAME_HEADER, _FRAME_MAGIC, _FRAME_MAX_LENGTH, _PARAMS_LENGTH, FRAME_STATE, FRAME_PACKAGE
+from .._SOL_Chunking import CHUNK_RECV
+from .._SOL_Progress import PROGRESS_DOWNLOAD
+from .._SOL_Serializers import load_parameters
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+class AsyncPackageHandler_Base(BASE_AsyncPackageHandler_Base):
+    # The pure methods are shared with the blocking package handler
+    states = PackageHandler_Base.states
+    _pending = b""
+    _sent = False
+    protocol = 1
+    protocol_offered = 1
+    round_trips = 0
+    bytes_sent = 0
+    bytes_received = 0
+    _chunk_size = PackageHandler_Base._chunk_size
+    _chunks = PackageHandler_Base._chunks
+    _progress = PackageHandler_Base._progress
+    progress = None
+    serializer = None
+    _serializer = PackageHandler_Base._serializer
+    _socket_buffer = PackageHandler_Base._socket_buffer
+    package_data = staticmethod(PackageHandler_Base.package_data)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Various methods -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def _run(self, function_, /, *args, **kwargs) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            functools.partial(function_, *args, **kwargs)
+        )
+
+    def _socket(self) -> Any:
+        return self.writer.get_extra_info("socket")
+
+    def _write(self, data: bytes) -> None:
+        self.writer.write(data)
+        self.bytes_sent += len(data)
+        self._sent = True
+
+    def _received(self) -> None:
+        if self._sent:
+            self.round_trips += 1
+            self._sent = False
+
+    async def _read(self, length: int) -> bytes:
+        self._received()
+        if self._pending:
+            data, self._pending = self._pending[:length], self._pending[length:]
+            return data
+        data = await asyncio.wait_for(self.reader.read(length), self.timeout)
+        self.bytes_received += len(data)
+        return data
+
+    async def _recv_exact(self, length: int, progress_name: str = None) -> bytes:
+        self._received()
+        data, self._pending = self._pending[:length], self._pending[length:]
+        self.bytes_received += length - len(data)
+        try:
+            if progress_name is None or self.progress is None:
+                return data + await asyncio.wait_for(self.reader.readexactly(length - len(data)), self.timeout)
+            # read in chunks, to report the progress in between
+            parts = [data]
+            received = len(data)
+            while received < length:
+                parts.append(await asyncio.wait_for(
+                    self.reader.readexactly(min(self._chunk_size(length, CHUNK_RECV), length - received)),
+                    self.timeout
+                ))
+                received += len(parts[-1])
+                self._progress(PROGRESS_DOWNLOAD, progress_name, received, length)
+            return b"".join(parts)
+        except asyncio.IncompleteReadError:
+            raise ConnectionResetError
+
+    async def _send_frame(self, frame_type: int, payload: bytes = b"", flags: int = 0, head: bytes = b"") -> None:
+        self._write(_FRAME_HEADER.pack(_FRAME_MAGIC, frame_type, flags, len(head) + len(payload)) + head)
+        self._write(payload)
+        await self.writer.drain()
+
+    async def _recv_frame_header(self) -> tuple[int, int, int]:
+        magic, frame_type, flags, length = _FRAME_HEADER.unpack(await self._recv_exact(_FRAME_HEADER.size))
+        if magic != _FRAME_MAGIC or length > _FRAME_MAX_LENGTH:
+            raise self.error(5401)
+        return frame_type, flags, length
+
+    async def _recv_frame(self) -> tuple[int, int, bytes]:
+        frame_type, flags, length = await self._recv_frame_header()
+        return frame_type, flags, await self._recv_exact(length)
+
+    async def _recv_state(self) -> str:
+        if self.protocol >= 2:
+            frame_type, _, payload = await self._recv_frame()
+            if frame_type != FRAME_STATE:
+                raise self.error(5401)
+            return payload.decode("utf_8")
+
+        data = await self._read(1024)
+        # The other side switched to frames
+        if data[:1] == bytes((_FRAME_MAGIC,)) and self.protocol_offered >= 2:
+            self._pending = data + self._pending
+            self.protocol = 2
+            return await self._recv_state()
+
+        # When the other side sends two states back to back, they can arrive in a single read
+        for state in self.states:
+            if data.startswith(state.encode("utf_8")):
+                self._pending = data[len(state):] + self._pending
+                return state
+        return data.decode("utf_8")
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Connection waiting -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def wait_for_state(self, state: str) -> None:
+        data_received = await self._recv_state()
+        if data_received == "STOP":
+            raise STOP_Error()
+        elif data_received != state:
+            raise self.error(5401, state, data_received)
+        return None
+
+    async def wait_for_state_undefined(self) -> str:
+        state = await self._recv_state()
+        return state
+
+    async def wait_for_state_multiple(self, states: list) -> str:
+        data_received = await self._recv_state()
+        if data_received == "STOP":
+            raise STOP_Error()
+        elif data_received not in states:
+            raise self.error(5401, states, data_received)
+        return data_received
+
+    async def send_state(self, state: str) -> None:
+        if self.protocol >= 2:
+            await self._send_frame(FRAME_STATE, state.encode("utf_8"))
+            return
+        self._write(state.encode("utf_8"))
+        await self.writer.drain()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Default Packages outgoing -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def _package_out(self, state:str, package_parameters:bytes, package_data:bytes)->None:
+        # Send parameters and package together, without waiting for acknowledgements
+        if self.protocol >= 2:
+            await self._send_frame(
+                FRAME_PACKAGE,
+                package_data,
+                head=_PARAMS_LENGTH.pack(len(package_parameters)) + package_parameters
+            )
+            return
+
+        # Send parameters
+        await self.send_state(f"PARAM")
+        await self.wait_for_state(f"READY")
+        self._write(package_parameters)
+        await self.writer.drain()
+        await self.wait_for_state(f"INGESTED")
+
+        # Send package
+        await self.send_state(f"DATA")
+        await self.wait_for_state(f"READY")
+        self._write(package_data)
+        await self.writer.drain()
+        await self.wait_for_state(f"INGESTED")
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Default Packages incoming -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def _package_in(self, state: str = None) -> tuple[dict, bytes]:
+        if self.protocol >= 2:
+            frame_type, _, length = await self._recv_frame_header()
+            if frame_type != FRAME_PACKAGE:
+                raise self.error(5401)
+            parameters_length, = _PARAMS_LENGTH.unpack(await self._recv_exact(_PARAMS_LENGTH.size))
+            if (data_length := length - _PARAMS_LENGTH.size - parameters_length) < 0:
+                raise self.error(5401)
+            package_param_dict = load_parameters(await self._recv_exact(parameters_length))
+            return package_param_dict, await self._recv_exact(data_length, state)
+
+        # Ingest all the parameters
+        await self.wait_for_state(f"PARAM")
+        await self.send_state(f"READY")
+        package_param_dict = load_parameters(await self._read(10240))
+        if not isinstance(package_param_dict, dict) or not isinstance(package_param_dict.get("len"), int):
+            raise self.error(5401)
+        if not 0 <= package_param_dict["len"] <= _FRAME_MAX_LENGTH:
+            raise self.error(5401)
+        await self.send_state(f"INGESTED")
+
+        # Ingest the package
+        await self.wait_for_state(f"DATA")
+        await self.send_state(f"READY")
+        package_data = await self._recv_exact(package_param_dict["len"], state)
+        await self.send_state(f"INGESTED")
+        return package_param_dict, package_data
@@ -0,0 +1,80 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+from Crypto.PublicKey.RSA import RsaKey
+
+# Custom Packages
+from .._Base_Classes import BASE_AsyncPackageHandler_Data
+from .AsyncPackageHandler_Base import AsyncPackageHandler_Base
+from .PackageHandler_Data import PackageHandler_Data
+from ..SOL_Encryption import *
+from .._SOL_Serializers import serializer_for, parameter_bytes, FORMAT_JSON
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+class AsyncPackageHandler_Data(AsyncPackageHandler_Base,BASE_AsyncPackageHandler_Data):
+    package_parameters = staticmethod(PackageHandler_Data.package_parameters)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Packages outgoing -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def package_output_plain(self, state: str, package_dict: dict) -> None:
+        # assemble the package bytes
+        serializer = self._serializer()
+        package_data = await self._run(self.package_data, package_dict, serializer)
+        # assemble package parameters
+        package_parameters =  self.package_parameters(
+            None,None,None,len(package_data), binary=self.protocol >= 2, format=serializer.format
+        )
+        # send the data
+        await self._package_out(state, package_parameters, package_data)
+
+    async def package_output_encrypted(self, state:str, package_dict:dict, server_public_key:RsaKey) -> None:
+        # assemble and encrypt the package bytes, both are CPU heavy for larger packages
+        serializer = self._serializer()
+        encrypted_package, session_key_encrypted, tag, nonce = await self._run(
+            lambda: pp_encrypt(self.package_data(package_dict, serializer), server_public_key)
+        )
+        # assemble package parameters
+        package_parameters = self.package_parameters(
+            session_key_encrypted,
+            tag,
+            nonce,
+            len(encrypted_package),
+            binary=self.protocol >= 2,
+            format=serializer.format
+        )
+        # send the data
+        await self._package_out(state, package_parameters, encrypted_package)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Default Packages incoming -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def package_input(self, state:str, client_private_key:RsaKey) -> dict:
+        package_param_dict, package_data = await self._package_in(state)
+        match package_param_dict:
+
+            # unencrypted package, binary parameters leave out the fields which are None
+            case dict() if all(package_param_dict.get(key) is None for key in ("sske", "tag", "nonce")):
+                pass
+
+            # encrypted package
+            case {"sske": str() | bytes() as sske,"tag": str() | bytes() as tag,"nonce": str() | bytes() as nonce}:
+                # Decrypt the package
+                package_data = await self._run(
+                    pp_decrypt,
+                    package_data,
+                    client_private_key,
+                    parameter_bytes(sske),
+                    parameter_bytes(tag),
+                    parameter_bytes(nonce)
+                )
+
+            # if the param package was not setup correctly
+            case _:
+                raise self.error(5401)
+
+        # Decode the package, in the format its parameters name
+        return await self._run(serializer_for(package_param_dict.get("fmt") or FORMAT_JSON).loads, package_data)
@@ -0,0 +1,241 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import os.path
+from Crypto.PublicKey.RSA import RsaKey
+import time
+
+# Custom Packages
+from .._Base_Classes import BASE_AsyncPackageHandler_File, BASE_Sol_File
+from .AsyncPackageHandler_Base import AsyncPackageHandler_Base
+from .PackageHandler_Base import FRAME_PACKAGE, FRAME_CHUNK, FRAME_END, _PARAMS_LENGTH
+from .PackageHandler_File import PackageHandler_File, _STREAM_CHUNK_HEADER, _File_Sink
+from ..SOL_Encryption import *
+from .._SOL_Chunking import CHUNK_SEND, CHUNK_RECV
+from .._SOL_Progress import PROGRESS_UPLOAD
+from .._SOL_Serializers import load_parameters, parameter_bytes
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+class AsyncPackageHandler_File(AsyncPackageHandler_Base,BASE_AsyncPackageHandler_File):
+    # The pure methods are shared with the blocking package handler, the file transformations run in the executor
+    _file_package_handle_chunk = PackageHandler_File._file_package_handle_chunk
+    file_package_parameters = staticmethod(PackageHandler_File.file_package_parameters)
+    _file_leaves = PackageHandler_File._file_leaves
+    _file_name_in = PackageHandler_File._file_name_in
+    _file_tree_in = PackageHandler_File._file_tree_in
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - File transfer, in either protocol -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def _file_params_out(self, package_parameters: bytes) -> None:
+        if self.protocol >= 2:
+            await self._send_frame(FRAME_PACKAGE, _PARAMS_LENGTH.pack(len(package_parameters)) + package_parameters)
+            return
+        await self.send_state(f"PARAM")
+        await self.wait_for_state(f"READY")
+        self._write(package_parameters)
+        await self.writer.drain()
+        await self.wait_for_state(f"READY")
+
+    async def _file_chunk_out(self, chunk: bytes, stream: bool) -> None:
+        if self.protocol >= 2:
+            await self._send_frame(FRAME_CHUNK, chunk)
+            return
+        if stream:
+            self._write(_STREAM_CHUNK_HEADER.pack(len(chunk)))
+        self._write(chunk)
+        await self.writer.drain()
+
+    async def _file_end_out(self, package_trailer: bytes | None) -> None:
+        if self.protocol >= 2:
+            await self._send_frame(FRAME_END, package_trailer or b"")
+        else:
+            if package_trailer is not None:
+                self._write(
+                    _STREAM_CHUNK_HEADER.pack(0) + _STREAM_CHUNK_HEADER.pack(len(package_trailer)) + package_trailer
+                )
+                await self.writer.drain()
+            # wait for ingestion to finish
+            await self.wait_for_state(f"INGESTED")
+
+        # wait for file decompression and check to happen
+        await self.wait_for_state(f"CHECKED")
+
+    async def _file_params_in(self) -> dict:
+        if self.protocol >= 2:
+            return (await self._package_in())[0]
+        await self.wait_for_state(f"PARAM")
+        await self.send_state(f"READY")
+        package_param_dict = load_parameters(await self._read(1024))
+        await self.send_state(f"READY")
+        return package_param_dict
+
+    async def _file_chunks_in(self, write, stream: bool, package_length: int | None) -> tuple[int, dict | None]:
+        # Passes every received chunk to write in the executor, and returns the received length and the trailer
+        received_length = 0
+        package_trailer = None
+        if self.protocol >= 2:
+            while True:
+                frame_type, _, payload = await self._recv_frame()
+                if frame_type == FRAME_CHUNK:
+                    await self._run(write, payload)
+                    received_length += len(payload)
+                elif frame_type == FRAME_END:
+                    package_trailer = load_parameters(payload) if payload else None
+                    break
+                else:
+                    raise self.error(5401)
+
+        elif stream:
+            while chunk_length := _STREAM_CHUNK_HEADER.unpack(await self._recv_exact(_STREAM_CHUNK_HEADER.size))[0]:
+                await self._run(write, await self._recv_exact(chunk_length))
+                received_length += chunk_length
+            package_trailer = load_parameters(await self._recv_exact(
+                _STREAM_CHUNK_HEADER.unpack(await self._recv_exact(_STREAM_CHUNK_HEADER.size))[0]
+            ))
+
+        else:
+            buffer_size = self._chunk_size(package_length, CHUNK_RECV)
+            while received_length < package_length:
+                chunk = await self._read(min(buffer_size, package_length - received_length))
+                if not chunk:
+                    raise ConnectionResetError
+                await self._run(write, chunk)
+                received_length += len(chunk)
+
+        if self.protocol < 2:
+            await self.send_state(f"INGESTED")
+        return received_length, package_trailer
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - FILE Packages outgoing -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def file_package_output(self, state: str, file_object: BASE_Sol_File, server_public_key: RsaKey) -> None:
+        # Encrypt File
+        session_key_encrypted, nonce, cipher_aes = await self._run(pp_cipher_aes_encryptor, server_public_key)
+        await self._run(
+            self._file_package_handle_chunk,
+            filepath_1=f"temp/{file_object.filename_temp}",
+            filepath_2=f"temp/{file_object.filename_transmission}",
+            function_=cipher_aes.encrypt,
+            file_handling_section="ENCRYPTED"
+        )
+
+        # assemble and send package parameters
+        file_size = os.path.getsize(f"temp/{file_object.filename_transmission}")
+        await self._file_params_out(self.file_package_parameters(
+            session_key_encrypted,
+            nonce,
+            file_size,
+            file_object.filename_transmission,
+            file_object.hash_value,
+            codec=file_object.codec,
+            binary=self.protocol >= 2,
+            tree=file_object.tree_hash,
+            leaves=self._file_leaves(file_object)
+        ))
+
+        # send the file in chunks, the disk reads happen in the executor
+        done = 0
+        with open(f"temp/{file_object.filename_transmission}", "rb") as file_final_:
+            while chunk := await self._run(file_final_.read, self._chunk_size(file_size, CHUNK_SEND)):
+                start = time.perf_counter()
+                await self._file_chunk_out(chunk, stream=False)
+                self.chunk_policy.record(CHUNK_SEND, len(chunk), time.perf_counter() - start)
+                done += len(chunk)
+                self._progress(PROGRESS_UPLOAD, file_object.filename_transmission, done, file_size)
+
+        # wait for the file to be ingested and checked
+        await self._file_end_out(None)
+
+    async def file_package_output_stream(self, state: str, file_object: BASE_Sol_File, server_public_key: RsaKey) -> None:
+        session_key_encrypted, nonce, cipher_aes = await self._run(pp_cipher_aes_encryptor, server_public_key)
+
+        # assemble and send package parameters
+        await self._file_params_out(self.file_package_parameters(
+            session_key_encrypted,
+            nonce,
+            None,
+            file_object.filename_transmission,
+            None,
+            stream=True,
+            codec=file_object.codec,
+            binary=self.protocol >= 2,
+            tree=file_object.tree_hash
+        ))
+
+        # read, compress and encrypt a chunk in the executor, while the event loop sends the previous one
+        def next_chunk(chunks) -> bytes | None:
+            for chunk in chunks:
+                if chunk:
+                    return cipher_aes.encrypt(chunk)
+            return None
+
+        package_length = 0
+        compressed_chunks = file_object.compressed_chunks()
+        while (chunk_encrypted := await self._run(next_chunk, compressed_chunks)) is not None:
+            await self._file_chunk_out(chunk_encrypted, stream=True)
+            package_length += len(chunk_encrypted)
+            self._progress(PROGRESS_UPLOAD, file_object.filename_transmission, package_length)
+
+        # send the trailer, which holds the now known length and hash value, and wait for the file to be checked
+        await self._file_end_out(self.file_package_parameters(
+            package_length=package_length,
+            hash_value=file_object.hash_value,
+            stream=True,
+            binary=self.protocol >= 2
+        ))
+        self._progress(PROGRESS_UPLOAD, file_object.filename_transmission, package_length, package_length)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - FILE Packages incoming -
+    # ------------------------------------------------------------------------------------------------------------------
+    async def file_package_input(self, state: str, client_private_key: RsaKey, directory: str = "temp") -> str:
+        try:
+            package_param_dict = await self._file_params_in()
+            session_key_encrypted = parameter_bytes(package_param_dict["sske"])
+            nonce = parameter_bytes(package_param_dict["nonce"])
+            file_name = self._file_name_in(package_param_dict)
+            stream = package_param_dict.get("stream", False)
+            codec = package_param_dict.get("codec") or "zlib" # files from before codecs were signalled are zlib
+            tree, leaves = self._file_tree_in(package_param_dict)
+            package_length = None if stream else int(package_param_dict["len"])
+            if not stream:
+                hash_value = parameter_bytes(package_param_dict["hash_value"]).decode("utf_8")
+            file_path = os.path.join(directory, file_name)
+        except (KeyError, TypeError, ValueError):
+            raise self.error(5401)
+
+        # Ingest the file, every chunk is decrypted, decompressed and hashed in the executor on arrival
+        sink = _File_Sink(
+            file_path,
+            await self._run(pp_cipher_aes_decryptor, client_private_key, session_key_encrypted, nonce),
+            codec,
+            tree,
+            leaves
+        )
+        try:
+            received_length, package_trailer = await self._file_chunks_in(sink.write, stream, package_length)
+
+            # Streamed files have their length and hash sent after the last chunk
+            if stream:
+                try:
+                    hash_value = parameter_bytes(package_trailer["hash_value"]).decode("utf_8")
+                    if int(package_trailer["len"]) != received_length:
+                        raise self.error(5401)
+                except (KeyError, TypeError, ValueError):
+                    raise self.error(5401)
+        except BaseException:
+            sink.discard()
+            raise
+
+        # the file is only kept if the hash was correct
+        if not await self._run(sink.finish, hash_value):
+            raise self.error(5402)
+
+        # send correct state
+        await self.send_state(f"CHECKED")
+        return file_path
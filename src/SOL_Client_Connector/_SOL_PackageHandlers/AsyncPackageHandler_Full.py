@@ -0,0 +1,36 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import asyncio
+import concurrent.futures
+
+# Custom Packages
+from .AsyncPackageHandler_Data import AsyncPackageHandler_Data
+from .AsyncPackageHandler_File import AsyncPackageHandler_File
+from .._Base_Classes import BASE_AsyncPackageHandler_Full
+from .._SOL_Chunking import SOL_ChunkPolicy
+from .._SOL_Progress import SOL_Progress
+from .._SOL_Serializers import SOL_Serializer
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+class AsyncPackageHandler_Full(BASE_AsyncPackageHandler_Full,AsyncPackageHandler_Data,AsyncPackageHandler_File):
+    def __init__(
+            self,
+            reader:asyncio.StreamReader,
+            writer:asyncio.StreamWriter,
+            executor:concurrent.futures.Executor=None,
+            timeout:float=6000,
+            chunk_policy:SOL_ChunkPolicy=None,
+            progress:SOL_Progress=None,
+            serializer:SOL_Serializer=None
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.executor = executor # None uses the default executor of the event loop
+        self.timeout = timeout
+        self.chunk_policy = chunk_policy if chunk_policy is not None else SOL_ChunkPolicy.shared()
+        self.progress = progress
+        self.serializer = serializer
@@ -2,30 +2,78 @@
 # - Package Imports -
 # ----------------------------------------------------------------------------------------------------------------------
 # General Packages
-import json
+import socket
+import struct
 
 # Custom Packages
-from .._Base_Classes import BASE_PackageHandler_Base, STOP_Error
+from .._Base_Classes import BASE_PackageHandler_Base, BASE_SOL_Commands, STOP_Error
+from .._SOL_Chunking import CHUNK_SEND, CHUNK_RECV
+from .._SOL_Progress import PROGRESS_DOWNLOAD
+from .._SOL_Serializers import serializer_for, load_parameters, FORMAT_JSON
 
 # ----------------------------------------------------------------------------------------------------------------------
 # - Code -
 # ----------------------------------------------------------------------------------------------------------------------
+# Protocol 2 sends everything in frames of: magic byte, frame type, flags, payload length, payload.
+#   The magic byte is never the first byte of a protocol 1 state, so either side can tell which protocol is spoken.
+_FRAME_HEADER = struct.Struct(">BBBI")
+_FRAME_MAGIC = 0xA5
+_PARAMS_LENGTH = struct.Struct(">I") # a package frame holds the length of its parameters, the parameters and the data
+_FRAME_MAX_LENGTH = 67108864 # 64mb, the most a peer can make this side allocate at once. Files are sent in chunks below it
+
+FRAME_STATE = 1     # a single state
+FRAME_PACKAGE = 2   # package parameters and data, sent without waiting for READY or INGESTED
+FRAME_CHUNK = 3     # a chunk of a file
+FRAME_END = 4       # the end of a file, with an optional trailer of parameters
+
 class PackageHandler_Base(BASE_PackageHandler_Base):
+    # Every state that can be exchanged, longest first so a state is never mistaken for a shorter one it starts with
+    states = tuple(sorted((
+        "SOL_KEY", "CONV_DATA", "CONV_NEW", "CONV_RESUME", "SESSION", "COMMANDS", "REPLY", "ADDITIONAL", "FILE", "FILES",
+        "UPLOAD", "DOWNLOAD", "DOWNLOADS", "CREDENTIALS", "INFO", "END", "END_KEEP", "STOP", "PARAM", "READY", "INGESTED", "DATA", "CHECKED",
+    ), key=len, reverse=True))
+    _pending = b""  # bytes that were received together with a state, but belong to what comes after it
+
+    protocol = 1            # 1 is the PARAM/READY/INGESTED lockstep, 2 is framed without acknowledgements
+    protocol_offered = 1    # the highest protocol this side switches to, once the other side starts speaking it
+    round_trips = 0         # amount of times this side had to wait for the other side, after sending something
+    bytes_sent = 0          # bytes written to the connection, used to measure the upload throughput
+    bytes_received = 0      # bytes read from the connection
+    progress = None         # an optional SOL_Progress, which receives the progress of files and packages
+    serializer = None       # the SOL_Serializer of packages in protocol 2, None is the fastest one for json
+    _sent = False
+
     # ------------------------------------------------------------------------------------------------------------------
     # - Various methods -
     # ------------------------------------------------------------------------------------------------------------------
-    def _buffer_size(self, object_size: int) -> int:
-        match object_size:
-            case int(a) if a < 1048576:  # up to 1mb
-                return 10240  # buffer of 10kb
-            case int(a) if 1048576 < a < 10485760:  # between 1mb and 10mb
-                return 102400  # buffer of 100kb
-            case int(a) if 10485760 < a < 10485760:  # between 10mb and 100mb
-                return 1048576  # buffer of 1mb
-            case int(a) if a > 10485760:
-                return 1048560  # buffer of 10mb
-            case _:
-                raise self.error(5000)
+    def _chunk_size(self, object_size: int, purpose: str) -> int:
+        return self.chunk_policy.size(object_size, purpose, self._socket_buffer(purpose))
+
+    def _chunks(self, file, object_size: int, purpose: str):
+        return self.chunk_policy.chunks(file, object_size, purpose, self._socket_buffer(purpose))
+
+    def _progress(self, kind: str, name: str, done: int, total: int = None, final: bool = False) -> None:
+        if self.progress is not None:
+            self.progress.update(kind, name, done, total, final)
+
+    def _serializer(self):
+        # protocol 1 has no room to tell the format of a package, so it is always json
+        if self.protocol >= 2 and self.serializer is not None:
+            return self.serializer
+        return serializer_for(FORMAT_JSON)
+
+    def _socket(self) -> socket.socket:
+        return self.connection
+
+    def _socket_buffer(self, purpose: str) -> int:
+        # socket sends and receives are at least as large as the kernel buffer they go through
+        option = {CHUNK_SEND: socket.SO_SNDBUF, CHUNK_RECV: socket.SO_RCVBUF}.get(purpose)
+        if option is None:
+            return 0
+        try:
+            return self._socket().getsockopt(socket.SOL_SOCKET, option)
+        except (OSError, AttributeError):
+            return 0
 
     def cleanup(self) -> None:
         del self.connection
@@ -34,11 +82,95 @@ class PackageHandler_Base(BASE_PackageHandler_Base):
     def close(self) -> None:
         self.connection.close()
 
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Sending and receiving -
+    # ------------------------------------------------------------------------------------------------------------------
+    def _send(self, data: bytes) -> None:
+        self.connection.sendall(data)
+        self.bytes_sent += len(data)
+        self._sent = True
+
+    def _recv(self, length: int) -> bytes:
+        if self._sent:
+            self.round_trips += 1
+            self._sent = False
+        if self._pending:
+            data, self._pending = self._pending[:length], self._pending[length:]
+            return data
+        data = self.connection.recv(length)
+        self.bytes_received += len(data)
+        return data
+
+    def _recv_into(self, view: memoryview) -> int:
+        if self._sent:
+            self.round_trips += 1
+            self._sent = False
+        if self._pending:
+            length = min(len(view), len(self._pending))
+            view[:length], self._pending = self._pending[:length], self._pending[length:]
+            return length
+        length = self.connection.recv_into(view)
+        self.bytes_received += length
+        return length
+
+    def _recv_exact(self, length: int, progress_name: str = None) -> bytearray:
+        # A single allocation of the exact length, which the socket writes into directly
+        data = bytearray(length)
+        view = memoryview(data)
+        received = 0
+        while received < length:
+            if not (chunk_length := self._recv_into(view[received:])):
+                raise ConnectionResetError
+            received += chunk_length
+            if progress_name is not None:
+                self._progress(PROGRESS_DOWNLOAD, progress_name, received, length)
+        return data
+
+    def _send_frame(self, frame_type: int, payload: bytes = b"", flags: int = 0, head: bytes = b"") -> None:
+        # head is sent at the start of the payload, so large payloads don't have to be copied to prepend it
+        header = _FRAME_HEADER.pack(_FRAME_MAGIC, frame_type, flags, len(head) + len(payload)) + head
+        if len(payload) < 65536:
+            self._send(header + payload) # a single send for small frames
+        else:
+            self._send(header)
+            self._send(payload)
+
+    def _recv_frame_header(self) -> tuple[int, int, int]:
+        magic, frame_type, flags, length = _FRAME_HEADER.unpack(self._recv_exact(_FRAME_HEADER.size))
+        if magic != _FRAME_MAGIC or length > _FRAME_MAX_LENGTH:
+            raise self.error(5401)
+        return frame_type, flags, length
+
+    def _recv_frame(self) -> tuple[int, int, bytearray]:
+        frame_type, flags, length = self._recv_frame_header()
+        return frame_type, flags, self._recv_exact(length)
+
+    def _recv_state(self) -> str:
+        if self.protocol >= 2:
+            frame_type, _, payload = self._recv_frame()
+            if frame_type != FRAME_STATE:
+                raise self.error(5401)
+            return payload.decode("utf_8")
+
+        data = self._recv(1024)
+        # The other side switched to frames
+        if data[:1] == bytes((_FRAME_MAGIC,)) and self.protocol_offered >= 2:
+            self._pending = data + self._pending
+            self.protocol = 2
+            return self._recv_state()
+
+        # When the other side sends two states back to back, they can arrive in a single read
+        for state in self.states:
+            if data.startswith(state.encode("utf_8")):
+                self._pending = data[len(state):] + self._pending
+                return state
+        return data.decode("utf_8")
+
     # ------------------------------------------------------------------------------------------------------------------
     # - Connection waiting -
     # ------------------------------------------------------------------------------------------------------------------
     def wait_for_state(self, state: str) -> None:
-        data_received = self.connection.recv(1024).decode("utf_8")
+        data_received = self._recv_state()
         if data_received == "STOP":
             raise STOP_Error()
         elif data_received != state:
@@ -46,11 +178,11 @@ class PackageHandler_Base(BASE_PackageHandler_Base):
         return None
 
     def wait_for_state_undefined(self) -> str:
-        state = self.connection.recv(1024).decode("utf_8")
+        state = self._recv_state()
         return state
 
     def wait_for_state_multiple(self, states: list) -> str:
-        data_received = self.connection.recv(1024).decode("utf_8")
+        data_received = self._recv_state()
         if data_received == "STOP":
             raise STOP_Error()
         elif data_received not in states:
@@ -58,27 +190,75 @@ class PackageHandler_Base(BASE_PackageHandler_Base):
         return data_received
 
     def send_state(self, state: str) -> None:
-        self.connection.send(state.encode("utf_8"))
+        if self.protocol >= 2:
+            self._send_frame(FRAME_STATE, state.encode("utf_8"))
+        else:
+            self._send(state.encode("utf_8"))
 
     # ------------------------------------------------------------------------------------------------------------------
     # - Form parameters -
     # ------------------------------------------------------------------------------------------------------------------
     @staticmethod
-    def package_data(package_dict: dict) -> bytes:
-        return json.dumps(package_dict).encode("utf_8")
+    def package_data(package_dict: dict | BASE_SOL_Commands, serializer=None) -> bytes:
+        serializer = serializer or serializer_for(FORMAT_JSON)
+        # the commands of a package were encoded while they were added, and are only joined
+        if isinstance(package_dict, BASE_SOL_Commands):
+            return package_dict.encode(serializer)
+        return serializer.dumps(package_dict)
 
     # ------------------------------------------------------------------------------------------------------------------
     # - Default Packages outgoing -
     # ------------------------------------------------------------------------------------------------------------------
     def _package_out(self, state:str, package_parameters:bytes, package_data:bytes)->None:
+        # Send parameters and package together, without waiting for acknowledgements
+        if self.protocol >= 2:
+            self._send_frame(
+                FRAME_PACKAGE,
+                package_data,
+                head=_PARAMS_LENGTH.pack(len(package_parameters)) + package_parameters
+            )
+            return
+
         # Send parameters
         self.send_state(f"PARAM")
         self.wait_for_state(f"READY")
-        self.connection.sendall(package_parameters)
+        self._send(package_parameters)
         self.wait_for_state(f"INGESTED")
 
         # Send package
         self.send_state(f"DATA")
         self.wait_for_state(f"READY")
-        self.connection.sendall(package_data)
-        self.wait_for_state(f"INGESTED")
\ No newline at end of file
+        self._send(package_data)
+        self.wait_for_state(f"INGESTED")
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Default Packages incoming -
+    # ------------------------------------------------------------------------------------------------------------------
+    def _package_in(self, state: str = None) -> tuple[dict, bytearray]:
+        # The data is received in a single buffer of its exact length, which the caller can decrypt in place
+        if self.protocol >= 2:
+            frame_type, _, length = self._recv_frame_header()
+            if frame_type != FRAME_PACKAGE:
+                raise self.error(5401)
+            parameters_length, = _PARAMS_LENGTH.unpack(self._recv_exact(_PARAMS_LENGTH.size))
+            if (data_length := length - _PARAMS_LENGTH.size - parameters_length) < 0:
+                raise self.error(5401)
+            package_param_dict = load_parameters(self._recv_exact(parameters_length))
+            return package_param_dict, self._recv_exact(data_length, state)
+
+        # Ingest all the parameters
+        self.wait_for_state(f"PARAM")
+        self.send_state(f"READY")
+        package_param_dict = load_parameters(self._recv(10240))
+        if not isinstance(package_param_dict, dict) or not isinstance(package_param_dict.get("len"), int):
+            raise self.error(5401)
+        if not 0 <= package_param_dict["len"] <= _FRAME_MAX_LENGTH:
+            raise self.error(5401)
+        self.send_state(f"INGESTED")
+
+        # Ingest the package
+        self.wait_for_state(f"DATA")
+        self.send_state(f"READY")
+        package_data = self._recv_exact(package_param_dict["len"], state)
+        self.send_state(f"INGESTED")
+        return package_param_dict, package_data
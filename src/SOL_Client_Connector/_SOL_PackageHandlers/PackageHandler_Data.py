@@ -2,7 +2,6 @@
 # - Package Imports -
 # ----------------------------------------------------------------------------------------------------------------------
 # General Packages
-import sys
 from Crypto.PublicKey.RSA import RsaKey
 import json
 import base64
@@ -11,6 +10,7 @@ import base64
 from .._Base_Classes import BASE_PackageHandler_Data
 from .PackageHandler_Base import PackageHandler_Base
 from ..SOL_Encryption import *
+from .._SOL_Serializers import serializer_for, pack_parameters, parameter_bytes, FORMAT_JSON
 
 # ----------------------------------------------------------------------------------------------------------------------
 # - Code -
@@ -24,8 +24,19 @@ class PackageHandler_Data(PackageHandler_Base,BASE_PackageHandler_Data):
             session_key_encrypted:bytes=None,
             tag:bytes=None,
             nonce:bytes=None,
-            package_length:int=None
+            package_length:int=None,
+            binary:bool=False,
+            format:str=None
     ) -> bytes:
+        # protocol 2 sends binary fields, protocol 1 sends json with the bytes in base64
+        if binary:
+            return pack_parameters({
+                "sske": session_key_encrypted,
+                "tag": tag,
+                "nonce": nonce,
+                "len": package_length,
+                "fmt": format if format != FORMAT_JSON else None,
+            })
         return json.dumps({
             "sske": base64.b64encode(session_key_encrypted).decode("utf8") if session_key_encrypted is not None else None,
             "tag": base64.b64encode(tag).decode("utf8") if tag is not None else None,
@@ -38,17 +49,21 @@ class PackageHandler_Data(PackageHandler_Base,BASE_PackageHandler_Data):
     # ------------------------------------------------------------------------------------------------------------------
     def package_output_plain(self, state: str, package_dict: dict) -> None:
         # assemble the package bytes
-        package_data = self.package_data(package_dict)
+        serializer = self._serializer()
+        package_data = self.package_data(package_dict, serializer)
         # Encrypt package
         # /
         # assemble package parameters
-        package_parameters =  self.package_parameters(None,None,None,sys.getsizeof(package_data))
+        package_parameters =  self.package_parameters(
+            None,None,None,len(package_data), binary=self.protocol >= 2, format=serializer.format
+        )
         # send the data
         self._package_out(state, package_parameters, package_data)
 
     def package_output_encrypted(self, state:str, package_dict:dict, server_public_key:RsaKey) -> None:
         # assemble the package bytes
-        package_data = self.package_data(package_dict)
+        serializer = self._serializer()
+        package_data = self.package_data(package_dict, serializer)
         # Encrypt package
         encrypted_package, session_key_encrypted, tag, nonce = pp_encrypt(
             package_data,
@@ -59,7 +74,9 @@ class PackageHandler_Data(PackageHandler_Base,BASE_PackageHandler_Data):
             session_key_encrypted,
             tag,
             nonce,
-            sys.getsizeof(encrypted_package)
+            len(encrypted_package),
+            binary=self.protocol >= 2,
+            format=serializer.format
         )
         # send the data
         self._package_out(state, package_parameters, encrypted_package)
@@ -68,56 +85,31 @@ class PackageHandler_Data(PackageHandler_Base,BASE_PackageHandler_Data):
     # - Default Packages incoming -
     # ------------------------------------------------------------------------------------------------------------------
     def package_input(self, state:str, client_private_key:RsaKey) -> dict:
-        self.wait_for_state(f"PARAM")
-        self.send_state(f"READY")
-        package_param_dict = json.loads(self.connection.recv(10240).decode("utf_8"))
+        package_param_dict, package_data = self._package_in(state)
         match package_param_dict:
 
-            # unencrypted package
-            case {"sske": None,"tag": None,"nonce": None,"len": int(package_length)}:
-                # Ingest all the parameters
-                self.send_state(f"INGESTED")
-
-                # Ingest the package
-                self.wait_for_state(f"DATA")
-                package_data = b""
-                self.send_state(f"READY")
-                while sys.getsizeof(package_data) < package_length:
-                    package_data += self.connection.recv(1048576)
-                self.send_state(f"INGESTED")
-
+            # unencrypted package, binary parameters leave out the fields which are None
+            case dict() if all(package_param_dict.get(key) is None for key in ("sske", "tag", "nonce")):
                 # Decrypt the package
                 # /
+                pass
 
             # encrypted package
-            case {"sske": str(sske),"tag": str(tag),"nonce": str(nonce),"len": int(package_length)}:
-                # Ingest all the parameters
-                session_key_encrypted = base64.b64decode(sske.encode("utf8"))
-                tag = base64.b64decode(tag.encode("utf8"))
-                nonce = base64.b64decode(nonce.encode("utf8"))
-                self.send_state(f"INGESTED")
-
-                # Ingest the package
-                self.wait_for_state(f"DATA")
-                package_data_encrypted = b""
-                self.send_state(f"READY")
-                while sys.getsizeof(package_data_encrypted) < package_length:
-                    package_data_encrypted += self.connection.recv(1048576)
-                self.send_state(f"INGESTED")
-
-                # Decrypt the package
+            case {"sske": str() | bytes() as sske,"tag": str() | bytes() as tag,"nonce": str() | bytes() as nonce}:
+                # Decrypt the package, in the buffer it was received in
                 package_data = pp_decrypt(
-                    package_data_encrypted,
+                    package_data,
                     client_private_key,
-                    session_key_encrypted,
-                    tag,
-                    nonce
+                    parameter_bytes(sske),
+                    parameter_bytes(tag),
+                    parameter_bytes(nonce),
+                    output=package_data
                 )
 
             # if the param package was not setup correctly
             case _:
                 raise self.error(5401)
 
-        # Decode the package
-        package_dict = json.loads(package_data.decode("utf_8"))
+        # Decode the package, in the format its parameters name
+        package_dict = serializer_for(package_param_dict.get("fmt") or FORMAT_JSON).loads(package_data)
         return package_dict
@@ -3,23 +3,163 @@
 # ----------------------------------------------------------------------------------------------------------------------
 # General Packages
 import os.path
-import zlib
 import hashlib
 from Crypto.PublicKey.RSA import RsaKey
 import json
 import base64
-import functools
-import math
+import queue
+import secrets
+import struct
+import threading
+import concurrent.futures
 
 
 # Custom Packages
 from .._Base_Classes import BASE_PackageHandler_File, BASE_Sol_File
-from .PackageHandler_Base import PackageHandler_Base
+from .PackageHandler_Base import PackageHandler_Base, FRAME_STATE, FRAME_PACKAGE, FRAME_CHUNK, FRAME_END, _PARAMS_LENGTH
 from ..SOL_Encryption import *
+from .._SOL_Codecs import get_codec, decompress_pieces
+from .._SOL_Chunking import CHUNK_READ, CHUNK_ENCRYPT, CHUNK_SEND, CHUNK_RECV
+from .._SOL_Progress import PROGRESS_ENCRYPT, PROGRESS_UPLOAD, PROGRESS_DOWNLOAD
+from .._SOL_Serializers import pack_parameters, load_parameters, parameter_bytes
+from .._SOL_File import SOL_UploadCheckpoints
+from .._SOL_Sinks import SOL_Sink, SOL_FileSink
+from .._SOL_Hashing import SOL_TreeHash, valid_leaf_size, split_leaves
 
 # ----------------------------------------------------------------------------------------------------------------------
 # - Code -
 # ----------------------------------------------------------------------------------------------------------------------
+# Every chunk of a streamed file is prefixed with its length, a chunk of length 0 ends the stream
+_STREAM_CHUNK_HEADER = struct.Struct(">I")
+# The most files of a FILES batch in flight at once, as their stream ids have to fit in the flags byte of a frame
+_MAX_STREAMS = 256
+# The most decompressed bytes handed to a sink at once
+_SINK_PIECE = 1048576
+# The most leaf digests sent along with the parameters of a file, which have to fit in a binary field
+_MAX_LEAVES = 2047
+
+class _File_Sink:
+    # Decrypts, decompresses and hashes every chunk as it arrives, and hands the data to a SOL_Sink
+    #   in pieces of at most _SINK_PIECE bytes, so only the final file is written.
+    #   A path is written under a .part name, and only renamed to its real name once the hash is correct.
+    #   Without a cipher the chunks are taken as decrypted already.
+    #   A tree hashed file with the digests of its leaves is checked leaf by leaf, and from the first wrong leaf on
+    #   the rest of the file is only received, not decompressed or written anymore.
+    def __init__(self, sink:SOL_Sink | str, cipher_aes, codec:str="zlib", tree:int=None, leaves:list[bytes]=None):
+        self.sink = sink if isinstance(sink, SOL_Sink) else SOL_FileSink(sink)
+        self.result = None  # what the sink returned, once the hash was correct
+        self._cipher_aes = cipher_aes
+        self._decompressor = get_codec(codec).decompressor()
+        self._hash_sum = hashlib.sha256() if tree is None else SOL_TreeHash(tree, expected=leaves)
+        self._tree = tree is not None
+        self._failed = False
+
+    def write(self, chunk:bytes) -> None:
+        if self._failed:
+            return
+        chunk = self._cipher_aes.decrypt(chunk) if self._cipher_aes is not None else chunk
+        for data in decompress_pieces(self._decompressor, chunk, _SINK_PIECE):
+            if data:
+                self._hash_sum.update(data)
+                self.sink.write(data)
+        if self._tree and self._hash_sum.mismatch is not None:
+            self._failed = True
+            self.discard()
+
+    def finish(self, hash_value:str) -> bool:
+        if self._failed:
+            return False
+        if data := self._decompressor.flush():
+            self._hash_sum.update(data)
+            self.sink.write(data)
+        if not self._decompressor.eof or self._hash_sum.hexdigest() != hash_value \
+                or self._tree and self._hash_sum.mismatch is not None:
+            self.discard()
+            return False
+        self.result = self.sink.finish()
+        return True
+
+    def discard(self) -> None:
+        self.sink.discard()
+
+# The part of a resumable upload the server received so far, decrypted but still compressed.
+#   Chunks are only written once they are verified, so any prefix of the part file is correct,
+#   and its size is the offset a next attempt continues from, also after the server was restarted.
+#   <upload_id>.part    the received bytes
+#   <upload_id>.json    the length, hash value and codec the part belongs to
+#   The same upload sent twice at the same time is written to a private part for the second one, which isn't kept.
+class _Upload_Part:
+    _active = set()
+    _active_lock = threading.Lock()
+
+    def __init__(self, directory:str, upload_id:str, package_length:int, hash_value:str, codec:str):
+        os.makedirs(directory, exist_ok=True)
+        with self._active_lock:
+            self._upload_id = upload_id if upload_id not in self._active else None
+            if self._upload_id is not None:
+                self._active.add(upload_id)
+        name = upload_id if self._upload_id is not None else f"{upload_id}_{secrets.token_hex(8)}"
+        self.path = os.path.join(directory, f"{name}.part")
+        self._meta_path = os.path.join(directory, f"{name}.json")
+
+        meta = {"len": package_length, "hash_value": hash_value, "codec": codec}
+        try:
+            with open(self._meta_path, "r") as meta_file:
+                resumable = json.load(meta_file) == meta
+        except (OSError, ValueError):
+            resumable = False
+        if not resumable:
+            with open(self._meta_path, "w") as meta_file:
+                json.dump(meta, meta_file)
+        self._file = open(self.path, "ab" if resumable else "wb")
+        self.offset = self._file.tell()
+
+    def write(self, data:bytes) -> None:
+        self._file.write(data)
+        self._file.flush()
+        self.offset += len(data)
+
+    def release(self, keep:bool) -> None:
+        # a kept part is continued by the next attempt, a private part is never kept
+        self._file.close()
+        if not keep or self._upload_id is None:
+            for path in (self.path, self._meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        with self._active_lock:
+            self._active.discard(self._upload_id)
+
+# A single file of a multiplexed FILES batch on the receiving side.
+#   Its chunks are handed over through a bounded queue, so a slow file holds back the socket instead of filling memory.
+class _File_Stream:
+    def __init__(
+            self,
+            stream_id:int,
+            sink:_File_Sink,
+            stream:bool,
+            package_length:int | None,
+            hash_value:str | None,
+            name:str=None
+    ):
+        self.stream_id = stream_id
+        self.name = name
+        self.sink = sink
+        self.stream = stream
+        self.package_length = package_length
+        self.hash_value = hash_value
+        self.received_length = 0
+        self.error = None
+        self.chunks = queue.Queue(maxsize=16)
+
+    def abort(self) -> None:
+        # Only the reading thread puts chunks in the queue, so after emptying it there is always room to stop the worker
+        while True:
+            try:
+                self.chunks.get_nowait()
+            except queue.Empty:
+                break
+        self.chunks.put_nowait(None)
+
 class PackageHandler_File(PackageHandler_Base,BASE_PackageHandler_File):
     # ------------------------------------------------------------------------------------------------------------------
     # - Handle file transformation in chunks -
@@ -32,12 +172,12 @@ class PackageHandler_File(PackageHandler_Base,BASE_PackageHandler_File):
             file_handling_section:str
     ) -> None:
         file_size_1 = os.path.getsize(filepath_1)
-        file_size_2 = os.path.getsize(filepath_1)
-        buffer_size = self._buffer_size(file_size_1)
-        total_chunks = math.ceil(file_size_1 / self._buffer_size(file_size_2))
+        done = 0
         with open(filepath_1, "rb") as file_1, open(filepath_2, "ab+") as file_2:
-            for _, chunk in enumerate(iter(functools.partial(file_1.read, buffer_size), b"")):
+            for chunk in self._chunks(file_1, file_size_1, CHUNK_ENCRYPT):
                 file_2.write(function_(chunk))
+                done += len(chunk)
+                self._progress(PROGRESS_ENCRYPT, os.path.basename(filepath_2), done, file_size_1)
 
     # ------------------------------------------------------------------------------------------------------------------
     # - Form parameters -
@@ -48,8 +188,26 @@ class PackageHandler_File(PackageHandler_Base,BASE_PackageHandler_File):
             nonce: bytes = None,
             package_length: int = None,
             filename: str = None,
-            hash_value: str = None
+            hash_value: str = None,
+            stream: bool = False,
+            codec: str = None,
+            binary: bool = False,
+            tree: int = None,
+            leaves: bytes = None
     ) -> bytes:
+        # protocol 2 sends binary fields, protocol 1 sends json with the bytes in base64
+        if binary:
+            return pack_parameters({
+                "sske": session_key_encrypted,
+                "nonce": nonce,
+                "len": package_length,
+                "file_name": filename,
+                "hash_value": hash_value,
+                "stream": stream,
+                "codec": codec,
+                "tree": tree,
+                "leaves": leaves,
+            })
         return json.dumps({
             "sske": base64.b64encode(session_key_encrypted).decode(
                 "utf8") if session_key_encrypted is not None else None,
@@ -58,8 +216,109 @@ class PackageHandler_File(PackageHandler_Base,BASE_PackageHandler_File):
             "file_name": base64.b64encode(filename.encode("utf8")).decode("utf8") if filename is not None else None,
             "hash_value": base64.b64encode(hash_value.encode("utf8")).decode(
                 "utf8") if hash_value is not None else None,
+            "stream": stream,
+            "codec": codec,
+            "tree": tree,
         }).encode("utf8")
 
+    def _file_leaves(self, file_object: BASE_Sol_File) -> bytes | None:
+        # The digests of the leaves of a tree hashed file let the receiver check every leaf on arrival.
+        #   They are only sent in protocol 2, when they fit in a field, otherwise only the root is checked.
+        leaf_hashes = file_object.leaf_hashes if file_object.tree_hash is not None else None
+        if self.protocol < 2 or leaf_hashes is None or len(leaf_hashes) > _MAX_LEAVES:
+            return None
+        return b"".join(leaf_hashes)
+
+    def _file_tree_in(self, package_param_dict: dict) -> tuple[int | None, list[bytes] | None]:
+        # the leaf size of a tree hashed file, and the digests of its leaves when they were sent along
+        if not (tree := package_param_dict.get("tree")):
+            return None, None
+        if not valid_leaf_size(tree):
+            raise self.error(5401)
+        leaves = package_param_dict.get("leaves")
+        return tree, split_leaves(parameter_bytes(leaves)) if leaves is not None else None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - File transfer, in either protocol -
+    # ------------------------------------------------------------------------------------------------------------------
+    def _file_params_out(self, package_parameters: bytes) -> None:
+        if self.protocol >= 2:
+            self._send_frame(FRAME_PACKAGE, _PARAMS_LENGTH.pack(len(package_parameters)) + package_parameters)
+            return
+        self.send_state(f"PARAM")
+        self.wait_for_state(f"READY")
+        self._send(package_parameters)
+        self.wait_for_state(f"READY")
+
+    def _file_chunk_out(self, chunk: bytes, stream: bool) -> None:
+        if self.protocol >= 2:
+            self._send_frame(FRAME_CHUNK, chunk)
+        elif stream:
+            self._send(_STREAM_CHUNK_HEADER.pack(len(chunk)) + chunk)
+        else:
+            self._send(chunk)
+
+    def _file_end_out(self, package_trailer: bytes | None) -> None:
+        # streamed files end with a trailer, holding the length and hash value which are only known at the end
+        if self.protocol >= 2:
+            self._send_frame(FRAME_END, package_trailer or b"")
+        else:
+            if package_trailer is not None:
+                self._send(
+                    _STREAM_CHUNK_HEADER.pack(0) + _STREAM_CHUNK_HEADER.pack(len(package_trailer)) + package_trailer
+                )
+            # wait for ingestion to finish
+            self.wait_for_state(f"INGESTED")
+
+        # wait for file decompression and check to happen
+        self.wait_for_state(f"CHECKED")
+
+    def _file_params_in(self) -> dict:
+        if self.protocol >= 2:
+            return self._package_in()[0]
+        self.wait_for_state(f"PARAM")
+        self.send_state(f"READY")
+        package_param_dict = load_parameters(self._recv(1024))
+        self.send_state(f"READY")
+        return package_param_dict
+
+    def _file_chunks_in(self, write, stream: bool, package_length: int | None) -> tuple[int, dict | None]:
+        # Passes every received chunk to write, and returns the received length and the trailer of a streamed file
+        received_length = 0
+        package_trailer = None
+        if self.protocol >= 2:
+            while True:
+                frame_type, _, payload = self._recv_frame()
+                if frame_type == FRAME_CHUNK:
+                    write(payload)
+                    received_length += len(payload)
+                elif frame_type == FRAME_END:
+                    package_trailer = load_parameters(payload) if payload else None
+                    break
+                else:
+                    raise self.error(5401)
+
+        elif stream:
+            while chunk_length := _STREAM_CHUNK_HEADER.unpack(self._recv_exact(_STREAM_CHUNK_HEADER.size))[0]:
+                write(self._recv_exact(chunk_length))
+                received_length += chunk_length
+            package_trailer = load_parameters(self._recv_exact(
+                _STREAM_CHUNK_HEADER.unpack(self._recv_exact(_STREAM_CHUNK_HEADER.size))[0]
+            ))
+
+        else:
+            buffer_size = self._chunk_size(package_length, CHUNK_RECV)
+            while received_length < package_length:
+                chunk = self._recv(min(buffer_size, package_length - received_length))
+                if not chunk:
+                    raise ConnectionResetError
+                write(chunk)
+                received_length += len(chunk)
+
+        if self.protocol < 2:
+            self.send_state(f"INGESTED")
+        return received_length, package_trailer
+
     # ------------------------------------------------------------------------------------------------------------------
     # - FILE Packages outgoing -
     # ------------------------------------------------------------------------------------------------------------------
@@ -77,105 +336,511 @@ class PackageHandler_File(PackageHandler_Base,BASE_PackageHandler_File):
             file_handling_section="ENCRYPTED"
         )
 
-        # assemble package parameters
-        package_parameters = self.file_package_parameters(
+        # assemble and send package parameters
+        file_size = os.path.getsize(f"temp/{file_object.filename_transmission}")
+        self._file_params_out(self.file_package_parameters(
             session_key_encrypted,
             nonce,
-            os.path.getsize(f"temp/{file_object.filename_transmission}"),
+            file_size,
             file_object.filename_transmission,
-            file_object.hash_value
-        )
-
-        # Send parameters
-        self.send_state(f"PARAM")
-        self.wait_for_state(f"READY")
-        self.connection.sendall(package_parameters)
-        self.wait_for_state(f"READY")
+            file_object.hash_value,
+            codec=file_object.codec,
+            binary=self.protocol >= 2,
+            tree=file_object.tree_hash,
+            leaves=self._file_leaves(file_object)
+        ))
 
         # send the file in chunks
-        buffer_size = self._buffer_size(os.path.getsize(f"temp/{file_object.filename_transmission}"))
-        file_size = os.path.getsize(f"temp/{file_object.filename_transmission}")
-        total_chunks = math.ceil(file_size / self._buffer_size(file_size))
+        done = 0
         with open(f"temp/{file_object.filename_transmission}", "rb") as file_final_:
-            for _, chunk in enumerate(iter(functools.partial(file_final_.read, buffer_size), b"")):
-                self.connection.send(chunk)
-        del total_chunks, buffer_size, file_size
+            for chunk in self._chunks(file_final_, file_size, CHUNK_SEND):
+                self._file_chunk_out(chunk, stream=False)
+                done += len(chunk)
+                self._progress(PROGRESS_UPLOAD, file_object.filename_transmission, done, file_size)
 
-        # wait for ingestion to finish
-        self.wait_for_state(f"INGESTED")
+        # wait for the file to be ingested and checked
+        self._file_end_out(None)
 
-        # wait for file decompression and check to happen
-        self.wait_for_state(f"CHECKED")
+    def file_package_output_stream(self, state: str, file_object: BASE_Sol_File, server_public_key: RsaKey) -> None:
+        # The file is read, hashed, compressed, encrypted and sent chunk by chunk.
+        #   Because of this the length and hash aren't known up front, and are sent after the last chunk.
+        session_key_encrypted, nonce, cipher_aes = pp_cipher_aes_encryptor(server_public_key)
+
+        # assemble and send package parameters
+        self._file_params_out(self.file_package_parameters(
+            session_key_encrypted,
+            nonce,
+            None,
+            file_object.filename_transmission,
+            None,
+            stream=True,
+            codec=file_object.codec,
+            binary=self.protocol >= 2,
+            tree=file_object.tree_hash
+        ))
+
+        # send the file in chunks
+        package_length = 0
+        for chunk in file_object.compressed_chunks():
+            if not chunk:
+                continue
+            chunk_encrypted = cipher_aes.encrypt(chunk)
+            self._file_chunk_out(chunk_encrypted, stream=True)
+            package_length += len(chunk_encrypted)
+            self._progress(PROGRESS_UPLOAD, file_object.filename_transmission, package_length)
+
+        # send the trailer, which holds the now known length and hash value, and wait for the file to be checked
+        self._file_end_out(self.file_package_parameters(
+            package_length=package_length,
+            hash_value=file_object.hash_value,
+            stream=True,
+            binary=self.protocol >= 2
+        ))
+        self._progress(PROGRESS_UPLOAD, file_object.filename_transmission, package_length, package_length)
 
     # ------------------------------------------------------------------------------------------------------------------
-    # - FILE Packages incoming -
+    # - Resumable FILE Packages, protocol 2 only -
     # ------------------------------------------------------------------------------------------------------------------
-    def file_package_input(self, state: str, client_private_key: RsaKey) -> None:
-        self.wait_for_state(f"PARAM")
-        self.send_state(f"READY")
+    # A resumable upload sends the compressed file in chunks that are each encrypted and checked on their own,
+    #   bound to their offset in the file. The server keeps every verified chunk under the id of the upload,
+    #   and answers the parameters with the offset it already has, from where the client continues.
+    #   A connection reset only loses the chunk that was underway, not the chunks before it.
+    def file_package_output_resumable(
+            self,
+            state: str,
+            file_object: BASE_Sol_File,
+            server_public_key: RsaKey,
+            checkpoints: SOL_UploadCheckpoints = None
+    ) -> None:
+        if self.protocol < 2:
+            raise self.error(5401)
+        file_path = f"temp/{file_object.filename_temp}"
+        package_length = os.path.getsize(file_path)
+        upload_id = SOL_UploadCheckpoints.upload_id(file_object, package_length)
+
+        # every attempt has its own session key
+        session_key, session_key_encrypted = pp_session_key(server_public_key)
+        self._file_params_out(pack_parameters({
+            "sske": session_key_encrypted,
+            "upload": upload_id,
+            "len": package_length,
+            "file_name": file_object.filename_transmission,
+            "hash_value": file_object.hash_value,
+            "codec": file_object.codec,
+            "tree": file_object.tree_hash,
+            "leaves": self._file_leaves(file_object),
+        }))
+        try:
+            offset = confirmed = int(self._file_params_in()["offset"])
+        except (KeyError, TypeError, ValueError):
+            raise self.error(5401)
+        if not 0 <= offset <= package_length:
+            raise self.error(5401)
+        if checkpoints is not None:
+            checkpoints.save(upload_id, file_object, package_length, confirmed, offset)
+
+        # send the rest of the file in chunks
+        try:
+            with open(file_path, "rb") as file:
+                file.seek(offset)
+                for chunk in self._chunks(file, package_length - offset, CHUNK_SEND):
+                    self._send_frame(FRAME_CHUNK, pp_chunk_encrypt(session_key, offset, chunk))
+                    offset += len(chunk)
+                    self._progress(PROGRESS_UPLOAD, file_object.filename_transmission, offset, package_length)
+
+            # wait for the file to be checked
+            self._file_end_out(None)
+        except BaseException:
+            if checkpoints is not None:
+                checkpoints.save(upload_id, file_object, package_length, confirmed, offset)
+            raise
+
+        if checkpoints is not None:
+            checkpoints.finish(upload_id)
+
+    def file_package_input_resumable(self, state: str, client_private_key: RsaKey, directory: str = "temp") -> str:
+        if self.protocol < 2:
+            raise self.error(5401)
         try:
-            package_param_dict = json.loads(self.connection.recv(1024).decode("utf_8"))
-            session_key_encrypted = base64.b64decode(package_param_dict["sske"].encode("utf8"))
-            nonce = base64.b64decode(package_param_dict["nonce"].encode("utf8"))
+            package_param_dict = self._file_params_in()
+            session_key = pp_session_key_decrypt(client_private_key, parameter_bytes(package_param_dict["sske"]))
+            upload_id = package_param_dict["upload"]
             package_length = int(package_param_dict["len"])
-            file_name = base64.b64decode(package_param_dict["file_name"].encode("utf8")).decode("utf_8")
-            hash_value = base64.b64decode(package_param_dict["hash_value"].encode("utf8")).decode("utf_8")
-            file_path = f"temp/{file_name}"
-        except KeyError:
+            file_name = self._file_name_in(package_param_dict)
+            hash_value = parameter_bytes(package_param_dict["hash_value"]).decode("utf_8")
+            codec = package_param_dict.get("codec") or "zlib"
+            tree, leaves = self._file_tree_in(package_param_dict)
+            file_path = os.path.join(directory, file_name)
+        except (KeyError, TypeError, ValueError):
+            raise self.error(5401)
+        # the id names files on this side, so it has to be the hex digest it is supposed to be
+        if len(upload_id) != 64 or upload_id.strip("0123456789abcdef"):
             raise self.error(5401)
 
-        self.send_state(f"INGESTED")
+        # tell the client where to continue from
+        part = _Upload_Part(os.path.join(directory, ".uploads"), upload_id, package_length, hash_value, codec)
+        try:
+            self._file_params_out(pack_parameters({"offset": part.offset}))
+            while True:
+                frame_type, _, payload = self._recv_frame()
+                if frame_type == FRAME_END:
+                    break
+                if frame_type != FRAME_CHUNK:
+                    raise self.error(5401)
+                try:
+                    chunk = pp_chunk_decrypt(session_key, part.offset, payload)
+                except ValueError:
+                    raise self.error(5402)
+                if part.offset + len(chunk) > package_length:
+                    raise self.error(5401)
+                part.write(chunk)
+        except BaseException:
+            # what was verified stays, for the next attempt
+            part.release(keep=True)
+            raise
+        if part.offset != package_length:
+            part.release(keep=False)
+            raise self.error(5401)
 
-        # get the buffer size
-        buffer_size = self._buffer_size(package_length)
+        # decompress and hash the whole file, which is only kept if the hash was correct
+        sink = _File_Sink(file_path, None, codec, tree, leaves)
+        try:
+            with open(part.path, "rb") as file:
+                for chunk in self._chunks(file, package_length, CHUNK_READ):
+                    sink.write(chunk)
+        except BaseException:
+            sink.discard()
+            raise
+        finally:
+            # once the whole file arrived the part is done with, also when its hash was wrong
+            part.release(keep=False)
+        if not sink.finish(hash_value):
+            raise self.error(5402)
 
-        # Ingest the file
-        total_size = 0
-        with open(f"{file_path}.temp", "ab+") as temp_file:
-            while os.path.getsize(f"{file_path}.temp") < package_length:
-                chunk = self.connection.recv(buffer_size)
-                temp_file.write(chunk)
-                total_size += len(chunk)
-        del total_size, chunk
-        self.send_state(f"INGESTED")
+        # send correct state
+        self.send_state(f"CHECKED")
+        return sink.result
 
-        # Decrypt the package
-        cipher_aes = pp_cipher_aes_decryptor(client_private_key, session_key_encrypted, nonce)
-        self._file_package_handle_chunk(
-            filepath_1=f"{file_path}.temp",
-            filepath_2=f"{file_path}.temp2",
-            function_=cipher_aes.decrypt,
-            file_handling_section="DECRYPTED"
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Multiple FILE Packages at once, protocol 2 only -
+    # ------------------------------------------------------------------------------------------------------------------
+    # The files of a FILES batch are sent as interleaved frames, where the flags byte holds the stream id of the file.
+    #   Every file has a package frame with its parameters, chunk frames and an end frame.
+    #   The receiver answers a CHECKED state, with the same stream id, for every file it verified.
+    #   The files are sent in windows of _MAX_STREAMS, where file n has stream id n % _MAX_STREAMS.
+    #   A window is only sent once every file of the window before it was checked, so its stream ids are free again.
+    def file_package_output_multiple(
+            self,
+            state: str,
+            file_objects: list[BASE_Sol_File],
+            server_public_key: RsaKey,
+            workers: int = 4,
+            stream: bool = False
+    ) -> None:
+        if self.protocol < 2:
+            raise self.error(5401)
+        batch_parameters = pack_parameters({"count": len(file_objects)})
+        self._send_frame(FRAME_PACKAGE, _PARAMS_LENGTH.pack(len(batch_parameters)) + batch_parameters)
+
+        # every worker reads, (compresses) and encrypts a file, the lock keeps the frames of different files whole
+        #   files which aren't on disk are always streamed
+        send_lock = threading.Lock()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SOL_files") as executor:
+            for start in range(0, len(file_objects), _MAX_STREAMS):
+                window = file_objects[start:start + _MAX_STREAMS]
+                futures = [
+                    executor.submit(
+                        self._file_output_stream_id, stream_id, file_object, server_public_key,
+                        stream or file_object.streamed, send_lock
+                    )
+                    for stream_id, file_object in enumerate(window)
+                ]
+                for future in futures:
+                    future.result()
+
+                # wait for every file of the window to be checked
+                checked = set()
+                while len(checked) < len(window):
+                    frame_type, stream_id, payload = self._recv_frame()
+                    if frame_type != FRAME_STATE or payload != b"CHECKED" or stream_id >= len(window):
+                        raise self.error(5401, "CHECKED", payload)
+                    checked.add(stream_id)
+
+    def _file_output_stream_id(
+            self,
+            stream_id: int,
+            file_object: BASE_Sol_File,
+            server_public_key: RsaKey,
+            stream: bool,
+            send_lock: threading.Lock
+    ) -> None:
+        session_key_encrypted, nonce, cipher_aes = pp_cipher_aes_encryptor(server_public_key)
+        if stream:
+            package_length, hash_value, chunks = None, None, file_object.compressed_chunks()
+        else:
+            # the compressed temp file is encrypted while it is read, which keeps its length
+            file_path = f"temp/{file_object.filename_temp}"
+            package_length, hash_value = os.path.getsize(file_path), file_object.hash_value
+            chunks = self._file_read_chunks(file_path)
+        total = package_length
+        package_parameters = self.file_package_parameters(
+            session_key_encrypted,
+            nonce,
+            package_length,
+            file_object.filename_transmission,
+            hash_value,
+            stream=stream,
+            codec=file_object.codec,
+            binary=True,
+            tree=file_object.tree_hash,
+            leaves=None if stream else self._file_leaves(file_object)
         )
+        with send_lock:
+            self._send_frame(FRAME_PACKAGE, _PARAMS_LENGTH.pack(len(package_parameters)) + package_parameters, stream_id)
 
-        # delete temp file
-        os.remove(f"{file_path}.temp")
+        package_length = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            chunk_encrypted = cipher_aes.encrypt(chunk)
+            with send_lock:
+                self._send_frame(FRAME_CHUNK, chunk_encrypted, stream_id)
+            package_length += len(chunk_encrypted)
+            self._progress(PROGRESS_UPLOAD, file_object.filename_transmission, package_length, total)
 
-        # Decompress file
-        decompressor = zlib.decompressobj()
-        self._file_package_handle_chunk(
-            filepath_1=f"{file_path}.temp2",
-            filepath_2=file_path,
-            function_=decompressor.decompress,
-            file_handling_section="DECOMPRESSED"
+        package_trailer = self.file_package_parameters(
+            package_length=package_length,
+            hash_value=file_object.hash_value,
+            stream=True,
+            binary=True
+        ) if stream else b""
+        with send_lock:
+            self._send_frame(FRAME_END, package_trailer, stream_id)
+        if stream:
+            self._progress(PROGRESS_UPLOAD, file_object.filename_transmission, package_length, package_length)
+
+    def _file_read_chunks(self, file_path: str):
+        with open(file_path, "rb") as file:
+            yield from self._chunks(file, os.path.getsize(file_path), CHUNK_SEND)
+
+    def file_package_input_multiple(
+            self,
+            state: str,
+            client_private_key: RsaKey,
+            directory: str = "temp",
+            sinks=None
+    ) -> list:
+        if self.protocol < 2:
+            raise self.error(5401)
+        try:
+            count = int(self._package_in()[0]["count"])
+        except (KeyError, TypeError, ValueError):
+            raise self.error(5401)
+        if count < 0:
+            raise self.error(5401)
+
+        # every file is decrypted, decompressed and hashed on its own thread, while this one reads the socket
+        send_lock = threading.Lock()
+        file_streams = {}   # the files which haven't ended yet, by their stream id
+        files = {}          # every file, by its place in the batch
+        threads = []
+        ended = 0
+        try:
+            while ended < count:
+                frame_type, stream_id, payload = self._recv_frame()
+                file_stream = file_streams.get(stream_id)
+                if frame_type == FRAME_PACKAGE and file_stream is None:
+                    # the window only changes once all of its files ended
+                    if (index := ended // _MAX_STREAMS * _MAX_STREAMS + stream_id) in files or index >= count:
+                        raise self.error(5401)
+                    file_stream = file_streams[stream_id] = files[index] = self._file_stream_in(
+                        stream_id,
+                        load_parameters(payload[_PARAMS_LENGTH.size:]),
+                        client_private_key,
+                        directory,
+                        sinks
+                    )
+                    threads.append(threading.Thread(
+                        target=self._file_stream_worker,
+                        args=(file_stream, send_lock),
+                        daemon=True
+                    ))
+                    threads[-1].start()
+                elif frame_type == FRAME_CHUNK and file_stream is not None:
+                    file_stream.chunks.put(payload)
+                elif frame_type == FRAME_END and file_stream is not None:
+                    file_stream.chunks.put((payload,))
+                    del file_streams[stream_id]
+                    ended += 1
+                    # the sender waits for the whole window to be checked, a failed file ends the batch here
+                    if ended % _MAX_STREAMS == 0 and ended < count:
+                        self._file_streams_join(files, threads)
+                else:
+                    raise self.error(5401)
+        except BaseException:
+            for file_stream in file_streams.values():
+                file_stream.abort()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+
+        self._file_streams_join(files, threads)
+        return [files[index].sink.result for index in sorted(files)]
+
+    @staticmethod
+    def _file_streams_join(files: dict, threads: list) -> None:
+        # the error of the first failing file is raised, no matter which one failed first
+        for thread in threads:
+            thread.join()
+        for index in sorted(files):
+            if files[index].error is not None:
+                raise files[index].error
+
+    def _file_stream_in(
+            self,
+            stream_id: int,
+            package_param_dict: dict,
+            client_private_key: RsaKey,
+            directory: str,
+            sinks=None
+    ) -> _File_Stream:
+        try:
+            session_key_encrypted = parameter_bytes(package_param_dict["sske"])
+            nonce = parameter_bytes(package_param_dict["nonce"])
+            file_name = self._file_name_in(package_param_dict)
+            stream = package_param_dict.get("stream", False)
+            codec = package_param_dict.get("codec") or "zlib" # files from before codecs were signalled are zlib
+            tree, leaves = self._file_tree_in(package_param_dict)
+            package_length = None if stream else int(package_param_dict["len"])
+            hash_value = None if stream else \
+                parameter_bytes(package_param_dict["hash_value"]).decode("utf_8")
+        except (KeyError, TypeError, ValueError):
+            raise self.error(5401)
+        return _File_Stream(
+            stream_id,
+            _File_Sink(
+                sinks(file_name, package_length) if sinks is not None else os.path.join(directory, file_name),
+                pp_cipher_aes_decryptor(client_private_key, session_key_encrypted, nonce),
+                codec,
+                tree,
+                leaves
+            ),
+            stream,
+            package_length,
+            hash_value,
+            file_name
+        )
+
+    def _file_stream_worker(self, file_stream: _File_Stream, send_lock: threading.Lock) -> None:
+        ended = False
+        try:
+            while True:
+                match file_stream.chunks.get():
+                    case None:
+                        # the batch was aborted
+                        file_stream.sink.discard()
+                        return
+                    case (package_trailer,):
+                        ended = True
+                        break
+                    case chunk:
+                        file_stream.sink.write(chunk)
+                        file_stream.received_length += len(chunk)
+                        self._progress(
+                            PROGRESS_DOWNLOAD, file_stream.name, file_stream.received_length, file_stream.package_length
+                        )
+
+            # Streamed files have their length and hash sent after the last chunk
+            if file_stream.stream:
+                try:
+                    package_trailer = load_parameters(package_trailer)
+                    file_stream.hash_value = parameter_bytes(package_trailer["hash_value"]).decode("utf_8")
+                    file_stream.package_length = int(package_trailer["len"])
+                except (KeyError, TypeError, ValueError):
+                    raise self.error(5401)
+            if file_stream.package_length != file_stream.received_length:
+                raise self.error(5401)
+
+            # the file is only kept if the hash was correct
+            if not file_stream.sink.finish(file_stream.hash_value):
+                raise self.error(5402)
+            with send_lock:
+                self._send_frame(FRAME_STATE, b"CHECKED", file_stream.stream_id)
+
+        except Exception as e:
+            file_stream.sink.discard()
+            file_stream.error = e
+            # keep taking chunks until the end of the file, so the reading thread is never blocked by a failed file
+            while not ended and (item := file_stream.chunks.get()) is not None:
+                ended = isinstance(item, tuple)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - FILE Packages incoming -
+    # ------------------------------------------------------------------------------------------------------------------
+    def _file_name_in(self, package_param_dict: dict) -> str:
+        # the name comes from the other side, so it is never allowed to leave the directory it is stored in
+        file_name = parameter_bytes(package_param_dict["file_name"]).decode("utf_8")
+        if file_name != os.path.basename(file_name) or file_name in ("", ".", ".."):
+            raise self.error(5401)
+        return file_name
+
+    def file_package_input(self, state: str, client_private_key: RsaKey, directory: str = "temp", sinks=None):
+        # The file is stored in the directory under the name it was sent with,
+        #   or handed to the SOL_Sink that sinks(name, length) returns, where length is None for streamed files.
+        #   Returns what the sink returned, which is the path for a file.
+        try:
+            package_param_dict = self._file_params_in()
+            session_key_encrypted = parameter_bytes(package_param_dict["sske"])
+            nonce = parameter_bytes(package_param_dict["nonce"])
+            file_name = self._file_name_in(package_param_dict)
+            stream = package_param_dict.get("stream", False)
+            codec = package_param_dict.get("codec") or "zlib" # files from before codecs were signalled are zlib
+            tree, leaves = self._file_tree_in(package_param_dict)
+            package_length = None if stream else int(package_param_dict["len"])
+            if not stream:
+                hash_value = parameter_bytes(package_param_dict["hash_value"]).decode("utf_8")
+            file_path = os.path.join(directory, file_name)
+        except (KeyError, TypeError, ValueError):
+            raise self.error(5401)
+
+        # Ingest the file, which is decrypted, decompressed and hashed on arrival
+        sink = _File_Sink(
+            sinks(file_name, package_length) if sinks is not None else file_path,
+            pp_cipher_aes_decryptor(client_private_key, session_key_encrypted, nonce),
+            codec,
+            tree,
+            leaves
         )
-        # delete temp file
-        os.remove(f"{file_path}.temp2")
-
-        # check hash_sum in chunks
-        hash_sum = hashlib.sha256()
-
-        file_size = os.path.getsize(f"{file_path}")
-        total_chunks = math.ceil(file_size / self._buffer_size(file_size))
-        with open(file_path, "rb") as file_final_:
-            for _, chunk in enumerate(iter(functools.partial(file_final_.read, buffer_size), b"")):
-                hash_sum.update(chunk)
-                #todo QSignal to view progress
-        del total_chunks
-
-        if hash_sum.hexdigest() != hash_value:
-            os.remove(f"{file_path}")  # delete file if hash wasn't correct
+        received = 0
+        def write(chunk: bytes) -> None:
+            nonlocal received
+            sink.write(chunk)
+            received += len(chunk)
+            self._progress(PROGRESS_DOWNLOAD, file_name, received, package_length)
+        try:
+            received_length, package_trailer = self._file_chunks_in(
+                write if self.progress is not None else sink.write,
+                stream,
+                package_length
+            )
+
+            # Streamed files have their length and hash sent after the last chunk
+            if stream:
+                try:
+                    hash_value = parameter_bytes(package_trailer["hash_value"]).decode("utf_8")
+                    if int(package_trailer["len"]) != received_length:
+                        raise self.error(5401)
+                except (KeyError, TypeError, ValueError):
+                    raise self.error(5401)
+        except BaseException:
+            sink.discard()
+            raise
+
+        # the file is only kept if the hash was correct
+        if not sink.finish(hash_value):
             raise self.error(5402)
 
         # send correct state
         self.send_state(f"CHECKED")
+        return sink.result
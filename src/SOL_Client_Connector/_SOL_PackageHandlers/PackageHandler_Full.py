@@ -8,10 +8,22 @@ import socket
 from .PackageHandler_Data import PackageHandler_Data
 from .PackageHandler_File import PackageHandler_File
 from .._Base_Classes import BASE_PackageHandler_Full
+from .._SOL_Chunking import SOL_ChunkPolicy
+from .._SOL_Progress import SOL_Progress
+from .._SOL_Serializers import SOL_Serializer
 
 # ----------------------------------------------------------------------------------------------------------------------
 # - Code -
 # ----------------------------------------------------------------------------------------------------------------------
 class PackageHandler_Full(BASE_PackageHandler_Full,PackageHandler_Data,PackageHandler_File):
-    def __init__(self, connection:socket.socket):
+    def __init__(
+            self,
+            connection:socket.socket,
+            chunk_policy:SOL_ChunkPolicy=None,
+            progress:SOL_Progress=None,
+            serializer:SOL_Serializer=None
+    ):
         self.connection = connection
+        self.chunk_policy = chunk_policy if chunk_policy is not None else SOL_ChunkPolicy.shared()
+        self.progress = progress
+        self.serializer = serializer
@@ -1 +1,2 @@
-from .PackageHandler_Full import PackageHandler_Full
\ No newline at end of file
+from .PackageHandler_Full import PackageHandler_Full
+from .AsyncPackageHandler_Full import AsyncPackageHandler_Full
\ No newline at end of file
@@ -0,0 +1,96 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import asyncio
+import dataclasses
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_Progress
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# The kinds of progress events
+PROGRESS_COMPRESS = "compress"  # a file being hashed and compressed
+PROGRESS_ENCRYPT = "encrypt"    # a compressed file being encrypted
+PROGRESS_UPLOAD = "upload"      # a file being sent
+PROGRESS_DOWNLOAD = "download"  # a package being received, e.g. the REPLY
+PROGRESS_INFO = "info"          # an INFO message of the server, which is never throttled
+
+@dataclasses.dataclass(slots=True)
+class SOL_ProgressEvent:
+    kind:str
+    name:str                # the name the file is sent under, or the state of a package
+    done:int = 0            # bytes so far
+    total:int | None = None # bytes in total, None when it isn't known up front, like for streamed files
+    final:bool = False      # the last event of this kind and name
+    data:dict | None = None # the message of an INFO event
+
+# Hands progress events to callback(event), at most max_rate times per second for every file and kind.
+#   The final event of a file is always handed over. A max_rate of None doesn't throttle at all.
+#   The callback is called on the thread doing the work, so it should return quickly.
+class SOL_Progress(BASE_SOL_Progress):
+    def __init__(self, callback:Callable[[SOL_ProgressEvent], Any]=None, max_rate:float | None=10.0):
+        self.callback = callback
+        self.max_rate = max_rate
+        self._interval = 1 / max_rate if max_rate else 0.0
+        self._last = {}     # time of the last event, by kind and name
+        self._lock = threading.Lock()
+
+    def update(self, kind:str, name:str, done:int, total:int=None, final:bool=False) -> None:
+        final = final or (total is not None and done >= total)
+        key = (kind, name)
+        now = time.monotonic()
+        with self._lock:
+            if final:
+                self._last.pop(key, None)
+            elif now - self._last.get(key, -self._interval) < self._interval:
+                return
+            else:
+                self._last[key] = now
+        self.emit(SOL_ProgressEvent(kind, name, done, total, final))
+
+    def info(self, data:dict) -> None:
+        self.emit(SOL_ProgressEvent(PROGRESS_INFO, "INFO", final=True, data=data))
+
+    def emit(self, event:SOL_ProgressEvent) -> None:
+        if self.callback is not None:
+            self.callback(event)
+
+# Puts the events in a queue instead, so a GUI or asyncio consumer never blocks the thread doing the work.
+#   Without a loop, the queue is a queue.Queue. With a loop, it is an asyncio.Queue of that loop.
+#   When the queue is full, new events are dropped and counted, except for final events which replace the oldest.
+class SOL_ProgressQueue(SOL_Progress):
+    def __init__(self, max_rate:float | None=10.0, maxsize:int=1024, loop:asyncio.AbstractEventLoop=None):
+        super().__init__(max_rate=max_rate)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize) if loop is not None else queue.Queue(maxsize)
+        self.dropped = 0
+
+    def emit(self, event:SOL_ProgressEvent) -> None:
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._put, event)
+        else:
+            self._put(event)
+
+    def _put(self, event:SOL_ProgressEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+            return
+        except (queue.Full, asyncio.QueueFull):
+            self.dropped += 1
+        # the final event of a file matters more than the oldest event in the queue
+        if event.final:
+            try:
+                self.queue.get_nowait()
+            except (queue.Empty, asyncio.QueueEmpty):
+                pass
+            try:
+                self.queue.put_nowait(event)
+            except (queue.Full, asyncio.QueueFull):
+                pass
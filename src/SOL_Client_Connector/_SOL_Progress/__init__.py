@@ -0,0 +1,10 @@
+from .SOL_Progress import (
+    SOL_Progress,
+    SOL_ProgressQueue,
+    SOL_ProgressEvent,
+    PROGRESS_COMPRESS,
+    PROGRESS_ENCRYPT,
+    PROGRESS_UPLOAD,
+    PROGRESS_DOWNLOAD,
+    PROGRESS_INFO
+)
\ No newline at end of file
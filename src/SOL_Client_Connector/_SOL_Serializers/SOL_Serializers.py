@@ -0,0 +1,186 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import base64
+import json
+import struct
+from typing import Any, Callable
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_Serializer, BASE_Sol_File, BASE_SOL_Credentials, SOL_Error
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# The formats packages can be sent in, several serializers can write the same format
+FORMAT_JSON = "json"
+FORMAT_MSGPACK = "msgpack"
+
+def _default(obj:Any) -> Any:
+    # a SOL_File or SOL_Credentials in the commands is replaced by what it tells the server about itself
+    if isinstance(obj, (BASE_Sol_File, BASE_SOL_Credentials)):
+        return obj.to_json()
+    raise TypeError(f"Object of type {obj.__class__.__name__} can't be serialized")
+
+# Turns packages into bytes and back, without changing json for the rest of the process
+class SOL_Serializer(BASE_SOL_Serializer):
+    def __init__(self, name:str, format:str, dumps:Callable[[Any, Callable], bytes], loads:Callable[[bytes], Any]):
+        self.name = name
+        self.format = format
+        self._dumps = dumps     # dumps(obj, default) where default is called for objects it can't serialize
+        self._loads = loads     # loads(data) where data can be bytes or a bytearray
+
+    def dumps(self, obj:Any, default:Callable[[Any], Any]=None) -> bytes:
+        # default replaces the objects it can't serialize, by default a SOL_File or SOL_Credentials by its to_json
+        return self._dumps(obj, default or _default)
+
+    def loads(self, data:bytes) -> Any:
+        return self._loads(data)
+
+    def __repr__(self) -> str:
+        return f"SOL_Serializer({self.name!r})"
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Registry -
+# ----------------------------------------------------------------------------------------------------------------------
+_serializers = {}
+_formats = {}   # the serializer a format is read with, which is the last one registered for it
+
+def register_serializer(serializer:SOL_Serializer) -> None:
+    _serializers[serializer.name] = serializer
+    _formats[serializer.format] = serializer
+
+def get_serializer(name:str=None) -> SOL_Serializer:
+    # None is the fastest serializer of json
+    if name is None:
+        return serializer_for(FORMAT_JSON)
+    try:
+        return _serializers[name]
+    except KeyError:
+        raise SOL_Error(4415, f"Serializer '{name}' is not available")
+
+def serializer_for(format:str) -> SOL_Serializer:
+    try:
+        return _formats[format]
+    except KeyError:
+        raise SOL_Error(4415, f"Serialization format '{format}' is not available")
+
+def available_serializers() -> list[str]:
+    return sorted(_serializers)
+
+def available_formats() -> list[str]:
+    return sorted(_formats)
+
+register_serializer(SOL_Serializer(
+    "json",
+    FORMAT_JSON,
+    lambda obj, default: json.dumps(obj, default=default, separators=(",", ":")).encode("utf_8"),
+    json.loads
+))
+
+# The fast serializers, when their packages are installed
+if orjson is not None:
+    register_serializer(SOL_Serializer(
+        "orjson",
+        FORMAT_JSON,
+        lambda obj, default: orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS),
+        orjson.loads
+    ))
+if msgpack is not None:
+    register_serializer(SOL_Serializer(
+        "msgpack",
+        FORMAT_MSGPACK,
+        lambda obj, default: msgpack.packb(obj, default=default),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)
+    ))
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Binary parameters -
+# ----------------------------------------------------------------------------------------------------------------------
+# Protocol 2 sends package and file parameters as binary fields of: field id, value length, value.
+#   Fields which are None are left out. json parameters always start with {, so either kind can be told apart.
+_PARAMETERS_MAGIC = b"\x01"
+_FIELD = struct.Struct(">BH")
+_INT = struct.Struct(">Q")
+
+_FIELDS = {
+    "sske": (1, bytes),
+    "tag": (2, bytes),
+    "nonce": (3, bytes),
+    "len": (4, int),
+    "file_name": (5, bytes),
+    "hash_value": (6, bytes),
+    "stream": (7, bool),
+    "codec": (8, str),
+    "count": (9, int),
+    "fmt": (10, str),
+    "upload": (11, str),
+    "offset": (12, int),
+    "tree": (13, int),
+    "leaves": (14, bytes),
+}
+_FIELD_IDS = {field_id: (name, kind) for name, (field_id, kind) in _FIELDS.items()}
+
+def pack_parameters(parameters:dict) -> bytes:
+    parts = [_PARAMETERS_MAGIC]
+    for name, value in parameters.items():
+        if value is None:
+            continue
+        field_id, kind = _FIELDS[name]
+        if kind is int:
+            value = _INT.pack(value)
+        elif kind is bool:
+            value = b"\x01" if value else b"\x00"
+        elif kind is str or isinstance(value, str):
+            value = value.encode("utf_8")
+        parts.append(_FIELD.pack(field_id, len(value)))
+        parts.append(value)
+    return b"".join(parts)
+
+def unpack_parameters(data:bytes) -> dict:
+    parameters = {}
+    data = memoryview(data)
+    offset = len(_PARAMETERS_MAGIC)
+    try:
+        while offset < len(data):
+            field_id, length = _FIELD.unpack_from(data, offset)
+            offset += _FIELD.size
+            value = data[offset:offset + length]
+            if len(value) != length:
+                raise SOL_Error(5401, "Parameters were cut short")
+            offset += length
+            # fields this side doesn't know are skipped
+            if (field := _FIELD_IDS.get(field_id)) is None:
+                continue
+            name, kind = field
+            if kind is int:
+                parameters[name], = _INT.unpack(value)
+            elif kind is bool:
+                parameters[name] = value != b"\x00"
+            elif kind is str:
+                parameters[name] = str(value, "utf_8")
+            else:
+                parameters[name] = bytes(value)
+    except struct.error:
+        raise SOL_Error(5401, "Parameters were cut short")
+    return parameters
+
+def load_parameters(data:bytes) -> dict:
+    if data[:1] == _PARAMETERS_MAGIC:
+        return unpack_parameters(data)
+    return json.loads(data)
+
+def parameter_bytes(value:str | bytes) -> bytes:
+    # binary parameters hold bytes, json parameters hold them in base64
+    if isinstance(value, str):
+        return base64.b64decode(value.encode("utf8"))
+    return value
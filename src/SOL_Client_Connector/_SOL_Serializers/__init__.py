@@ -0,0 +1,14 @@
+from .SOL_Serializers import (
+    SOL_Serializer,
+    register_serializer,
+    get_serializer,
+    serializer_for,
+    available_serializers,
+    available_formats,
+    pack_parameters,
+    unpack_parameters,
+    load_parameters,
+    parameter_bytes,
+    FORMAT_JSON,
+    FORMAT_MSGPACK
+)
\ No newline at end of file
@@ -0,0 +1,437 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import collections
+import os
+import random
+import secrets
+import socket
+import threading
+import time
+from Crypto.PublicKey.RSA import RsaKey
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_Server, SOL_Error, STOP_Error
+from ..SOL_Encryption import *
+from .._SOL_PackageHandlers import PackageHandler_Full as PH
+from .._SOL_Codecs import available_codecs
+from .._SOL_Serializers import serializer_for, available_formats, FORMAT_JSON
+from .._SOL_Chunking import SOL_ChunkPolicy
+from .._SOL_Hashing import valid_leaf_size
+from .._SOL_File import SOL_File
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# The kinds of errors the server can inject, instead of its reply
+INJECT_STOP = "stop"                # a STOP with error 5500, which the client returns as its reply
+INJECT_DISCONNECT = "disconnect"    # the connection is cut, which the client raises as 4403
+INJECT_RESET = "reset"              # the connection is cut part way through the files, like a network reset
+
+# Wraps the socket of a connection, to act like a slower network.
+#   latency is added once to every round trip, at the first send after something was received.
+#   bandwidth caps the bytes per second, separately in each direction.
+class _Shaped_Connection:
+    def __init__(self, connection:socket.socket, latency:float, bandwidth:float | None):
+        self._connection = connection
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self._turn = False
+        self._next = {"send": 0.0, "recv": 0.0}
+
+    def __getattr__(self, name:str):
+        return getattr(self._connection, name)
+
+    def _throttle(self, direction:str, amount:int) -> None:
+        if not self._bandwidth or not amount:
+            return
+        now = time.monotonic()
+        self._next[direction] = max(now, self._next[direction]) + amount / self._bandwidth
+        if (delay := self._next[direction] - now) > 0:
+            time.sleep(delay)
+
+    def sendall(self, data) -> None:
+        if self._turn:
+            self._turn = False
+            time.sleep(self._latency)
+        self._throttle("send", len(data))
+        self._connection.sendall(data)
+
+    def recv(self, length:int) -> bytes:
+        data = self._connection.recv(length)
+        self._turn = True
+        self._throttle("recv", len(data))
+        return data
+
+    def recv_into(self, buffer, length:int=0) -> int:
+        amount = self._connection.recv_into(buffer, length)
+        self._turn = True
+        self._throttle("recv", amount)
+        return amount
+
+# Wraps the socket of a connection, to cut it once a number of bytes were received
+class _Reset_Connection:
+    def __init__(self, connection, remaining:int, on_reset):
+        self._connection = connection
+        self._remaining = remaining
+        self._on_reset = on_reset
+
+    def __getattr__(self, name:str):
+        return getattr(self._connection, name)
+
+    def _reset(self) -> None:
+        self._on_reset()
+        self._connection.shutdown(socket.SHUT_RDWR)
+        raise ConnectionResetError
+
+    def recv(self, length:int) -> bytes:
+        if self._remaining <= 0:
+            self._reset()
+        data = self._connection.recv(min(length, self._remaining))
+        self._remaining -= len(data)
+        return data
+
+    def recv_into(self, buffer, length:int=0) -> int:
+        if self._remaining <= 0:
+            self._reset()
+        view = memoryview(buffer)
+        amount = self._connection.recv_into(view[:min(length or len(view), self._remaining)])
+        self._remaining -= amount
+        return amount
+
+# A local stand-in for the SOL API, which speaks the same states as the real server.
+#   It is meant for testing and benchmarking the connector, not for production use.
+#   latency, bandwidth and error_rate make it act like a remote server on a worse network, for load tests.
+#   Parts of resumable uploads are kept in <directory>/.uploads until they are complete.
+class SOL_Server(BASE_SOL_Server):
+    def __init__(
+            self,
+            address:str="127.0.0.1",
+            port:int=0,
+            directory:str="temp_server",    # where received files are stored
+            handler=None,                   # handler(package_dict, files, credentials) -> reply dict
+            keep_alive:bool=True,
+            sessions:bool=True,
+            session_ttl:float=300,
+            idle_timeout:float=60,          # seconds a kept alive connection may wait for its next conversation
+            protocol:int=2,                 # the highest protocol spoken, when the client offers it
+            chunk_policy:SOL_ChunkPolicy=None,
+            latency:float=0.0,              # seconds added to every round trip
+            bandwidth:float=None,           # bytes per second in each direction, None for no limit
+            think_time:float=0.0,           # seconds spent on every reply, before it is sent
+            error_rate:float=0.0,           # chance of a conversation getting an injected error instead of a reply
+            errors:tuple=(INJECT_STOP, INJECT_DISCONNECT),
+            reset_window:int=4194304,       # an injected reset cuts the connection within this many bytes of files
+            info=None,                      # info(package_dict) -> list of INFO messages sent before the reply
+            downloads=None,                 # downloads(package_dict, files) -> list of paths or SOL_Files sent to the client
+            tree_hash:bool=True,            # takes tree hashed files, and tree hashes downloads for clients which do
+            seed:int=None
+    ):
+        self.address = address
+        self.port = port
+        self.directory = directory
+        if handler is not None:
+            self.handler = handler
+        self.keep_alive = keep_alive
+        self.sessions = sessions
+        self.session_ttl = session_ttl
+        self.idle_timeout = idle_timeout
+        self.protocol = protocol
+        self.chunk_policy = chunk_policy if chunk_policy is not None else SOL_ChunkPolicy.shared()
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.think_time = think_time
+        self.error_rate = error_rate
+        self.errors = tuple(errors)
+        if not 0 <= error_rate <= 1 or not self.errors or set(self.errors) - {INJECT_STOP, INJECT_DISCONNECT, INJECT_RESET}:
+            raise SOL_Error(4414, "Error injection was not defined as a rate between 0 and 1, with stop, disconnect and/or reset")
+        self.reset_window = reset_window
+        if info is not None:
+            self.info = info
+        if downloads is not None:
+            self.downloads = downloads
+        self.tree_hash = tree_hash
+        self._random = random.Random(seed)
+
+        self._private_key, self._public_key = pp_generate_keys()
+        self._public_key_exported = self._public_key.exportKey().decode("utf_8")
+        self._sessions = {}             # session_id -> (client public key, expires)
+        self._connections = set()
+        self._lock = threading.Lock()
+        self._socket = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+        self.stats = collections.Counter()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Listening -
+    # ------------------------------------------------------------------------------------------------------------------
+    def start(self) -> "SOL_Server":
+        os.makedirs(self.directory, exist_ok=True)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.address, self.port))
+        self._socket.listen(1024)
+        self._socket.settimeout(0.2) # so the accept loop notices a stop
+        self.port = self._socket.getsockname()[1]
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._serve, name="SOL_Server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._socket.close()
+        with self._lock:
+            for connection in self._connections:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def _count(self, name:str, amount:int=1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    def _serve(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                connection, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._handle_connection, args=(connection,), daemon=True).start()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Sessions -
+    # ------------------------------------------------------------------------------------------------------------------
+    def _session_new(self, client_public_key:RsaKey) -> str:
+        session_id = secrets.token_hex(16)
+        with self._lock:
+            self._sessions[session_id] = (client_public_key, time.monotonic() + self.session_ttl)
+        return session_id
+
+    def _session_get(self, session_id:str) -> RsaKey | None:
+        with self._lock:
+            client_public_key, expires = self._sessions.get(session_id, (None, 0))
+            if expires < time.monotonic():
+                self._sessions.pop(session_id, None)
+                return None
+            return client_public_key
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Conversations -
+    # ------------------------------------------------------------------------------------------------------------------
+    def _handle_connection(self, connection:socket.socket) -> None:
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self._connections.add(connection)
+        self._count("connections")
+        if self.latency or self.bandwidth:
+            ph = PH(_Shaped_Connection(connection, self.latency, self.bandwidth), chunk_policy=self.chunk_policy)
+        else:
+            ph = PH(connection, chunk_policy=self.chunk_policy)
+        try:
+            with connection:
+                client_public_key = None
+                while self._conversation(ph, client_public_key):
+                    # a kept alive connection waits for the client to start the next conversation
+                    connection.settimeout(self.idle_timeout)
+                    match ph.wait_for_state_undefined():
+                        case "CONV_NEW":
+                            client_public_key = None
+                        case "CONV_RESUME":
+                            client_public_key = self._session_get(ph._recv_exact(32).decode("utf_8"))
+                        case _:
+                            return
+                    connection.settimeout(None)
+        except (OSError, SOL_Error, STOP_Error):
+            self._count("errors")
+        finally:
+            with self._lock:
+                self._connections.discard(connection)
+
+    def _conversation(self, ph:PH, client_public_key:RsaKey | None) -> bool:
+        # a resumed session skips the SOL_KEY exchange
+        resumed = client_public_key is not None
+        ph.round_trips = 0
+        if not resumed:
+            ph.send_state("SOL_KEY")
+            ph.package_output_plain("SOL_KEY", {"key": self._public_key_exported})
+
+        ph.send_state("CONV_DATA")
+        conv_data = ph.package_input("CONV_DATA", self._private_key)
+        if not resumed:
+            client_public_key = pp_import_key(conv_data["key"])
+
+        # from here on both sides speak the highest protocol they share, the client notices the first frame
+        ph.protocol = min(self.protocol, conv_data.get("proto", 1))
+
+        # files compressed with a codec this server doesn't have can't be checked, so they are refused up front
+        if unavailable := sorted(set(conv_data.get("codecs", [])) - set(available_codecs())):
+            ph.send_state("STOP")
+            ph.package_output_encrypted("STOP", {"error": 4412, "codecs": unavailable}, client_public_key)
+            ph.protocol = 1
+            return False
+
+        # tree hashed files are refused up front by a server which doesn't take them
+        if conv_data.get("tree") and conv_data["files"] and not self.tree_hash:
+            ph.send_state("STOP")
+            ph.package_output_encrypted("STOP", {"error": 4418, "message": "Tree hashes are not accepted"}, client_public_key)
+            ph.protocol = 1
+            return False
+
+        # protocol 2 packages are in the format the client chose, and so are the packages answering them
+        format = conv_data.get("fmt", FORMAT_JSON) if ph.protocol >= 2 else FORMAT_JSON
+        if format not in available_formats():
+            ph.send_state("STOP")
+            ph.package_output_encrypted("STOP", {"error": 4415, "formats": available_formats()}, client_public_key)
+            ph.protocol = 1
+            return False
+        ph.serializer = serializer_for(format)
+
+        ph.send_state("COMMANDS")
+        package_dict = ph.package_input("COMMANDS", self._private_key)
+
+        connection = ph.connection
+        if self.error_rate and self._random.random() < self.error_rate:
+            error = self._random.choice(self.errors)
+            # a reset waits for the files to be underway, a conversation without files is cut right away
+            if error != INJECT_RESET or not conv_data["files"]:
+                return self._inject_error(ph, client_public_key, error)
+            ph.connection = _Reset_Connection(
+                connection,
+                self._random.randint(1, self.reset_window),
+                lambda: self._count("injected_reset")
+            )
+
+        # files and credentials, in the order the client sends them
+        files = {}
+        credentials = None
+        if conv_data["files"] or conv_data["cred"]:
+            ph.send_state("ADDITIONAL")
+            remaining = conv_data["files"] + (1 if conv_data["cred"] else 0)
+            while remaining > 0:
+                match ph.wait_for_state_multiple(["FILE", "FILES", "UPLOAD", "CREDENTIALS"]):
+                    case "FILE":
+                        ph.send_state("FILE")
+                        file_path = ph.file_package_input("FILE", self._private_key, self.directory)
+                        files[os.path.basename(file_path)] = file_path
+                        remaining -= 1
+                    case "UPLOAD":
+                        # a resumable file, which continues where an earlier attempt was cut off
+                        ph.send_state("UPLOAD")
+                        file_path = ph.file_package_input_resumable("UPLOAD", self._private_key, self.directory)
+                        files[os.path.basename(file_path)] = file_path
+                        remaining -= 1
+                    case "FILES":
+                        # several files at once, multiplexed over protocol 2
+                        ph.send_state("FILES")
+                        for file_path in ph.file_package_input_multiple("FILES", self._private_key, self.directory):
+                            files[os.path.basename(file_path)] = file_path
+                            remaining -= 1
+                    case "CREDENTIALS":
+                        ph.send_state("CREDENTIALS")
+                        credentials = ph.package_input("CREDENTIALS", self._private_key)
+                        remaining -= 1
+        ph.connection = connection
+
+        for info_dict in self.info(package_dict):
+            ph.send_state("INFO")
+            ph.package_output_encrypted("INFO", info_dict, client_public_key)
+            self._count("info")
+
+        # files for the client, when it said how many it takes at once
+        if (download_workers := conv_data.get("dl", 0)) and (download_files := self.downloads(package_dict, files)):
+            tree_hash = conv_data.get("tree") if self.tree_hash and valid_leaf_size(conv_data.get("tree")) else None
+            self._send_downloads(ph, download_files, client_public_key, download_workers, tree_hash)
+
+        if self.think_time:
+            time.sleep(self.think_time)
+        ph.send_state("REPLY")
+        ph.package_output_encrypted("REPLY", self.handler(package_dict, files, credentials), client_public_key)
+
+        # agree on a session, which the client can continue on a kept alive connection
+        if self.sessions and conv_data.get("session") and not resumed:
+            ph.send_state("SESSION")
+            ph.package_output_encrypted(
+                "SESSION",
+                {"session_id": self._session_new(client_public_key), "ttl": self.session_ttl},
+                client_public_key
+            )
+
+        self._count("conversations")
+        self._count("resumed", resumed)
+        self._count("files", len(files))
+
+        keep_alive = self.keep_alive and conv_data.get("keep_alive", False)
+        ph.send_state("END_KEEP" if keep_alive else "END")
+
+        # the next conversation starts in protocol 1 again
+        ph.protocol = 1
+        self._count("round_trips", ph.round_trips)
+        return keep_alive
+
+    def _inject_error(self, ph:PH, client_public_key:RsaKey, error:str) -> bool:
+        self._count(f"injected_{error}")
+        match error:
+            case "stop":
+                ph.send_state("STOP")
+                ph.package_output_encrypted("STOP", {"error": 5500, "message": "Injected error"}, client_public_key)
+            case "disconnect" | "reset":
+                ph.connection.shutdown(socket.SHUT_RDWR)
+        ph.protocol = 1
+        return False
+
+    def _send_downloads(self, ph:PH, download_files:list, client_public_key:RsaKey, workers:int, tree_hash:int=None) -> None:
+        # downloads are streamed, so they need no temp files here, and keep the name of their file.
+        #   A client which tree hashes its files gets its downloads tree hashed with the same leaf size.
+        file_objects = []
+        for download_file in download_files:
+            file_object = download_file if isinstance(download_file, SOL_File) else SOL_File(download_file)
+            file_object.filename_transmission = file_object.filename or file_object.filename_transmission
+            file_object.chunk_policy = self.chunk_policy
+            file_object.tree_hash = tree_hash
+            file_objects.append(file_object)
+
+        # several at once, multiplexed over protocol 2
+        if ph.protocol >= 2 and workers > 1 and len(file_objects) > 1:
+            ph.send_state("DOWNLOADS")
+            ph.file_package_output_multiple(
+                "DOWNLOADS", file_objects, client_public_key, workers=min(workers, len(file_objects)), stream=True
+            )
+        else:
+            for file_object in file_objects:
+                ph.send_state("DOWNLOAD")
+                ph.file_package_output_stream("DOWNLOAD", file_object, client_public_key)
+        self._count("downloads", len(file_objects))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # - Reply -
+    # ------------------------------------------------------------------------------------------------------------------
+    def info(self, package_dict:dict) -> list[dict]:
+        # no progress messages by default
+        return []
+
+    def downloads(self, package_dict:dict, files:dict) -> list:
+        # no files for the client by default
+        return []
+
+    def handler(self, package_dict:dict, files:dict, credentials:dict | None) -> dict:
+        # answers with what arrived, so a client can check it
+        return {
+            "commands": package_dict["commands"],
+            "files": sorted(files),
+            "credentials": credentials is not None,
+        }
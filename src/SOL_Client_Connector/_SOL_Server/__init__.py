@@ -0,0 +1 @@
+from .SOL_Server import SOL_Server
\ No newline at end of file
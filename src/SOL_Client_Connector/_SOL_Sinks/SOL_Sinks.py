@@ -0,0 +1,167 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import os
+from typing import Any, Callable
+
+# Custom Packages
+from .._Base_Classes import BASE_SOL_Sink, SOL_Error
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Code -
+# ----------------------------------------------------------------------------------------------------------------------
+# Receives a downloaded file while it is decrypted, decompressed and hashed, in pieces of a bounded size.
+#   finish() is only called once the hash was correct, and returns the result of the download.
+#   discard() is called instead when the download failed.
+class SOL_Sink(BASE_SOL_Sink):
+    def finish(self) -> Any:
+        return None
+
+    def discard(self) -> None:
+        pass
+
+# Writes the file under a .part name, which is only renamed to the path once the hash is correct
+class SOL_FileSink(SOL_Sink):
+    def __init__(self, path:str | os.PathLike):
+        self.path = os.fspath(path)
+        self._file = None
+
+    def write(self, data:bytes) -> None:
+        if self._file is None:
+            self._file = open(f"{self.path}.part", "wb")
+        self._file.write(data)
+
+    def finish(self) -> str:
+        if self._file is None:
+            self._file = open(f"{self.path}.part", "wb") # an empty file
+        self._file.close()
+        os.replace(f"{self.path}.part", self.path)
+        return self.path
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if os.path.exists(f"{self.path}.part"):
+            os.remove(f"{self.path}.part")
+
+# Writes into a binary file the caller opened, which stays open.
+#   A failed download is truncated away again, when the file can seek.
+class SOL_StreamSink(SOL_Sink):
+    def __init__(self, file):
+        self.file = file
+        try:
+            self._start = file.tell()
+        except (OSError, AttributeError):
+            self._start = None
+
+    def write(self, data:bytes) -> None:
+        self.file.write(data)
+
+    def finish(self):
+        return self.file
+
+    def discard(self) -> None:
+        if self._start is not None:
+            try:
+                self.file.seek(self._start)
+                self.file.truncate()
+            except OSError:
+                pass
+
+# Keeps the file in memory, in the given bytearray or a new one.
+#   max_size guards against a file that is larger than expected.
+class SOL_MemorySink(SOL_Sink):
+    def __init__(self, buffer:bytearray=None, max_size:int=None):
+        self.buffer = buffer if buffer is not None else bytearray()
+        self.max_size = max_size
+        self._start = len(self.buffer)
+
+    def write(self, data:bytes) -> None:
+        if self.max_size is not None and len(self.buffer) - self._start + len(data) > self.max_size:
+            raise SOL_Error(4417, "Download was larger than the max size of its memory sink")
+        self.buffer += data
+
+    def finish(self) -> bytearray:
+        return self.buffer
+
+    def discard(self) -> None:
+        del self.buffer[self._start:]
+
+# Hands every piece to callback(data), and calls on_finish() once the hash was correct
+class SOL_CallbackSink(SOL_Sink):
+    def __init__(self, callback:Callable[[bytes], Any], on_finish:Callable[[], Any]=None):
+        self.callback = callback
+        self.on_finish = on_finish
+
+    def write(self, data:bytes) -> None:
+        self.callback(data)
+
+    def finish(self) -> Any:
+        return self.on_finish() if self.on_finish is not None else None
+
+def sink_for(target) -> SOL_Sink:
+    # a file path, an open binary file, a bytearray, a callable receiving every piece, or a SOL_Sink
+    match target:
+        case SOL_Sink():
+            return target
+        case str() | os.PathLike():
+            return SOL_FileSink(target)
+        case bytearray():
+            return SOL_MemorySink(target)
+        case _ if hasattr(target, "write"):
+            return SOL_StreamSink(target)
+        case _ if callable(target):
+            return SOL_CallbackSink(target)
+    raise SOL_Error(4416, "Download target was not defined as a path, binary file, bytearray, callable or SOL_Sink")
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Downloads of a send -
+# ----------------------------------------------------------------------------------------------------------------------
+# Keeps the result of a sink under the name of its file, once it finished
+class _Result_Sink(SOL_Sink):
+    def __init__(self, sink:SOL_Sink, name:str, results:dict):
+        self.sink = sink
+        self.name = name
+        self.results = results
+
+    def write(self, data:bytes) -> None:
+        self.sink.write(data)
+
+    def finish(self) -> Any:
+        self.results[self.name] = result = self.sink.finish()
+        return result
+
+    def discard(self) -> None:
+        self.sink.discard()
+
+# Picks the sink of every file the server sends, from the downloads given to send:
+#   a directory, where every file is stored under the name the server gave it,
+#   a dict of the name the server gives a file to its target,
+#   or a callable downloads(name, length) returning the target, where length is None for streamed files.
+class SOL_Downloads:
+    def __init__(self, downloads):
+        if not isinstance(downloads, (str, os.PathLike, dict)) and not callable(downloads):
+            raise SOL_Error(4416, "Downloads were not defined as a directory, a dict of targets or a callable")
+        self.downloads = downloads
+        self.results = {}   # the result of every finished download, by name
+
+    def __call__(self, name:str, length:int | None) -> SOL_Sink:
+        return _Result_Sink(self.sink(name, length), name, self.results)
+
+    def sink(self, name:str, length:int | None) -> SOL_Sink:
+        # the name comes from the server, so it is never allowed to leave the directory
+        if name != os.path.basename(name) or name in ("", ".", ".."):
+            raise SOL_Error(5401, "Download name was not a plain file name")
+        match self.downloads:
+            case str() | os.PathLike():
+                os.makedirs(self.downloads, exist_ok=True)
+                return SOL_FileSink(os.path.join(self.downloads, name))
+            case dict():
+                if name not in self.downloads:
+                    raise SOL_Error(4416, f"Download '{name}' has no target")
+                return sink_for(self.downloads[name])
+        return sink_for(self.downloads(name, length))
+
+    def reset(self) -> None:
+        self.results.clear()
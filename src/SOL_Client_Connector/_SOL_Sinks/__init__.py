@@ -0,0 +1,9 @@
+from .SOL_Sinks import (
+    SOL_Sink,
+    SOL_FileSink,
+    SOL_StreamSink,
+    SOL_MemorySink,
+    SOL_CallbackSink,
+    SOL_Downloads,
+    sink_for
+)
\ No newline at end of file
@@ -1,14 +1,39 @@
 # The Error
 from ._Base_Classes import SOL_Error
 
-# The Connector class
-from ._SOL_Connector import SOL_Connector
+# The Connector classes
+from ._SOL_Connector import SOL_Connector, AsyncSOL_Connector
 
 # The Data Package class
 from ._SOL_Package import SOL_Package
 
-# The File object class
-from ._SOL_File import SOL_File
+# The File object classes, of files on disk and of data in memory or streams,
+#   the cache of compressed files, and the checkpoints of resumable uploads
+from ._SOL_File import SOL_File, SOL_DataFile, SOL_FileCache, SOL_UploadCheckpoints
+
+# Where the files the server sends along with its reply are streamed to
+from ._SOL_Sinks import SOL_Sink, SOL_FileSink, SOL_StreamSink, SOL_MemorySink, SOL_CallbackSink
+
+# The policy for the size of the chunks files are read, compressed, encrypted and sent in
+from ._SOL_Chunking import SOL_ChunkPolicy
+
+# Tree hashes of files, in leaves hashed on every core, and which leaves of a file changed
+from ._SOL_Hashing import SOL_TreeHash, TREE_LEAF_SIZE, changed_leaves
+
+# Timings of every phase of a send, and an aggregator of their percentiles
+from ._SOL_Metrics import SOL_Metrics, SOL_Observer, SOL_Span
+
+# Throttled progress events of files and packages, handed to a callback or put in a queue
+from ._SOL_Progress import SOL_Progress, SOL_ProgressQueue, SOL_ProgressEvent
+
+# Compression codecs, which can be chosen per file
+from ._SOL_Codecs import SOL_Codec, register_codec, available_codecs
+
+# Serializers of the packages, json by default and faster ones like orjson or msgpack when they are installed
+from ._SOL_Serializers import SOL_Serializer, register_serializer, available_serializers
 
 # Credentials
-from ._SOL_Credentials import SOL_Credentials
\ No newline at end of file
+from ._SOL_Credentials import SOL_Credentials
+
+# Background key pair generation and the cache of server keys and sessions
+from .SOL_Encryption import SOL_KeyPool, SOL_KeyCache
\ No newline at end of file
@@ -0,0 +1,69 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import hashlib
+import os
+import socket
+import sys
+
+import pytest
+
+# Custom Packages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from SOL_Client_Connector._SOL_PackageHandlers import PackageHandler_Full
+from SOL_Client_Connector._SOL_Server import SOL_Server
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Fixtures -
+# ----------------------------------------------------------------------------------------------------------------------
+API_KEY = "a" * 128
+
+class Recording_Server(SOL_Server):
+    # keeps the sha256 of every file it received, by the name it was sent under
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received = {}
+
+    def handler(self, package_dict:dict, files:dict, credentials:dict | None) -> dict:
+        for name, path in files.items():
+            with open(path, "rb") as file:
+                self.received[name] = hashlib.sha256(file.read()).hexdigest()
+        return super().handler(package_dict, files, credentials)
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # SOL_File keeps its temp files in ./temp
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("temp")
+    return tmp_path
+
+@pytest.fixture
+def make_file(workdir):
+    # half random, half zeros, so compression has real work to do
+    def make_file(name:str, size:int) -> tuple[str, str]:
+        data = os.urandom(size // 2) + bytes(size - size // 2)
+        path = os.path.join(workdir, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        return path, hashlib.sha256(data).hexdigest()
+    return make_file
+
+@pytest.fixture
+def handlers():
+    # the package handlers of both ends of a connection
+    sender_socket, receiver_socket = socket.socketpair()
+    yield PackageHandler_Full(sender_socket), PackageHandler_Full(receiver_socket)
+    sender_socket.close()
+    receiver_socket.close()
+
+@pytest.fixture
+def unused_port() -> int:
+    # a port nothing listens on
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        return listener.getsockname()[1]
+
+@pytest.fixture
+def server(workdir):
+    with Recording_Server(directory=os.path.join(workdir, "server")) as server:
+        yield server
@@ -0,0 +1,68 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import asyncio
+import hashlib
+import os
+import socket
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import AsyncSOL_Connector, SOL_Package, SOL_File, SOL_Error
+from SOL_Client_Connector._SOL_PackageHandlers import AsyncPackageHandler_Full
+from SOL_Client_Connector.SOL_Encryption import pp_generate_keys
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Helpers -
+# ----------------------------------------------------------------------------------------------------------------------
+def exchange(send, receive):
+    # runs send(handler) and receive(handler) on both ends of a connection, and returns what receive returned
+    async def main():
+        sender_socket, receiver_socket = socket.socketpair()
+        sender_reader, sender_writer = await asyncio.open_connection(sock=sender_socket)
+        receiver_reader, receiver_writer = await asyncio.open_connection(sock=receiver_socket)
+        try:
+            _, received = await asyncio.gather(
+                send(AsyncPackageHandler_Full(sender_reader, sender_writer)),
+                receive(AsyncPackageHandler_Full(receiver_reader, receiver_writer))
+            )
+        finally:
+            sender_writer.close()
+            receiver_writer.close()
+        return received
+    return asyncio.run(main())
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Async package handler -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_encrypted_package_round_trip():
+    private_key, public_key = pp_generate_keys()
+    package_dict = {"commands": [{"ping": None}, {"echo": "a" * 20000}]}
+    received = exchange(
+        lambda ph: ph.package_output_encrypted("COMMANDS", package_dict, public_key),
+        lambda ph: ph.package_input("COMMANDS", private_key)
+    )
+    assert received == package_dict
+
+def test_streamed_file_round_trip(make_file):
+    path, hash_value = make_file("file.bin", 500000)
+    file_object = SOL_File(path)
+    private_key, public_key = pp_generate_keys()
+    exchange(
+        lambda ph: ph.file_package_output_stream("FILE", file_object, public_key),
+        lambda ph: ph.file_package_input("FILE", private_key)
+    )
+    with open(os.path.join("temp", file_object.filename_transmission), "rb") as file:
+        assert hashlib.sha256(file.read()).hexdigest() == hash_value
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Connector -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_connect_failure_is_a_sol_error(unused_port):
+    package = SOL_Package("a" * 128)
+    package.command_add({"ping": None})
+    with pytest.raises(SOL_Error) as error:
+        asyncio.run(AsyncSOL_Connector("127.0.0.1", unused_port).send(package))
+    assert error.value.args[0] == 4403
@@ -0,0 +1,50 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import os
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Probing -
+# ----------------------------------------------------------------------------------------------------------------------
+def write(name:str, data:bytes) -> str:
+    with open(name, "wb") as file:
+        file.write(data)
+    return name
+
+def test_random_data_is_stored():
+    file_object = SOL_File(write("random.bin", os.urandom(500000)), compression="auto")
+    decision = file_object.probe_compression()
+    assert decision["choice"] == "store"
+    assert decision["entropy"] > 7.9
+    assert (file_object.codec, decision["sampled"]) == ("store", 4 * 65536)
+
+def test_repetitive_data_is_compressed_on_a_slow_upload():
+    file_object = SOL_File(write("zeros.bin", bytes(500000)), compression="auto", codec="zlib")
+    decision = file_object.probe_compression(upload_throughput=100000)
+    assert decision["choice"] in ("fast", "strong")
+    assert file_object.codec == "zlib"
+    assert file_object.compression_level == (1 if decision["choice"] == "fast" else 9)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("streaming", [False, True])
+def test_auto_compressed_files_arrive(server, make_file, streaming):
+    files = [make_file("mixed.bin", 1000000), make_file("small.bin", 100)]
+    file_objects = [SOL_File(path, compression="auto") for path, _ in files]
+    with SOL_Connector("127.0.0.1", server.port, streaming=streaming) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None}, *({"file": file_object} for file_object in file_objects))
+        connector.send(package)
+        # only staged uploads of more than 256kb measure the throughput
+        assert (connector.upload_throughput is None) == streaming
+    for file_object, (_, hash_value) in zip(file_objects, files):
+        assert file_object.compression_decision is not None
+        assert server.received[file_object.filename_transmission] == hash_value
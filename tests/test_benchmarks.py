@@ -0,0 +1,40 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import json
+import os
+import subprocess
+import sys
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Hot path suite -
+# ----------------------------------------------------------------------------------------------------------------------
+BENCH_HOT_PATHS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "bench_hot_paths.py")
+
+def run(*args:str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, BENCH_HOT_PATHS, "--quick", "--repeats", "1", "--filter", "package_socket", *args],
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+
+def test_slower_medians_are_flagged(workdir):
+    # the package round trips of both protocols, over a socket pair
+    assert run("--baseline", "baseline.json", "--save-baseline").returncode == 0
+    with open("baseline.json", "r") as file:
+        baseline = json.load(file)
+    assert len(baseline["results"]) == 4
+    assert all(result["median_s"] > 0 for result in baseline["results"].values())
+
+    # a baseline a thousand times faster than this machine
+    name = next(iter(baseline["results"]))
+    baseline["results"][name]["median_s"] /= 1000
+    with open("baseline.json", "w") as file:
+        json.dump(baseline, file)
+    completed = run("--baseline", "baseline.json", "--output", "results.json", "--threshold", "100")
+    with open("results.json", "r") as file:
+        results = json.load(file)
+    assert completed.returncode == 1
+    assert results["regressions"] == [name]
@@ -0,0 +1,51 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Error, SOL_ChunkPolicy
+from SOL_Client_Connector._SOL_Chunking.SOL_ChunkPolicy import CHUNK_COMPRESS, CHUNK_SEND
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Sizes -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("min_size, max_size", [(0, 1024), (4096, 1024), (-1, 1024)])
+def test_invalid_bounds_are_refused(min_size, max_size):
+    with pytest.raises(SOL_Error) as error:
+        SOL_ChunkPolicy(min_size, max_size)
+    assert error.value.args[0] == 4413
+
+def test_sizes_stay_within_bounds():
+    policy = SOL_ChunkPolicy(min_size=16384, max_size=1048576, target_seconds=0.01)
+    # a 64th of the object, until its purpose was measured
+    assert policy.size(64 * 100000, CHUNK_COMPRESS) == 98304
+    assert policy.size(1000, CHUNK_COMPRESS) == 1000
+    assert policy.size(10 ** 12, CHUNK_COMPRESS) == 1048576
+    # socket chunks are never smaller than the socket buffer
+    assert policy.size(64 * 20000, CHUNK_SEND, socket_buffer=204800) == 204800
+
+    policy.record(CHUNK_COMPRESS, 5000000, 1.0)
+    assert policy.size(10 ** 9, CHUNK_COMPRESS) == 49152
+    assert policy.size(10 ** 9, CHUNK_SEND) == 1048576
+    for size in (policy.size(object_size, CHUNK_COMPRESS) for object_size in (10 ** 5, 10 ** 7, 10 ** 9)):
+        assert size % 4096 == 0 and 16384 <= size <= 1048576
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("size", [1048576, 10485760])
+def test_files_at_the_old_table_edges_arrive(server, make_file, size, streaming):
+    # the old table had no buffer size for exactly 1mb and 10mb
+    path, hash_value = make_file("file.bin", size)
+    chunk_policy = SOL_ChunkPolicy()
+    file_object = SOL_File(path, compression=1)
+    with SOL_Connector("127.0.0.1", server.port, streaming=streaming, chunk_policy=chunk_policy) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None}, {"file": file_object})
+        connector.send(package)
+    assert server.received[file_object.filename_transmission] == hash_value
+    assert CHUNK_COMPRESS in chunk_policy.throughput()
@@ -0,0 +1,32 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Error, available_codecs
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("codec", available_codecs())
+def test_codec_round_trip(server, make_file, codec, streaming):
+    path, hash_value = make_file("file.bin", 300000)
+    file_object = SOL_File(path, codec=codec)
+    with SOL_Connector("127.0.0.1", server.port, streaming=streaming) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None}, {"file": file_object})
+        connector.send(package)
+    assert file_object.hash_value == hash_value
+    assert server.received[file_object.filename_transmission] == hash_value
+
+def test_already_compressed_files_are_stored(make_file):
+    assert SOL_File(make_file("file.bin", 1000)[0], already_compressed=True).codec == "store"
+
+def test_unknown_codec_is_refused(make_file):
+    with pytest.raises(SOL_Error) as error:
+        SOL_File(make_file("file.bin", 1000)[0], codec="unknown")
+    assert error.value.args[0] == 4412
@@ -0,0 +1,78 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Credentials, SOL_Error, available_serializers
+from SOL_Client_Connector._SOL_Package.SOL_Commands import SOL_Commands
+from SOL_Client_Connector._SOL_Serializers import serializer_for, FORMAT_JSON
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Building -
+# ----------------------------------------------------------------------------------------------------------------------
+def commands(count:int) -> list[dict]:
+    return [{f"command_{i}": {"id": i, "tags": ["a", "b"], "nested": {"value": i / 2}}} for i in range(count)]
+
+@pytest.mark.parametrize("at_once", [False, True])
+def test_encoded_commands_match_the_list(at_once):
+    builder = SOL_Commands()
+    if at_once:
+        builder.add(*commands(100))
+    else:
+        for command in commands(100):
+            builder.add(command)
+    serializer = serializer_for(FORMAT_JSON)
+    assert serializer.loads(builder.encode(serializer)) == {"commands": commands(100)}
+    assert len(builder) == 100
+
+def test_files_and_credentials_are_found(make_file):
+    file_object = SOL_File(make_file("file.bin", 1000)[0])
+    credentials = SOL_Credentials("user", "password")
+    builder = SOL_Commands()
+    builder.add({"ping": None}, {"upload": {"files": [file_object], "login": credentials}})
+    builder.add({"again": (credentials,)})
+    assert builder.file_list == [file_object]
+    assert builder.credentials is credentials
+
+def test_single_command_is_encoded_once(monkeypatch, make_file):
+    encoded = []
+    _encode = SOL_Commands._encode
+    def counting(obj, found):
+        encoded.append(obj)
+        return _encode(obj, found)
+    monkeypatch.setattr(SOL_Commands, "_encode", staticmethod(counting))
+    builder = SOL_Commands()
+    builder.add({"file": SOL_File(make_file("file.bin", 1000)[0])})
+    assert len(encoded) == 1
+
+def test_refused_commands_change_nothing():
+    builder = SOL_Commands()
+    builder.add({"login": SOL_Credentials("user", "password")})
+    with pytest.raises(SOL_Error) as error:
+        builder.add({"ping": None}, {"login": SOL_Credentials("other", "password")})
+    assert error.value.args[0] == 4407
+    assert len(builder) == 1
+    for refused in ({"a": 1, "b": 2}, {"a": object()}):
+        with pytest.raises(SOL_Error) as error:
+            builder.add(refused)
+        assert error.value.args[0] == 4406
+    assert len(builder) == 1
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("serializer", available_serializers())
+def test_commands_added_one_by_one_arrive(server, make_file, serializer):
+    path, hash_value = make_file("file.bin", 100000)
+    file_object = SOL_File(path)
+    with SOL_Connector("127.0.0.1", server.port, serializer=serializer) as connector:
+        package = SOL_Package(API_KEY)
+        for command in commands(500):
+            package.command_add(command)
+        package.command_add({"file": file_object}, {"login": SOL_Credentials("user", "password")})
+        reply = connector.send(package)
+    assert reply["commands"][:500] == commands(500)
+    assert server.received[file_object.filename_transmission] == hash_value
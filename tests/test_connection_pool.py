@@ -0,0 +1,66 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import socket
+import time
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_Error
+from SOL_Client_Connector._SOL_Connector.SOL_ConnectionPool import SOL_ConnectionPool
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Fixtures -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.fixture
+def listener():
+    listener = socket.create_server(("127.0.0.1", 0))
+    yield listener
+    listener.close()
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Pool -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_released_connection_is_reused(listener):
+    pool = SOL_ConnectionPool("127.0.0.1", listener.getsockname()[1])
+    connection, reused = pool.acquire()
+    assert not reused
+    pool.release(connection)
+    assert pool.acquire() == (connection, True)
+    assert pool.stats() == {"hits": 1, "misses": 1, "evictions": 0, "idle": 0}
+    pool.discard(connection)
+
+def test_connection_closed_by_the_server_is_evicted(listener):
+    pool = SOL_ConnectionPool("127.0.0.1", listener.getsockname()[1])
+    connection, _ = pool.acquire()
+    pool.release(connection)
+    listener.accept()[0].close()
+    time.sleep(0.05)
+    new_connection, reused = pool.acquire()
+    assert not reused and new_connection is not connection
+    assert pool.stats()["evictions"] == 1
+    pool.discard(new_connection)
+
+def test_idle_connections_expire_and_fill_the_pool_up_to_its_size(listener):
+    pool = SOL_ConnectionPool("127.0.0.1", listener.getsockname()[1], size=1, idle_timeout=0.05)
+    connections = [pool.acquire()[0] for _ in range(2)]
+    for connection in connections:
+        pool.release(connection)
+    assert pool.stats()["idle"] == 1
+    time.sleep(0.1)
+    assert not pool.acquire()[1]
+    assert pool.stats()["evictions"] == 1
+    pool.close()
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Connector -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_connect_failure_is_a_sol_error(unused_port):
+    with SOL_Connector("127.0.0.1", unused_port) as connector:
+        package = SOL_Package("a" * 128)
+        package.command_add({"ping": None})
+        with pytest.raises(SOL_Error) as error:
+            connector.send(package)
+    assert error.value.args[0] == 4403
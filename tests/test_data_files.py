@@ -0,0 +1,102 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import (
+    SOL_Connector, AsyncSOL_Connector, SOL_Package, SOL_DataFile, SOL_Error, SOL_UploadCheckpoints
+)
+from conftest import API_KEY
+
+DATA = os.urandom(150000) + bytes(250000)
+HASH_VALUE = hashlib.sha256(DATA).hexdigest()
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Helpers -
+# ----------------------------------------------------------------------------------------------------------------------
+def sources() -> dict:
+    # the same data, from every kind of source
+    return {
+        "bytes": lambda: DATA,
+        "bytearray": lambda: bytearray(DATA),
+        "memoryview": lambda: memoryview(DATA),
+        "stream": lambda: io.BytesIO(DATA),
+        "iterable": lambda: (DATA[i:i + 30000] for i in range(0, len(DATA), 30000)),
+    }
+
+def send(connector, *file_objects:SOL_DataFile) -> dict:
+    package = SOL_Package(API_KEY)
+    package.command_add({"ping": None}, *({"file": file_object} for file_object in file_objects))
+    return connector.send(package)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("source", sources())
+@pytest.mark.parametrize("protocol", [1, 2])
+def test_data_files_arrive(server, source, protocol):
+    file_object = SOL_DataFile(sources()[source](), name="data.bin")
+    with SOL_Connector("127.0.0.1", server.port, protocol=protocol) as connector:
+        reply = send(connector, file_object)
+    assert reply["commands"][0] == {"ping": None}
+    assert server.received[file_object.filename_transmission] == HASH_VALUE
+    # nothing was staged on disk
+    assert os.listdir("temp") == []
+
+def test_data_files_arrive_in_parallel(server):
+    file_objects = [SOL_DataFile(source(), compression="auto") for source in sources().values()]
+    with SOL_Connector("127.0.0.1", server.port, parallel_files=3) as connector:
+        send(connector, *file_objects)
+    for file_object in file_objects:
+        assert server.received[file_object.filename_transmission] == HASH_VALUE
+
+def test_async_data_files_arrive(server):
+    file_object = SOL_DataFile(io.BytesIO(DATA))
+    package = SOL_Package(API_KEY)
+    package.command_add({"file": file_object})
+    asyncio.run(AsyncSOL_Connector("127.0.0.1", server.port).send(package))
+    assert server.received[file_object.filename_transmission] == HASH_VALUE
+
+def test_data_files_with_checkpoints_arrive(server, workdir):
+    # data which isn't on disk can't resume, so it is sent as a plain file
+    checkpoints = SOL_UploadCheckpoints(os.path.join(workdir, "checkpoints"))
+    file_objects = [SOL_DataFile(DATA), SOL_DataFile(io.BytesIO(DATA))]
+    with SOL_Connector("127.0.0.1", server.port, checkpoints=checkpoints) as connector:
+        send(connector, *file_objects)
+    for file_object in file_objects:
+        assert server.received[file_object.filename_transmission] == HASH_VALUE
+    assert checkpoints.pending() == []
+
+def test_buffers_can_be_sent_again(server):
+    file_object = SOL_DataFile(DATA)
+    with SOL_Connector("127.0.0.1", server.port) as connector:
+        for _ in range(2):
+            send(connector, file_object)
+    assert server.received[file_object.filename_transmission] == HASH_VALUE
+
+def test_streams_can_only_be_sent_once(server):
+    file_object = SOL_DataFile(io.BytesIO(DATA))
+    with SOL_Connector("127.0.0.1", server.port) as connector:
+        send(connector, file_object)
+        with pytest.raises(SOL_Error) as error:
+            send(connector, file_object)
+    assert error.value.args[0] == 4406
+
+def test_empty_data_arrives(server):
+    file_object = SOL_DataFile(b"", compression="auto")
+    with SOL_Connector("127.0.0.1", server.port) as connector:
+        send(connector, file_object)
+    assert server.received[file_object.filename_transmission] == hashlib.sha256(b"").hexdigest()
+
+@pytest.mark.parametrize("data", ["text", 12])
+def test_data_of_an_unknown_kind_is_refused(data):
+    with pytest.raises(SOL_Error) as error:
+        SOL_DataFile(data)
+    assert error.value.args[0] == 4406
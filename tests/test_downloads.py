@@ -0,0 +1,151 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import hashlib
+import io
+import json
+import os
+import threading
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Error, SOL_MemorySink, SOL_FileSink
+from SOL_Client_Connector._SOL_Sinks.SOL_Sinks import SOL_Downloads
+from SOL_Client_Connector.SOL_Encryption import pp_generate_keys
+from SOL_Client_Connector._SOL_PackageHandlers.PackageHandler_Base import FRAME_PACKAGE, FRAME_CHUNK, _PARAMS_LENGTH
+from conftest import API_KEY, Recording_Server
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Helpers -
+# ----------------------------------------------------------------------------------------------------------------------
+def sha256(data:bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def file_hash(path:str) -> str:
+    with open(path, "rb") as file:
+        return sha256(file.read())
+
+@pytest.fixture
+def download_server(workdir):
+    # sends every file in ./exports back to the client, along with its reply
+    os.makedirs("exports")
+    def downloads(package_dict:dict, files:dict) -> list:
+        return [os.path.join("exports", name) for name in sorted(os.listdir("exports"))]
+    with Recording_Server(directory=os.path.join(workdir, "server"), downloads=downloads) as server:
+        yield server
+
+def export(make_file, name:str, size:int) -> str:
+    path, hash_value = make_file(os.path.join("exports", name), size)
+    return hash_value
+
+def receive(server, downloads, **kwargs) -> SOL_Package:
+    with SOL_Connector("127.0.0.1", server.port, **kwargs) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None})
+        reply = connector.send(package, downloads=downloads)
+    assert reply["commands"] == [{"ping": None}]
+    return package
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("protocol, parallel_downloads", [(1, 4), (2, 1), (2, 4)])
+def test_downloads_to_a_directory(download_server, make_file, protocol, parallel_downloads):
+    hashes = {f"export_{i}.bin": export(make_file, f"export_{i}.bin", 300000 + i) for i in range(3)}
+    package = receive(download_server, "received", protocol=protocol, parallel_downloads=parallel_downloads)
+    assert sorted(package.downloads) == sorted(hashes)
+    for name, hash_value in hashes.items():
+        assert package.downloads[name] == os.path.join("received", name)
+        assert file_hash(package.downloads[name]) == hash_value
+    assert not [name for name in os.listdir("received") if name.endswith(".part")]
+
+def test_downloads_to_every_kind_of_target(download_server, make_file):
+    hashes = {name: export(make_file, name, 200000) for name in ("a.bin", "b.bin", "c.bin", "d.bin", "e.bin")}
+    pieces = []
+    stream = io.BytesIO()
+    package = receive(download_server, {
+        "a.bin": "a_copy.bin",
+        "b.bin": bytearray(),
+        "c.bin": stream,
+        "d.bin": pieces.append,
+        "e.bin": SOL_MemorySink(max_size=200000),
+    })
+    assert file_hash(package.downloads["a.bin"]) == hashes["a.bin"]
+    assert sha256(package.downloads["b.bin"]) == hashes["b.bin"]
+    assert sha256(stream.getvalue()) == hashes["c.bin"]
+    assert sha256(b"".join(pieces)) == hashes["d.bin"]
+    assert sha256(package.downloads["e.bin"]) == hashes["e.bin"]
+
+def test_more_downloads_than_stream_ids(download_server, make_file):
+    # the stream id of a download has to fit in a byte, so the downloads are sent in windows
+    hashes = {f"export_{i}.bin": export(make_file, f"export_{i}.bin", 100 + i) for i in range(300)}
+    package = receive(download_server, "received", parallel_downloads=4)
+    assert len(package.downloads) == len(hashes)
+    for name, hash_value in hashes.items():
+        assert file_hash(package.downloads[name]) == hash_value
+
+def test_download_without_target_fails(download_server, make_file):
+    export(make_file, "export.bin", 1000)
+    with pytest.raises(SOL_Error) as error:
+        receive(download_server, {"other.bin": bytearray()})
+    assert error.value.args[0] == 4416
+
+def test_download_above_max_size_is_discarded(download_server, make_file):
+    export(make_file, "export.bin", 100000)
+    buffer = bytearray(b"kept")
+    with pytest.raises(SOL_Error) as error:
+        receive(download_server, {"export.bin": SOL_MemorySink(buffer, max_size=50000)})
+    assert error.value.args[0] == 4417
+    assert buffer == b"kept"
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Demultiplexing -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.fixture
+def downloading(handlers, make_file):
+    # the server side sends frames of its own making, the client side receives them into sinks
+    sender, receiver = handlers
+    sender.protocol = receiver.protocol = 2
+    private_key, public_key = pp_generate_keys()
+    path, _ = make_file("export.bin", 1000)
+    def receive_frames(count:int, frames) -> SOL_Error:
+        def send():
+            batch_parameters = json.dumps({"count": count}).encode("utf8")
+            sender._send_frame(FRAME_PACKAGE, _PARAMS_LENGTH.pack(len(batch_parameters)) + batch_parameters)
+            frames(sender, SOL_File(path), public_key)
+        thread = threading.Thread(target=send)
+        thread.start()
+        try:
+            with pytest.raises(SOL_Error) as error:
+                receiver.file_package_input_multiple("DOWNLOADS", private_key, sinks=SOL_Downloads("received"))
+        finally:
+            thread.join()
+        return error.value
+    return receive_frames
+
+def test_download_with_reused_stream_id_is_refused(downloading):
+    def frames(sender, file_object, public_key):
+        # both downloads claim stream id 0 in the same window
+        for _ in range(2):
+            sender._file_output_stream_id(0, file_object, public_key, True, threading.Lock())
+    assert downloading(2, frames).args[0] == 5401
+    # the download that was cut off left no part behind
+    assert not [name for name in os.listdir("received") if name.endswith(".part")]
+
+def test_download_with_unknown_stream_id_is_refused(downloading):
+    def frames(sender, file_object, public_key):
+        sender._send_frame(FRAME_CHUNK, b"chunk", 3)
+    assert downloading(1, frames).args[0] == 5401
+
+def test_download_beyond_the_batch_is_refused(downloading):
+    def frames(sender, file_object, public_key):
+        sender._file_output_stream_id(1, file_object, public_key, True, threading.Lock())
+    assert downloading(1, frames).args[0] == 5401
+
+def test_file_sink_keeps_nothing_when_discarded(workdir):
+    sink = SOL_FileSink("export.bin")
+    sink.write(b"part of a file")
+    sink.discard()
+    assert not os.path.exists("export.bin") and not os.path.exists("export.bin.part")
@@ -0,0 +1,57 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import os
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_FileCache
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Helpers -
+# ----------------------------------------------------------------------------------------------------------------------
+def send(server, file_cache:SOL_FileCache, path:str, streaming:bool) -> SOL_File:
+    file_object = SOL_File(path)
+    with SOL_Connector("127.0.0.1", server.port, streaming=streaming, file_cache=file_cache) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None}, {"file": file_object})
+        connector.send(package)
+    return file_object
+
+def artifacts_size(file_cache:SOL_FileCache) -> int:
+    data_directory = os.path.join(file_cache.directory, "data")
+    return sum(os.path.getsize(os.path.join(data_directory, name)) for name in os.listdir(data_directory))
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("streaming", [False, True])
+def test_second_send_is_a_hit(server, make_file, workdir, streaming):
+    path, hash_value = make_file("file.bin", 300000)
+    file_cache = SOL_FileCache(os.path.join(workdir, "cache"))
+    for _ in range(2):
+        file_object = send(server, file_cache, path, streaming)
+        assert server.received[file_object.filename_transmission] == hash_value
+    stats = file_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+    assert stats["bytes_saved"] == 300000
+
+def test_changed_file_is_a_miss(server, make_file, workdir):
+    path, _ = make_file("file.bin", 300000)
+    file_cache = SOL_FileCache(os.path.join(workdir, "cache"))
+    send(server, file_cache, path, False)
+    path, hash_value = make_file("file.bin", 200000)
+    file_object = send(server, file_cache, path, False)
+    assert server.received[file_object.filename_transmission] == hash_value
+    assert file_cache.stats()["misses"] == 2
+
+def test_eviction_keeps_the_cache_below_max_size(server, make_file, workdir):
+    file_cache = SOL_FileCache(os.path.join(workdir, "cache"), max_size=400000)
+    for i in range(4):
+        # half of every file is random, so each artifact is a bit over 150kb
+        send(server, file_cache, make_file(f"file_{i}.bin", 300000)[0], True)
+        assert artifacts_size(file_cache) <= file_cache.max_size
+    assert len(os.listdir(os.path.join(file_cache.directory, "data"))) == 2
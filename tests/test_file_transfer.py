@@ -0,0 +1,84 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import base64
+import hashlib
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_File, SOL_Error
+from SOL_Client_Connector.SOL_Encryption import pp_generate_keys
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Helpers -
+# ----------------------------------------------------------------------------------------------------------------------
+def transfer(handlers, file_object, output="file_package_output_stream", **input_kwargs):
+    # sends the file on a thread, as the receiving side has to answer every state, and returns the received path
+    sender, receiver = handlers
+    private_key, public_key = pp_generate_keys()
+    errors = []
+    def send():
+        try:
+            getattr(sender, output)("FILE", file_object, public_key)
+        except Exception as e:
+            errors.append(e)
+    thread = threading.Thread(target=send)
+    thread.start()
+    try:
+        receiver.file_package_input("FILE", private_key, **input_kwargs)
+    except BaseException:
+        # the sender still waits for an answer
+        receiver.connection.shutdown(socket.SHUT_RDWR)
+        raise
+    finally:
+        thread.join()
+    assert not errors
+    return os.path.join("temp", file_object.filename_transmission)
+
+def sha256(path:str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Streamed files -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("size", [0, 1000, 3000000])
+def test_streamed_file_arrives_intact(handlers, make_file, size):
+    path, hash_value = make_file("file.bin", size)
+    file_object = SOL_File(path)
+    received = transfer(handlers, file_object)
+    assert sha256(received) == hash_value
+    assert file_object.hash_value == hash_value
+    # nothing was written on the sending side
+    assert os.listdir("temp") == [file_object.filename_transmission]
+
+def test_file_with_a_wrong_hash_is_not_kept(handlers, make_file):
+    sender, _ = handlers
+    path, _ = make_file("file.bin", 300000)
+    file_end_out = sender._file_end_out
+    def wrong_hash(package_trailer:bytes) -> None:
+        trailer = json.loads(package_trailer.decode("utf_8"))
+        trailer["hash_value"] = base64.b64encode(bytes(64)).decode("utf8")
+        file_end_out(json.dumps(trailer).encode("utf_8"))
+    sender._file_end_out = wrong_hash
+    with pytest.raises(SOL_Error) as error:
+        transfer(handlers, SOL_File(path))
+    assert error.value.args[0] == 5402
+    # neither the file nor its .part was left behind
+    assert os.listdir("temp") == []
+
+@pytest.mark.parametrize("file_name", ["../escape.bin", "sub/file.bin", "/tmp/file.bin", ".."])
+def test_received_file_names_stay_in_the_directory(handlers, make_file, file_name):
+    path, _ = make_file("file.bin", 1000)
+    file_object = SOL_File(path)
+    file_object.filename_transmission = file_name
+    with pytest.raises(SOL_Error) as error:
+        transfer(handlers, file_object)
+    assert error.value.args[0] == 5401
+    assert not os.path.exists("escape.bin")
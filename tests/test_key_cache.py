@@ -0,0 +1,57 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Error, SOL_KeyCache
+from SOL_Client_Connector.SOL_Encryption import pp_generate_keys
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Helpers -
+# ----------------------------------------------------------------------------------------------------------------------
+def ping(connector:SOL_Connector, *files:SOL_File) -> dict:
+    package = SOL_Package(API_KEY)
+    package.command_add({"ping": None}, *({"file": file_object} for file_object in files))
+    reply = connector.send(package)
+    assert reply["commands"][0] == {"ping": None}
+    return reply
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_kept_alive_connection_resumes_its_session(server, make_file):
+    path, hash_value = make_file("file.bin", 300000)
+    key_cache = SOL_KeyCache()
+    with SOL_Connector("127.0.0.1", server.port, streaming=True, key_cache=key_cache, resume_sessions=True) as connector:
+        ping(connector)
+        file_object = SOL_File(path)
+        ping(connector, file_object)
+        ping(connector)
+    assert server.received[file_object.filename_transmission] == hash_value
+    assert (server.stats["connections"], server.stats["conversations"], server.stats["resumed"]) == (1, 3, 2)
+    assert key_cache.stats()["sessions"] == 1
+
+def test_server_key_is_imported_once(server):
+    key_cache = SOL_KeyCache()
+    with SOL_Connector("127.0.0.1", server.port, key_cache=key_cache, pool_size=0) as connector:
+        for _ in range(3):
+            ping(connector)
+    assert server.stats["connections"] == 3
+    assert key_cache.stats()["misses"] == 1 and key_cache.stats()["hits"] == 2
+
+def test_expired_session_starts_over(server):
+    with SOL_Connector("127.0.0.1", server.port, key_cache=SOL_KeyCache(session_ttl=0), resume_sessions=True) as connector:
+        ping(connector)
+        ping(connector)
+    assert server.stats["resumed"] == 0
+
+def test_pinned_key_that_does_not_match_is_refused(server):
+    key_cache = SOL_KeyCache()
+    key_cache.pin("127.0.0.1", server.port, pp_generate_keys()[1])
+    with SOL_Connector("127.0.0.1", server.port, key_cache=key_cache) as connector:
+        with pytest.raises(SOL_Error) as error:
+            ping(connector)
+    assert error.value.args[0] == 4410
@@ -0,0 +1,67 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import time
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_Error, SOL_KeyPool
+from SOL_Client_Connector.SOL_Encryption import pp_encrypt, pp_decrypt
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Helpers -
+# ----------------------------------------------------------------------------------------------------------------------
+def wait_for(condition, timeout:float=30) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Key pool -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_pool_fills_in_the_background_and_hands_out_working_keys():
+    pool = SOL_KeyPool(low_watermark=1, high_watermark=3)
+    try:
+        wait_for(lambda: pool.stats()["available"] == 3)
+        private_key, public_key = pool.get()
+        encrypted, session_key_encrypted, tag, nonce = pp_encrypt(b"message", public_key)
+        assert pp_decrypt(encrypted, private_key, session_key_encrypted, tag, nonce) == b"message"
+        assert pool.stats()["hits"] == 1
+    finally:
+        pool.close()
+
+def test_empty_pool_generates_on_the_spot():
+    pool = SOL_KeyPool(low_watermark=1, high_watermark=1)
+    pool.close()
+    private_key, public_key = pool.get()
+    assert private_key.public_key() == public_key
+    assert pool.stats()["misses"] == 1
+
+def test_unused_keys_expire():
+    pool = SOL_KeyPool(low_watermark=1, high_watermark=2, max_age=0.05)
+    try:
+        wait_for(lambda: pool.stats()["expired"] >= 1)
+    finally:
+        pool.close()
+
+@pytest.mark.parametrize("low_watermark, high_watermark", [(0, 2), (3, 2), (1.5, 2)])
+def test_watermarks_are_checked(low_watermark, high_watermark):
+    with pytest.raises(SOL_Error) as error:
+        SOL_KeyPool(low_watermark, high_watermark)
+    assert error.value.args[0] == 4409
+
+def test_connector_takes_its_keys_from_the_pool(server):
+    pool = SOL_KeyPool(low_watermark=1, high_watermark=1)
+    try:
+        wait_for(lambda: pool.stats()["available"] == 1)
+        with SOL_Connector("127.0.0.1", server.port, key_pool=pool) as connector:
+            package = SOL_Package(API_KEY)
+            package.command_add({"ping": None})
+            assert connector.send(package)["commands"] == [{"ping": None}]
+        assert pool.stats()["hits"] == 1
+    finally:
+        pool.close()
@@ -0,0 +1,66 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import asyncio
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, AsyncSOL_Connector, SOL_Package, SOL_File, SOL_Error, SOL_Metrics
+from SOL_Client_Connector._SOL_Metrics.SOL_Metrics import SOL_Span
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Aggregation -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_percentiles_and_totals():
+    metrics = SOL_Metrics(max_samples=100)
+    for i in range(1, 101):
+        metrics.on_span(SOL_Span("state:COMMANDS", i / 1000, bytes_sent=10, round_trips=1, error=i == 100))
+    stats = metrics.report()["state:COMMANDS"]
+    assert (stats["count"], stats["errors"], stats["bytes_sent"], stats["round_trips"]) == (100, 1, 1000, 100)
+    assert (stats["p50"], stats["p95"], stats["p99"]) == (0.05, 0.095, 0.099)
+    assert stats["mean"] == pytest.approx(0.0505)
+    metrics.reset()
+    assert metrics.report() == {}
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_send_reports_its_phases(server, make_file):
+    path, _ = make_file("file.bin", 300000)
+    metrics = SOL_Metrics()
+    with SOL_Connector("127.0.0.1", server.port, observer=metrics) as connector:
+        for _ in range(3):
+            package = SOL_Package(API_KEY)
+            package.command_add({"ping": None}, {"file": SOL_File(path)})
+            connector.send(package)
+    report = metrics.report()
+    names = ("send", "pre_check", "connect", "wait:REPLY", "state:SOL_KEY", "state:COMMANDS", "state:ADDITIONAL", "state:REPLY")
+    for name in names:
+        assert report[name]["count"] == 3, name
+        assert report[name]["errors"] == 0
+        assert report[name]["p50"] <= report[name]["p95"] <= report[name]["p99"]
+    # the file is sent along with the ADDITIONAL state
+    assert report["state:ADDITIONAL"]["bytes_sent"] > 3 * 150000
+    assert report["state:REPLY"]["bytes_received"] > 0
+
+def test_async_send_reports_its_phases(server):
+    metrics = SOL_Metrics()
+    async def send():
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None})
+        return await AsyncSOL_Connector("127.0.0.1", server.port, observer=metrics).send(package)
+    assert asyncio.run(send())["commands"][0] == {"ping": None}
+    assert {"send", "connect", "wait:REPLY", "state:REPLY"} <= set(metrics.report())
+
+def test_failed_connect_is_counted_as_an_error(unused_port):
+    metrics = SOL_Metrics()
+    with SOL_Connector("127.0.0.1", unused_port, observer=metrics) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None})
+        with pytest.raises(SOL_Error):
+            connector.send(package)
+    report = metrics.report()
+    assert report["connect"]["errors"] == report["send"]["errors"] == 1
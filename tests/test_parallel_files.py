@@ -0,0 +1,66 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import json
+import threading
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Error
+from SOL_Client_Connector.SOL_Encryption import pp_generate_keys
+from SOL_Client_Connector._SOL_PackageHandlers.PackageHandler_Base import FRAME_PACKAGE, _PARAMS_LENGTH
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+def send_files(server, files:list, **kwargs) -> list:
+    file_objects = [SOL_File(path) for path, _ in files]
+    with SOL_Connector("127.0.0.1", server.port, **kwargs) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None}, *({"file": file_object} for file_object in file_objects))
+        reply = connector.send(package)
+    assert reply["commands"][0] == {"ping": None}
+    return file_objects
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("parallel_files", [1, 3])
+def test_parallel_files(server, make_file, parallel_files, streaming):
+    files = [make_file(f"file_{i}.bin", 200000 + i * 50000) for i in range(5)]
+    file_objects = send_files(server, files, parallel_files=parallel_files, streaming=streaming)
+    for file_object, (_, hash_value) in zip(file_objects, files):
+        assert server.received[file_object.filename_transmission] == hash_value
+
+def test_more_files_than_stream_ids(server, make_file):
+    # the stream id of a file has to fit in a byte, so the files are sent in windows
+    files = [make_file(f"file_{i}.bin", 100 + i) for i in range(300)]
+    file_objects = send_files(server, files, parallel_files=4, streaming=True)
+    assert len(server.received) == len(files)
+    for file_object, (_, hash_value) in zip(file_objects, files):
+        assert server.received[file_object.filename_transmission] == hash_value
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Demultiplexing -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_reused_stream_id_is_refused(handlers, make_file):
+    sender, receiver = handlers
+    sender.protocol = receiver.protocol = 2
+    private_key, public_key = pp_generate_keys()
+    path, _ = make_file("file.bin", 1000)
+    send_lock = threading.Lock()
+    def send():
+        batch_parameters = json.dumps({"count": 2}).encode("utf8")
+        sender._send_frame(FRAME_PACKAGE, _PARAMS_LENGTH.pack(len(batch_parameters)) + batch_parameters)
+        # both files claim stream id 0 in the same window
+        for _ in range(2):
+            sender._file_output_stream_id(0, SOL_File(path), public_key, True, send_lock)
+    thread = threading.Thread(target=send)
+    thread.start()
+    try:
+        with pytest.raises(SOL_Error) as error:
+            receiver.file_package_input_multiple("FILES", private_key)
+    finally:
+        thread.join()
+    assert error.value.args[0] == 5401
@@ -0,0 +1,40 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import os
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Concurrent preparation -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("workers, io_budget", [(1, None), (4, None), (4, 300000)])
+def test_prepared_files_arrive(server, make_file, workers, io_budget):
+    files = [make_file(f"file_{i}.bin", 200000 + i * 50000) for i in range(6)]
+    file_objects = [SOL_File(path) for path, _ in files]
+    with SOL_Connector(
+            "127.0.0.1", server.port, streaming=False, prepare_workers=workers, prepare_io_budget=io_budget
+    ) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None}, *({"file": file_object} for file_object in file_objects))
+        connector.send(package)
+    for file_object, (_, hash_value) in zip(file_objects, files):
+        assert file_object.hash_value == hash_value
+        assert server.received[file_object.filename_transmission] == hash_value
+    assert set(package.preparation_times) == {file_object.filename_transmission for file_object in file_objects}
+    assert all(seconds >= 0 for seconds in package.preparation_times.values())
+
+def test_failed_preparation_leaves_no_temp_files(make_file):
+    file_objects = [SOL_File(make_file(f"file_{i}.bin", 200000)[0]) for i in range(4)]
+    # the file disappears between being added and being prepared
+    os.remove(file_objects[1].filepath)
+    package = SOL_Package(API_KEY)
+    package.command_add({"ping": None}, *({"file": file_object} for file_object in file_objects))
+    with pytest.raises(FileNotFoundError):
+        package.pre_check(workers=4)
+    assert os.listdir("temp") == []
@@ -0,0 +1,49 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Progress, SOL_ProgressQueue
+from SOL_Client_Connector._SOL_Progress import PROGRESS_COMPRESS, PROGRESS_ENCRYPT, PROGRESS_UPLOAD, PROGRESS_DOWNLOAD
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Throttling -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_events_are_throttled_but_the_final_one_is_kept():
+    events = []
+    progress = SOL_Progress(events.append, max_rate=1)
+    for done in range(1, 101):
+        progress.update(PROGRESS_UPLOAD, "file", done, 100)
+    assert [event.done for event in events] == [1, 100]
+    assert events[-1].final
+
+def test_full_queue_drops_events_but_keeps_final_ones():
+    progress = SOL_ProgressQueue(max_rate=None, maxsize=2)
+    for done in range(1, 5):
+        progress.update(PROGRESS_UPLOAD, "file", done, 4)
+    assert progress.dropped == 2
+    # the final event replaced the oldest one
+    assert [progress.queue.get_nowait().done for _ in range(2)] == [2, 4]
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("streaming", [False, True])
+def test_send_reports_progress(server, make_file, streaming):
+    path, _ = make_file("file.bin", 3000000)
+    events = []
+    file_object = SOL_File(path)
+    with SOL_Connector("127.0.0.1", server.port, streaming=streaming, progress=SOL_Progress(events.append, None)) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None}, {"file": file_object})
+        connector.send(package)
+    finals = {event.kind: event for event in events if event.final and event.name == file_object.filename_transmission}
+    # streamed files are compressed while they are sent, without being encrypted on disk first
+    kinds = {PROGRESS_COMPRESS, PROGRESS_UPLOAD} if streaming else {PROGRESS_COMPRESS, PROGRESS_ENCRYPT, PROGRESS_UPLOAD}
+    assert set(finals) == kinds
+    assert finals[PROGRESS_COMPRESS].done == finals[PROGRESS_COMPRESS].total == 3000000
+    assert finals[PROGRESS_UPLOAD].done == finals[PROGRESS_UPLOAD].total
+    assert [event.kind for event in events if event.final and event.name == "REPLY"] == [PROGRESS_DOWNLOAD]
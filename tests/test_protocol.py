@@ -0,0 +1,80 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import threading
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Error, SOL_Metrics
+from SOL_Client_Connector._SOL_PackageHandlers.PackageHandler_Base import (
+    _FRAME_HEADER, _FRAME_MAGIC, _FRAME_MAX_LENGTH, FRAME_CHUNK
+)
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Framing -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.fixture
+def framed(handlers):
+    sender, receiver = handlers
+    sender.protocol = receiver.protocol = 2
+    return sender, receiver
+
+@pytest.mark.parametrize("size", [0, 1, 65535, 65536, 1048577])
+def test_frames_keep_their_payload(framed, size):
+    sender, receiver = framed
+    payload = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    # frames larger than the socket buffer only fit while the other side receives
+    thread = threading.Thread(target=sender._send_frame, args=(FRAME_CHUNK, payload), kwargs={"flags": 3, "head": b"head"})
+    thread.start()
+    frame_type, flags, received = receiver._recv_frame()
+    thread.join()
+    assert (frame_type, flags, bytes(received)) == (FRAME_CHUNK, 3, b"head" + payload)
+
+def test_frame_without_magic_is_refused(framed):
+    sender, receiver = framed
+    sender._send(bytes(16))
+    with pytest.raises(SOL_Error) as error:
+        receiver._recv_frame()
+    assert error.value.args[0] == 5401
+
+def test_frame_above_the_cap_is_refused(framed):
+    sender, receiver = framed
+    sender._send(_FRAME_HEADER.pack(_FRAME_MAGIC, FRAME_CHUNK, 0, _FRAME_MAX_LENGTH + 1))
+    with pytest.raises(SOL_Error) as error:
+        receiver._recv_frame()
+    assert error.value.args[0] == 5401
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Conversations -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("streaming", [False, True])
+def test_protocol_2_needs_fewer_round_trips(server, make_file, streaming):
+    path, hash_value = make_file("file.bin", 300000)
+    round_trips = {}
+    for protocol in (1, 2):
+        # the round trips of the client, as the server only counts its own once it answered
+        metrics = SOL_Metrics()
+        with SOL_Connector(
+                "127.0.0.1", server.port, protocol=protocol, streaming=streaming, pool_size=0, observer=metrics
+        ) as connector:
+            package = SOL_Package(API_KEY)
+            file_object = SOL_File(path)
+            package.command_add({"ping": None}, {"file": file_object})
+            reply = connector.send(package)
+        assert reply["commands"][0] == {"ping": None}
+        assert server.received[file_object.filename_transmission] == hash_value
+        round_trips[protocol] = sum(stats["round_trips"] for stats in metrics.report().values())
+    assert 0 < round_trips[2] < round_trips[1]
+
+@pytest.mark.parametrize("protocol", [1, 2])
+def test_large_packages_arrive_whole(server, protocol):
+    # the package and its reply are received into buffers of their exact length
+    command = {"echo": "".join(chr(ord("a") + i % 26) for i in range(3000000))}
+    with SOL_Connector("127.0.0.1", server.port, protocol=protocol) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add(command)
+        reply = connector.send(package)
+    assert reply["commands"] == [command]
@@ -0,0 +1,143 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import os
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import (
+    SOL_Connector, SOL_Package, SOL_File, SOL_Error, SOL_UploadCheckpoints, SOL_Progress, SOL_ChunkPolicy
+)
+from SOL_Client_Connector._SOL_Server.SOL_Server import INJECT_RESET
+from conftest import API_KEY, Recording_Server
+
+FILE_SIZE = 8000000
+RESET_WINDOW = 2000000
+CHUNK_POLICY = SOL_ChunkPolicy(65536, 65536) # chunks of a fixed size, so a cut always comes after some were sent
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Tests -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.fixture
+def reset_server(workdir):
+    # cuts every conversation part way through its files, until error_rate is set to 0.
+    #   The seed makes the first cut come about 1.6mb into the upload, after several chunks were confirmed.
+    with Recording_Server(
+            directory=os.path.join(workdir, "server"),
+            error_rate=1.0,
+            errors=(INJECT_RESET,),
+            reset_window=RESET_WINDOW,
+            seed=5
+    ) as server:
+        yield server
+
+def _send(port:int, checkpoints:SOL_UploadCheckpoints, path:str, upload_retries:int=0) -> tuple[SOL_File, list, dict]:
+    offsets = []
+    progress = SOL_Progress(lambda event: offsets.append(event.done) if event.kind == "upload" else None, max_rate=None)
+    with SOL_Connector(
+            "127.0.0.1", port,
+            checkpoints=checkpoints,
+            upload_retries=upload_retries,
+            progress=progress,
+            chunk_policy=CHUNK_POLICY
+    ) as connector:
+        package = SOL_Package(API_KEY)
+        file_object = SOL_File(path)
+        package.command_add({"file": file_object})
+        return file_object, offsets, connector.send(package)
+
+def test_reset_upload_resumes_from_checkpoint(reset_server, make_file, workdir):
+    # half of the file is random, so the compressed upload is larger than the reset window
+    path, hash_value = make_file("file.bin", FILE_SIZE)
+    checkpoints = SOL_UploadCheckpoints(os.path.join(workdir, "checkpoints"))
+
+    with pytest.raises(SOL_Error) as error:
+        _send(reset_server.port, checkpoints, path)
+    assert error.value.args[0] == 4403
+    assert reset_server.stats["injected_reset"] == 1
+    pending = checkpoints.pending()
+    assert len(pending) == 1 and pending[0]["sent"] > 0
+
+    # the server kept the part it verified, and the next send continues from it
+    parts = os.listdir(os.path.join(reset_server.directory, ".uploads"))
+    assert parts
+    reset_server.error_rate = 0
+    file_object, offsets, reply = _send(reset_server.port, checkpoints, path)
+    assert offsets[0] > 0
+    assert reply["files"] == [file_object.filename_transmission]
+    assert reset_server.received[file_object.filename_transmission] == hash_value
+    assert checkpoints.pending() == []
+
+def test_send_retries_through_resets(workdir, make_file):
+    path, hash_value = make_file("file.bin", FILE_SIZE)
+    checkpoints = SOL_UploadCheckpoints(os.path.join(workdir, "checkpoints"))
+    with Recording_Server(
+            directory=os.path.join(workdir, "server"),
+            error_rate=0.5,
+            errors=(INJECT_RESET,),
+            reset_window=RESET_WINDOW,
+            seed=3
+    ) as server:
+        file_object, _, _ = _send(server.port, checkpoints, path, upload_retries=20)
+        assert server.received[file_object.filename_transmission] == hash_value
+        assert server.stats["injected_reset"] >= 1
+    assert checkpoints.pending() == []
+
+def test_restart_with_new_checkpoints_resumes_on_the_server(reset_server, make_file, workdir):
+    path, hash_value = make_file("file.bin", FILE_SIZE)
+    with pytest.raises(SOL_Error):
+        _send(reset_server.port, SOL_UploadCheckpoints(os.path.join(workdir, "checkpoints")), path)
+
+    # a new process with its own checkpoints compresses the file again, to the same upload id,
+    #   so the server still has the part it received
+    reset_server.error_rate = 0
+    file_object, offsets, _ = _send(reset_server.port, SOL_UploadCheckpoints(os.path.join(workdir, "other")), path)
+    assert offsets[0] > 0
+    assert reset_server.received[file_object.filename_transmission] == hash_value
+
+def test_upload_is_only_pending_once_started(unused_port, make_file, workdir):
+    # the file is compressed before the connect fails, but nothing of it was sent
+    path, _ = make_file("file.bin", 100000)
+    checkpoints = SOL_UploadCheckpoints(os.path.join(workdir, "checkpoints"))
+    with pytest.raises(SOL_Error) as error:
+        _send(unused_port, checkpoints, path)
+    assert error.value.args[0] == 4403
+    assert checkpoints.pending() == []
+
+def _artifacts(directory:str) -> list[int]:
+    data_directory = os.path.join(directory, "data")
+    return [os.path.getsize(os.path.join(data_directory, name)) for name in os.listdir(data_directory)]
+
+def test_stale_uploads_are_evicted_within_max_size(reset_server, make_file, workdir):
+    directory = os.path.join(workdir, "checkpoints")
+    path, _ = make_file("file.bin", FILE_SIZE)
+    with pytest.raises(SOL_Error):
+        _send(reset_server.port, SOL_UploadCheckpoints(directory), path)
+
+    # a pending upload keeps its artifact, even above max_size
+    checkpoints = SOL_UploadCheckpoints(directory, max_size=0)
+    checkpoints.evict()
+    assert len(checkpoints.pending()) == 1 and len(_artifacts(directory)) == 1
+
+    # once its last attempt is older than pending_ttl it is given up on, and evicted like any other file
+    checkpoints = SOL_UploadCheckpoints(directory, max_size=0, pending_ttl=0)
+    checkpoints.evict()
+    assert checkpoints.pending() == []
+    assert sum(_artifacts(directory)) <= checkpoints.max_size
+
+def test_stale_and_confirmed_uploads_are_evicted_within_max_size(reset_server, make_file, workdir):
+    directory = os.path.join(workdir, "checkpoints")
+    path, _ = make_file("file.bin", FILE_SIZE)
+    with pytest.raises(SOL_Error):
+        _send(reset_server.port, SOL_UploadCheckpoints(directory), path)
+    reset_server.error_rate = 0
+    other_path, _ = make_file("other.bin", 200000)
+    _send(reset_server.port, SOL_UploadCheckpoints(directory), other_path)
+
+    # the confirmed upload is a cached file, the stale one is no longer pinned, so both go to fit max_size
+    checkpoints = SOL_UploadCheckpoints(directory, max_size=100, pending_ttl=0)
+    checkpoints.evict()
+    assert checkpoints.pending() == []
+    assert sum(_artifacts(directory)) <= checkpoints.max_size
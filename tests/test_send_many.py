@@ -0,0 +1,52 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import asyncio
+import os
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, AsyncSOL_Connector, SOL_Package, SOL_File, SOL_Error
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Helpers -
+# ----------------------------------------------------------------------------------------------------------------------
+def batch(make_file) -> tuple[list, list]:
+    # five packages, of which the second has no commands and the fourth lost its file
+    packages, file_objects = [], []
+    for i in range(5):
+        package = SOL_Package(API_KEY)
+        if i != 1:
+            file_objects.append(SOL_File(make_file(f"file_{i}.bin", 100000)[0]))
+            package.command_add({"ping": i}, {"file": file_objects[-1]})
+        packages.append(package)
+    os.remove(file_objects[2].filepath)
+    return packages, file_objects
+
+def check(replies:list, server):
+    assert len(replies) == 5
+    assert isinstance(replies[1], SOL_Error) and replies[1].args[0] == 4408
+    # a staged file fails while being compressed, a streamed one in the pre_check
+    assert isinstance(replies[3], FileNotFoundError) or (isinstance(replies[3], SOL_Error) and replies[3].args[0] == 4406)
+    for i in (0, 2, 4):
+        assert replies[i]["commands"][0] == {"ping": i}
+    assert len(server.received) == 3
+    # a single connection, of which every conversation after the first resumed the session
+    assert (server.stats["connections"], server.stats["conversations"], server.stats["resumed"]) == (1, 3, 2)
+    assert os.listdir("temp") == []
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("streaming", [False, True])
+def test_failing_packages_dont_stop_the_batch(server, make_file, streaming):
+    packages, _ = batch(make_file)
+    with SOL_Connector("127.0.0.1", server.port, streaming=streaming) as connector:
+        check(connector.send_many(packages), server)
+
+def test_async_failing_packages_dont_stop_the_batch(server, make_file):
+    packages, _ = batch(make_file)
+    check(asyncio.run(AsyncSOL_Connector("127.0.0.1", server.port).send_many(packages)), server)
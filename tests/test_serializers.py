@@ -0,0 +1,63 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import json
+import sys
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Credentials, SOL_Error, available_serializers
+from SOL_Client_Connector._SOL_Serializers import pack_parameters, load_parameters, get_serializer
+from conftest import API_KEY
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Serializers and parameters -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_json_encoder_is_left_alone():
+    assert json.JSONEncoder.default is json.encoder.JSONEncoder.default
+    with pytest.raises(TypeError):
+        json.dumps({"file": object()})
+
+def test_unknown_serializer_is_refused():
+    with pytest.raises(SOL_Error) as error:
+        get_serializer("unknown")
+    assert error.value.args[0] == 4415
+
+def test_binary_parameters_round_trip():
+    parameters = {"sske": bytes(range(256)), "len": 2 ** 40, "file_name": b"file.bin", "stream": True, "codec": "zlib"}
+    packed = pack_parameters({**parameters, "nonce": None})
+    assert load_parameters(packed) == parameters
+    assert load_parameters(b'{"count": 3}') == {"count": 3}
+    with pytest.raises(SOL_Error) as error:
+        load_parameters(packed[:-1])
+    assert error.value.args[0] == 5401
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Against the stand-in server -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("protocol", [1, 2])
+@pytest.mark.parametrize("serializer", available_serializers())
+def test_serializer_round_trip(server, make_file, serializer, protocol):
+    path, hash_value = make_file("file.bin", 300000)
+    file_object = SOL_File(path)
+    with SOL_Connector("127.0.0.1", server.port, serializer=serializer, protocol=protocol) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add(
+            {"ping": {"nested": [1, 2.5, "three", None]}},
+            {"file": file_object},
+            {"login": SOL_Credentials("user", "password")}
+        )
+        reply = connector.send(package)
+    assert reply["commands"][0] == {"ping": {"nested": [1, 2.5, "three", None]}}
+    assert reply["credentials"] is True
+    assert server.received[file_object.filename_transmission] == hash_value
+
+def test_server_without_the_format_stops(server, monkeypatch):
+    # the module, which the class of the same name hides as an attribute of the package
+    monkeypatch.setattr(sys.modules["SOL_Client_Connector._SOL_Server.SOL_Server"], "available_formats", lambda: ["other"])
+    with SOL_Connector("127.0.0.1", server.port) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None})
+        assert connector.send(package)["error"] == 4415
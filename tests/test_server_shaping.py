@@ -0,0 +1,69 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import contextlib
+import os
+import time
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import SOL_Connector, SOL_Package, SOL_File, SOL_Error, SOL_Progress
+from SOL_Client_Connector._SOL_Progress import PROGRESS_INFO
+from conftest import API_KEY, Recording_Server
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Helpers -
+# ----------------------------------------------------------------------------------------------------------------------
+@pytest.fixture
+def shaped_server(workdir):
+    with contextlib.ExitStack() as stack:
+        yield lambda **kwargs: stack.enter_context(Recording_Server(directory=os.path.join(workdir, "server"), **kwargs))
+
+def ping(server, *files:SOL_File, **kwargs) -> dict:
+    with SOL_Connector("127.0.0.1", server.port, **kwargs) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None}, *({"file": file_object} for file_object in files))
+        return connector.send(package)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Error injection -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_injected_stop_is_returned(shaped_server):
+    server = shaped_server(error_rate=1, errors=("stop",))
+    assert ping(server)["error"] == 5500
+    assert server.stats["injected_stop"] == 1
+
+def test_injected_disconnect_is_raised(shaped_server):
+    server = shaped_server(error_rate=1, errors=("disconnect",))
+    with pytest.raises(SOL_Error) as error:
+        ping(server, pool_size=0)
+    assert error.value.args[0] == 4403
+
+@pytest.mark.parametrize("kwargs", [{"error_rate": 2}, {"errors": ()}, {"errors": ("timeout",)}])
+def test_invalid_injection_is_refused(workdir, kwargs):
+    with pytest.raises(SOL_Error) as error:
+        Recording_Server(directory=os.path.join(workdir, "server"), **kwargs)
+    assert error.value.args[0] == 4414
+
+def test_info_messages_arrive_before_the_reply(shaped_server):
+    server = shaped_server(info=lambda package_dict: [{"status": "working"}, {"status": "done"}])
+    events = []
+    reply = ping(server, progress=SOL_Progress(events.append))
+    assert reply["commands"][0] == {"ping": None}
+    assert [event.data for event in events if event.kind == PROGRESS_INFO] == [{"status": "working"}, {"status": "done"}]
+    assert server.stats["info"] == 2
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Network shaping -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_latency_and_bandwidth_slow_the_send_down(shaped_server, make_file):
+    path, hash_value = make_file("file.bin", 300000)
+    server = shaped_server(latency=0.02, bandwidth=1000000, think_time=0.05)
+    file_object = SOL_File(path)
+    start = time.perf_counter()
+    ping(server, file_object)
+    # at least the think time, a few round trips and the compressed file at 1mb/s
+    assert time.perf_counter() - start > 0.05 + 3 * 0.02 + 0.15
+    assert server.received[file_object.filename_transmission] == hash_value
@@ -0,0 +1,104 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# - Package Imports -
+# ----------------------------------------------------------------------------------------------------------------------
+# General Packages
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+# Custom Packages
+from SOL_Client_Connector import (
+    SOL_Connector, AsyncSOL_Connector, SOL_Package, SOL_File, SOL_Error, SOL_TreeHash, changed_leaves
+)
+from conftest import API_KEY, Recording_Server
+
+LEAF_SIZE = 65536
+
+# A file whose leaf digests don't match its content, like one that changed or was corrupted on the way
+class _Wrong_Leaf_File(SOL_File):
+    def compress_and_hash(self) -> None:
+        super().compress_and_hash()
+        self.leaf_hashes = list(self.leaf_hashes)
+        self.leaf_hashes[1] = bytes(32)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# - Tests -
+# ----------------------------------------------------------------------------------------------------------------------
+def test_tree_hash_is_independent_of_workers_and_chunks():
+    data = os.urandom(LEAF_SIZE * 5 + 123)
+    inline, parallel = SOL_TreeHash(LEAF_SIZE, 1), SOL_TreeHash(LEAF_SIZE, 4)
+    inline.update(data)
+    for i in range(0, len(data), 10000):
+        parallel.update(data[i:i + 10000])
+    assert inline.hexdigest() == parallel.hexdigest()
+    assert len(inline.leaves()) == 6
+
+def test_changed_leaves():
+    data = bytearray(os.urandom(LEAF_SIZE * 4))
+    old = SOL_TreeHash(LEAF_SIZE)
+    old.update(bytes(data))
+    data[LEAF_SIZE * 2 + 5] ^= 1
+    new = SOL_TreeHash(LEAF_SIZE)
+    new.update(bytes(data) + b"more")
+    assert changed_leaves(old.leaves(), new.leaves()) == [2, 4]
+
+@pytest.mark.parametrize("protocol,streaming", [(1, False), (2, False), (2, True)])
+def test_tree_hashed_upload(server, make_file, protocol, streaming):
+    path, hash_value = make_file("file.bin", LEAF_SIZE * 6 + 1000)
+    with SOL_Connector("127.0.0.1", server.port, protocol=protocol, streaming=streaming, tree_hash=LEAF_SIZE) as connector:
+        package = SOL_Package(API_KEY)
+        file_object = SOL_File(path)
+        package.command_add({"file": file_object})
+        connector.send(package)
+    assert server.received[file_object.filename_transmission] == hash_value
+    assert len(file_object.leaf_hashes) == 7
+
+def test_mismatched_leaf_is_rejected(server, make_file):
+    path, _ = make_file("file.bin", LEAF_SIZE * 4)
+    with SOL_Connector("127.0.0.1", server.port, tree_hash=LEAF_SIZE) as connector:
+        package = SOL_Package(API_KEY)
+        file_object = _Wrong_Leaf_File(path)
+        package.command_add({"file": file_object})
+        with pytest.raises(SOL_Error):
+            connector.send(package)
+    assert file_object.filename_transmission not in server.received
+    assert not os.path.exists(os.path.join(server.directory, file_object.filename_transmission))
+
+def test_server_without_tree_hashes_refuses_them(workdir, make_file):
+    path, _ = make_file("file.bin", LEAF_SIZE)
+    with Recording_Server(directory=os.path.join(workdir, "server"), tree_hash=False) as server, \
+            SOL_Connector("127.0.0.1", server.port, tree_hash=True) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"file": SOL_File(path)})
+        reply = connector.send(package)
+        assert reply["error"] == 4418
+        assert not server.received
+
+def test_invalid_leaf_size():
+    with pytest.raises(SOL_Error) as error:
+        SOL_Connector("127.0.0.1", 1, tree_hash=1000)
+    assert error.value.args[0] == 4418
+
+def test_async_tree_hashed_upload(server, make_file):
+    path, hash_value = make_file("file.bin", LEAF_SIZE * 3 + 1)
+    package = SOL_Package(API_KEY)
+    file_object = SOL_File(path)
+    package.command_add({"file": file_object})
+    asyncio.run(AsyncSOL_Connector("127.0.0.1", server.port, tree_hash=LEAF_SIZE).send(package))
+    assert server.received[file_object.filename_transmission] == hash_value
+
+def test_tree_hashed_downloads(workdir, make_file):
+    # the server tree hashes its downloads for a client which offers it
+    files = [make_file(f"export_{i}.bin", LEAF_SIZE * 2 + i) for i in range(3)]
+    with Recording_Server(
+            directory=os.path.join(workdir, "server"),
+            downloads=lambda package_dict, received: [path for path, _ in files]
+    ) as server, SOL_Connector("127.0.0.1", server.port, tree_hash=LEAF_SIZE) as connector:
+        package = SOL_Package(API_KEY)
+        package.command_add({"ping": None})
+        connector.send(package, downloads="received")
+    for path, hash_value in files:
+        with open(package.downloads[os.path.basename(path)], "rb") as file:
+            assert hashlib.sha256(file.read()).hexdigest() == hash_value